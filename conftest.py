@@ -0,0 +1 @@
+# pytest kök dizini: testler hisse_analiz ve olcum paketlerini kurulum olmadan içe aktarır
@@ -0,0 +1 @@
+# Hisse analiz uygulamasının Streamlit'ten bağımsız yardımcı modülleri
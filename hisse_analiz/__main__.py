@@ -0,0 +1,290 @@
+import os
+import sys
+import argparse
+
+# --- Komut satırı ---
+# Taramaları Streamlit olmadan (cron, işçi havuzu, ölçüm) çalıştırır:
+#   python -m hisse_analiz otomatik --evren BIST30 BIST50 --cikti sonuc.parquet --arsiv
+#   python -m hisse_analiz tavan --evren BIST100 --isci 0 --cikti tavan.json
+#   python -m hisse_analiz alim --hedefler 8 15 20
+#   python -m hisse_analiz geritest --period 5y --cikti geritest.csv
+#   python -m hisse_analiz sorgu "RSI14 < 35 and Hacim_Orani > 1.5" --sirala Tahmini_Yuzde --ilk 20
+#   python -m hisse_analiz zengin --evren BIST30 --cikti zengin.csv
+#   python -m hisse_analiz arsiv                          # arşivdeki görüntüler (* son)
+#   python -m hisse_analiz arsiv --gun 2024-06-14 --tablo otomatik
+#   python -m hisse_analiz arsiv --fark                   # alım bölgesine dünden beri girenler
+#   python -m hisse_analiz izle EREGL THYAO --kaynak simule --aralik 1
+#   python -m hisse_analiz analiz EREGL --aralik 1h
+# Ağır modüller (pandas, yfinance) yalnızca komut çalışırken içe aktarılır.
+
+
+def sonucu_yaz(df, cikti):
+    # Çıktı biçimi uzantıdan anlaşılır; verilmezse CSV olarak stdout'a yazılır
+    if not cikti or cikti == "-":
+        df.to_csv(sys.stdout, index=False)
+    elif cikti.endswith(".parquet"):
+        df.to_parquet(cikti, index=False)
+    elif cikti.endswith(".json"):
+        df.to_json(cikti, orient="records", force_ascii=False, indent=2)
+    else:
+        df.to_csv(cikti, index=False)
+
+
+def metrikleri_yaz(yol):
+    from hisse_analiz.metrikler import prometheus_metni, json_satirlari
+    with open(yol, "w", encoding="utf-8") as f:
+        f.write(json_satirlari() if yol.endswith((".jsonl", ".json")) else prometheus_metni())
+
+
+def arsive_yaz(ad, df, args):
+    if args.arsiv:
+        from hisse_analiz.arsiv import Arsiv
+        Arsiv().tablo_kaydet(ad, df)
+
+
+def _evren(secilenler, listeler):
+    bilinmeyen = [e for e in secilenler if e not in listeler]
+    if bilinmeyen:
+        raise SystemExit(f"Bilinmeyen evren: {', '.join(bilinmeyen)} (seçenekler: {', '.join(listeler)})")
+    return {e: listeler[e] for e in secilenler}
+
+
+def otomatik(args):
+    from hisse_analiz.listeler import toplu_listeler
+    from hisse_analiz.tarama import otomatik_toplu_tarama
+    evren = _evren(args.evren or list(toplu_listeler), toplu_listeler)
+    df = otomatik_toplu_tarama(evren, guncelle=not args.guncelleme_yok, isci_sayisi=args.isci)
+    arsive_yaz("otomatik", df, args)
+    sonucu_yaz(df, args.cikti)
+
+
+def tavan(args):
+    from hisse_analiz.listeler import borsalar
+    from hisse_analiz.tarama import tavan_taramasi
+    evren = _evren(args.evren or ["BIST30"], borsalar)
+    hisseler = [h for liste in evren.values() for h in liste]
+    df = tavan_taramasi(hisseler, guncelle=not args.guncelleme_yok, isci_sayisi=args.isci, gun_ici=args.gun_ici)
+    arsive_yaz("tavan", df, args)
+    sonucu_yaz(df, args.cikti)
+
+
+def alim(args):
+    from hisse_analiz.listeler import toplu_listeler
+    from hisse_analiz.tarama import toplu_alim_ve_hedef
+    evren = _evren(args.evren or list(toplu_listeler), toplu_listeler)
+    df = toplu_alim_ve_hedef(evren, args.hedefler, isci_sayisi=args.isci)
+    arsive_yaz("alim", df, args)
+    sonucu_yaz(df, args.cikti)
+
+
+def geritest(args):
+    from hisse_analiz.listeler import borsalar
+    from hisse_analiz.veri import toplu_veri, TARAMA_ALANLARI
+    from hisse_analiz.geritest import geriye_test
+    evren = _evren(args.evren or ["BIST100"], borsalar)
+    tickers = list(dict.fromkeys(h + ".IS" for liste in evren.values() for h in liste))
+    panel = toplu_veri(tickers, period=args.period, guncelle=not args.guncelleme_yok, alanlar=TARAMA_ALANLARI)
+    for ad, tablo in geriye_test(panel["Close"], panel["Volume"]).items():
+        if args.cikti:
+            kok, uzanti = os.path.splitext(args.cikti)
+            sonucu_yaz(tablo, f"{kok}_{ad}{uzanti}")
+        else:
+            print(f"# {ad}")
+            print(tablo.to_string(index=False))
+
+
+def sorgu(args):
+    from hisse_analiz.listeler import evren
+    from hisse_analiz.tarama import tarama_indeksi
+    from hisse_analiz.sorgu import TaramaIndeksi, HAZIR_SORGULAR
+    if args.hazir:
+        for ad, ifade in HAZIR_SORGULAR.items():
+            print(f"{ad}: {ifade}")
+        return
+    listeler = evren.sozluk(ayrik=True)
+    secilen = _evren(args.evren or list(listeler), listeler)
+    indeks = TaramaIndeksi(tarama_indeksi(secilen, guncelle=not args.guncelleme_yok, isci_sayisi=args.isci))
+    try:
+        sonuc = indeks.sorgula(args.ifade, args.sirala, args.artan, args.ilk, args.sutunlar)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    sonucu_yaz(sonuc, args.cikti)
+
+
+def zengin(args):
+    from hisse_analiz.listeler import evren
+    from hisse_analiz.zenginlestirme import Zenginlestirici
+    listeler = {ad: evren.liste(ad) for ad in evren.adlar()}
+    hisseler = [h for liste in _evren(args.evren or list(listeler), listeler).values() for h in liste]
+    sonucu_yaz(Zenginlestirici(isci_sayisi=args.isci or 4).topla(hisseler), args.cikti)
+
+
+def arsiv(args):
+    import pandas as pd
+    from hisse_analiz.arsiv import Arsiv
+    from hisse_analiz.sorgu import ALIM_KURALI
+    a = Arsiv(args.dizin) if args.dizin else Arsiv()
+    if args.fark is not None:
+        try:
+            sonuc = a.gun_farki(args.fark or ALIM_KURALI, args.gun, args.onceki, args.tablo or "indeks")
+        except ValueError as e:
+            raise SystemExit(str(e))
+        if sonuc is None:
+            raise SystemExit("Karşılaştırılacak iki gün (ve tablo) arşivde yok.")
+        gun, onceki, girenler, cikanlar = sonuc
+        print(f"# {onceki} -> {gun}: {len(girenler)} giren, {len(cikanlar)} çıkan", file=sys.stderr)
+        sonucu_yaz(pd.concat([girenler.assign(Degisim_Turu="giren"), cikanlar.assign(Degisim_Turu="cikan")],
+                             ignore_index=True), args.cikti)
+        return
+    if not args.tablo:
+        son = a.son()
+        for kimlik in a.goruntuler(args.gun):
+            anlik = a.yukle(kimlik)
+            if anlik is not None:
+                print(f"{kimlik}{'  *' if kimlik == son else ''}  " + ", ".join(
+                    f"{ad} ({len(t)})" for ad, t in anlik.tablolar.items()))
+        return
+    gun = args.gun or (a.gunler(args.tablo) or [None])[-1]
+    anlik = a.yukle(gun, [args.tablo]) if gun else None
+    if anlik is None or args.tablo not in anlik.tablolar:
+        raise SystemExit(f"Arşivde tablo yok: {args.tablo} ({gun or 'arşiv boş'})")
+    tablo = anlik.tablolar[args.tablo]
+    sonucu_yaz(getattr(tablo, "tablo", tablo), args.cikti)
+
+
+def izle(args):
+    import time
+    from hisse_analiz.izleme import IzlemeServisi, SimuleKaynak, depo_kaynagi
+    kaynak = SimuleKaynak(tohum=args.tohum) if args.kaynak == "simule" else depo_kaynagi(yalniz_seans=False)
+    servis = IzlemeServisi(kaynak, aralik=args.aralik)
+    goruldu = [0]
+
+    def alarmlari_yaz(anlik):
+        for a in anlik.alarmlar:
+            if a["surum"] > goruldu[0]:
+                print(f"{a['zaman']:%H:%M:%S} {a['Hisse']}: {a['mesaj']}", flush=True)
+        goruldu[0] = anlik.surum
+
+    servis.abone_ol(alarmlari_yaz)
+    servis.izle([h.upper() + ".IS" for h in args.hisseler])
+    tur = 0
+    while not args.tur or tur < args.tur:
+        servis.tur()
+        tur += 1
+        if not args.tur or tur < args.tur:
+            time.sleep(args.aralik)
+    if servis.anlik() is not None:
+        print(servis.anlik().tablo.to_string(index=False))
+
+
+def analiz(args):
+    import datetime
+    from hisse_analiz.veri import tekli_veri
+    from hisse_analiz.gostergeler import get_ticker, compute_RSI, hedef_analizi, yorum_metni
+    ticker = get_ticker(args.hisse)
+    baslangic = datetime.date.fromisoformat(args.baslangic)
+    bitis = datetime.date.today() + datetime.timedelta(days=1)
+    data = tekli_veri(ticker, baslangic, bitis, args.aralik).dropna(subset=["Close", "Volume"])
+    if len(data) < 50:
+        raise SystemExit("Analiz için yeterli (en az 50 bar) Close/Volume verisi çekilemedi.")
+    data["MA20"] = data["Close"].rolling(20).mean()
+    data["MA50"] = data["Close"].rolling(50).mean()
+    data["RSI14"] = compute_RSI(data)
+    hedefler = hedef_analizi(ticker, args.hedefler, data)
+    if hedefler is None:
+        raise SystemExit("Hisse temel verileri (fiyat, zirve/dip) çekilemedi.")
+    yorum = yorum_metni(hedefler, data)
+    if yorum is None:
+        raise SystemExit("RSI ve Hareketli Ortalama hesaplaması için yeterli veri yok.")
+    print(yorum)
+
+
+def ana(argv=None):
+    from hisse_analiz.ornekleme import ARALIKLAR
+    ayristirici = argparse.ArgumentParser(prog="hisse_analiz", description="BIST tarama araçları")
+    ayristirici.add_argument("--depo", help="Yerel OHLCV deposu dizini (varsayılan: HISSE_VERI_DIZINI ya da ./veri)")
+    ayristirici.add_argument("--metrikler", help="Aşama süreleri ve sayaçlar: .prom (Prometheus) ya da .jsonl")
+    alt = ayristirici.add_subparsers(dest="komut", required=True)
+
+    for ad, fonksiyon, aciklama in (("otomatik", otomatik, "Otomatik toplu tarama"),
+                                    ("tavan", tavan, "Ertesi gün tavan skoru taraması"),
+                                    ("alim", alim, "Alım bölgesi ve hedef fiyatlar")):
+        komut = alt.add_parser(ad, help=aciklama)
+        komut.add_argument("--evren", nargs="+", help="Taranacak listeler (ör. BIST30 BIST50)")
+        komut.add_argument("--cikti", help="Çıktı dosyası (.csv, .parquet, .json); verilmezse stdout")
+        komut.add_argument("--isci", type=int, default=1, help="Gösterge hesabı için süreç sayısı (0: tüm çekirdekler)")
+        if ad == "alim":
+            komut.add_argument("--hedefler", nargs=3, type=float, default=[8, 15, 20], help="Hedef yüzdeleri")
+        else:
+            komut.add_argument("--guncelleme-yok", action="store_true", help="İndirme yapma, yalnızca depodaki veriyi kullan")
+        if ad == "tavan":
+            komut.add_argument("--gun-ici", action="store_true", help="Bugünün barını 5 dakikalık seriden tamamla")
+        komut.add_argument("--arsiv", action="store_true", help="Sonucu günün tarama arşivine de yaz")
+        komut.set_defaults(fonksiyon=fonksiyon)
+
+    komut = alt.add_parser("geritest", help="Tahmin ve tavan skoru sinyallerinin geriye dönük testi")
+    komut.add_argument("--evren", nargs="+", help="Listeler (varsayılan: BIST100, tüm piyasa)")
+    komut.add_argument("--period", default="5y", help="Geçmiş uzunluğu (ör. 2y, 5y)")
+    komut.add_argument("--cikti", help="Tablolar <kök>_<tablo>.<uzantı> dosyalarına yazılır; verilmezse ekrana")
+    komut.add_argument("--guncelleme-yok", action="store_true", help="İndirme yapma, yalnızca depodaki veriyi kullan")
+    komut.set_defaults(fonksiyon=geritest)
+
+    komut = alt.add_parser("sorgu", help="Gösterge tablosunda süzgeç ve sıralama")
+    komut.add_argument("ifade", nargs="?", help='Süzgeç, ör. "RSI14 < 35 and Hacim_Orani > 1.5" (boş: tümü)')
+    komut.add_argument("--sirala", help="Sıralama sütunu (ör. Tahmini_Yuzde)")
+    komut.add_argument("--artan", action="store_true", help="Küçükten büyüğe sırala (varsayılan: büyükten)")
+    komut.add_argument("--ilk", type=int, help="Yalnızca ilk K satır")
+    komut.add_argument("--sutunlar", nargs="+", help="Çıktı sütunları")
+    komut.add_argument("--hazir", action="store_true", help="Hazır sorguları listele")
+    komut.add_argument("--evren", nargs="+", help="Listeler (varsayılan: tümü)")
+    komut.add_argument("--cikti", help="Çıktı dosyası (.csv, .parquet, .json); verilmezse stdout")
+    komut.add_argument("--isci", type=int, default=1, help="Gösterge hesabı için süreç sayısı (0: tüm çekirdekler)")
+    komut.add_argument("--guncelleme-yok", action="store_true", help="İndirme yapma, yalnızca depodaki veriyi kullan")
+    komut.set_defaults(fonksiyon=sorgu)
+
+    komut = alt.add_parser("zengin", help="Temel oranlar ve son haberler (disk önbellekli)")
+    komut.add_argument("--evren", nargs="+", help="Listeler (varsayılan: tümü)")
+    komut.add_argument("--cikti", help="Çıktı dosyası (.csv, .parquet, .json); verilmezse stdout")
+    komut.add_argument("--isci", type=int, default=4, help="Eşzamanlı istek sayısı")
+    komut.set_defaults(fonksiyon=zengin)
+
+    komut = alt.add_parser("arsiv", help="Arşivlenmiş taramalar: görüntüler, tablolar, günler arası fark")
+    komut.add_argument("--gun", help="Gün (YYYY-AA-GG; günün son hali) ya da görüntü kimliği (varsayılan: son gün)")
+    komut.add_argument("--tablo", help="Tablo (otomatik, tavan, indeks, alim); verilmezse görüntüler listelenir")
+    komut.add_argument("--fark", nargs="?", const="", metavar="IFADE",
+                       help="Önceki güne göre koşula girenler/çıkanlar (varsayılan: alım bölgesi, indeks tablosu)")
+    komut.add_argument("--onceki", help="Karşılaştırılan gün (varsayılan: arşivdeki bir önceki gün)")
+    komut.add_argument("--dizin", help="Arşiv dizini (varsayılan: HISSE_ARSIV_DIZINI ya da <depo>/arsiv)")
+    komut.add_argument("--cikti", help="Çıktı dosyası (.csv, .parquet, .json); verilmezse stdout")
+    komut.set_defaults(fonksiyon=arsiv)
+
+    komut = alt.add_parser("izle", help="Canlı izleme listesi; eşik alarmlarını yazar")
+    komut.add_argument("hisseler", nargs="+")
+    komut.add_argument("--kaynak", choices=["depo", "simule"], default="depo", help="Fiyat kaynağı")
+    komut.add_argument("--aralik", type=float, default=15, help="Yoklama aralığı (saniye)")
+    komut.add_argument("--tur", type=int, default=0, help="Tur sayısı (0: durdurulana kadar)")
+    komut.add_argument("--tohum", type=int, default=0, help="Simüle kaynağın rastgele tohumu")
+    komut.set_defaults(fonksiyon=izle)
+
+    komut = alt.add_parser("analiz", help="Tek hisse yorumu")
+    komut.add_argument("hisse")
+    komut.add_argument("--baslangic", default="2024-01-01")
+    komut.add_argument("--aralik", default="1d", choices=list(ARALIKLAR), help="Zaman dilimi (gün içi: en fazla ~59 gün)")
+    komut.add_argument("--hedefler", nargs=3, type=float, default=[8, 15, 20])
+    komut.set_defaults(fonksiyon=analiz)
+
+    args = ayristirici.parse_args(argv)
+    if getattr(args, "isci", None) == 0:
+        args.isci = None
+    if args.depo:
+        from hisse_analiz.veri import varsayilan_depoyu_ayarla
+        varsayilan_depoyu_ayarla(args.depo)
+    try:
+        args.fonksiyon(args)
+    finally:
+        if args.metrikler:
+            metrikleri_yaz(args.metrikler)
+
+
+if __name__ == "__main__":
+    ana()
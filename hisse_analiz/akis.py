@@ -0,0 +1,213 @@
+import math
+from collections import deque
+import pandas as pd
+
+# --- Artımlı (akış) gösterge durumu ---
+# Her yeni barda tüm geçmişi yeniden hesaplamak yerine hisse başına pencere
+# toplamları tutulur; RSI14, MA20/MA50, EMA10, 60 günlük yükseliş oranı ve
+# hacim ortalamaları sabit sürede güncellenir. Çıktılar motor.toplu_gostergeler
+# ile aynı sütun adlarını ve aynı NaN temizliği kurallarını kullanır:
+#   1. seviye: Close ve Volume dolu barlar (MA20, MA50, RSI14)
+#   2. seviye: RSI14 hesaplanabilen barlar (EMA10, MA20_R, MA50_R, hacim,
+#              yükseliş oranı, tavan skoru)
+EMA_ALFA = 2 / (10 + 1)
+ESITLEME_ARALIGI = 256  # kayan toplamlar bu kadar güncellemede bir baştan toplanır
+
+
+class KayanToplam:
+    # Sabit uzunluklu pencerenin toplamı ve sıfırdan farklı eleman sayısı.
+    # Sıfır sayacı, kayıp toplamının gerçekten 0 olduğunu (RSI=100 / NaN)
+    # kayan nokta artığından bağımsız anlamayı sağlar.
+    __slots__ = ("pencere", "degerler", "toplam", "sifirdan_farkli", "_sayac")
+
+    def __init__(self, pencere):
+        self.pencere = pencere
+        self.degerler = deque(maxlen=pencere)
+        self.toplam = 0.0
+        self.sifirdan_farkli = 0
+        self._sayac = 0
+
+    def ekle(self, x):
+        if len(self.degerler) == self.pencere:
+            cikan = self.degerler[0]
+            self.toplam -= cikan
+            self.sifirdan_farkli -= cikan != 0
+        self.degerler.append(x)
+        self.toplam += x
+        self.sifirdan_farkli += x != 0
+        self._sayac += 1
+        if self._sayac >= ESITLEME_ARALIGI:
+            self.toplam = math.fsum(self.degerler)
+            self._sayac = 0
+
+    def dolu(self):
+        return len(self.degerler) == self.pencere
+
+    def ortalama(self):
+        # rolling(pencere).mean() son değeri: pencere dolmadıysa NaN
+        if not self.dolu():
+            return float("nan")
+        return 0.0 if self.sifirdan_farkli == 0 else self.toplam / self.pencere
+
+    def kuyruk_ortalamasi(self):
+        # tail(pencere).mean(): eldeki kadarıyla ortalama
+        if not self.degerler:
+            return float("nan")
+        return self.toplam / len(self.degerler)
+
+    def kopya(self):
+        yeni = KayanToplam.__new__(KayanToplam)
+        yeni.pencere = self.pencere
+        yeni.degerler = deque(self.degerler, maxlen=self.pencere)
+        yeni.toplam = self.toplam
+        yeni.sifirdan_farkli = self.sifirdan_farkli
+        yeni._sayac = self._sayac
+        return yeni
+
+
+class GostergeDurumu:
+    _PENCERELER = ("_kazanc", "_kayip", "_c20", "_c50", "_c20_r", "_c50_r", "_yukselis", "_h5", "_h10")
+
+    def __init__(self, period=14):
+        self.period = period
+        self.gun1 = 0
+        self.gun2 = 0
+        self._onceki1 = None        # 1. seviyedeki son kapanış
+        self._onceki2 = None        # 2. seviyedeki son kapanış
+        self._onceki2_once = None   # 2. seviyedeki sondan bir önceki kapanış
+        self._hacim2 = float("nan")
+        self._rsi2 = float("nan")
+        self._ema = None
+        self._kazanc = KayanToplam(period)
+        self._kayip = KayanToplam(period)
+        self._c20 = KayanToplam(20)
+        self._c50 = KayanToplam(50)
+        self._c20_r = KayanToplam(20)
+        self._c50_r = KayanToplam(50)
+        self._yukselis = KayanToplam(59)   # son 60 barın içindeki 59 ardışık fark
+        self._h5 = KayanToplam(5)
+        self._h10 = KayanToplam(10)
+        self._gecici = None         # henüz kapanmamış barla hesaplanmış kopya
+
+    @classmethod
+    def gecmisten(cls, data):
+        # 'Close' ve 'Volume' sütunlu geçmişten ısıtılmış durum
+        durum = cls()
+        for close, volume in zip(data["Close"].to_numpy(), data["Volume"].to_numpy()):
+            durum._isle(close, volume)
+        return durum
+
+    def kopya(self):
+        yeni = GostergeDurumu.__new__(GostergeDurumu)
+        yeni.__dict__.update(self.__dict__)
+        for ad in self._PENCERELER:
+            setattr(yeni, ad, getattr(self, ad).kopya())
+        yeni._gecici = None
+        return yeni
+
+    def ekle(self, close, volume, kesin=True):
+        # Yeni bar. kesin=False ise bar henüz kapanmamıştır (gün içi): kalıcı
+        # durum değişmez, aynı bar sonraki çağrılarda revize edilebilir.
+        if kesin:
+            self._gecici = None
+            self._isle(close, volume)
+            return self.degerler()
+        self._gecici = self.kopya()
+        self._gecici._isle(close, volume)
+        return self._gecici.degerler()
+
+    def _isle(self, close, volume):
+        if close is None or volume is None or math.isnan(close) or math.isnan(volume):
+            return  # dropna()
+
+        # 1. seviye: RSI ve MA20/MA50
+        self.gun1 += 1
+        delta = close - self._onceki1 if self._onceki1 is not None else 0.0
+        self._onceki1 = close
+        self._kazanc.ekle(delta if delta > 0 else 0.0)
+        self._kayip.ekle(-delta if delta < 0 else 0.0)
+        self._c20.ekle(close)
+        self._c50.ekle(close)
+
+        rsi = self._rsi()
+        if math.isnan(rsi):
+            return  # dropna(subset=['RSI14'])
+
+        # 2. seviye
+        self.gun2 += 1
+        if self._onceki2 is not None:
+            self._yukselis.ekle(1.0 if close > self._onceki2 else 0.0)
+        self._onceki2_once = self._onceki2
+        self._onceki2 = close
+        self._rsi2 = rsi
+        self._hacim2 = volume
+        self._c20_r.ekle(close)
+        self._c50_r.ekle(close)
+        self._h5.ekle(volume)
+        self._h10.ekle(volume)
+        self._ema = close if self._ema is None else EMA_ALFA * close + (1 - EMA_ALFA) * self._ema
+
+    def _rsi(self):
+        if not self._kazanc.dolu():
+            return float("nan")
+        kazanc = self._kazanc.ortalama()
+        kayip = self._kayip.ortalama()
+        if kayip == 0:
+            return float("nan") if kazanc == 0 else 100.0
+        return 100 - (100 / (1 + kazanc / kayip))
+
+    def degerler(self):
+        if self._gecici is not None:
+            return self._gecici.degerler()
+        nan = float("nan")
+        fiyat = self._onceki2 if self._onceki2 is not None else nan
+        ema10 = self._ema if self._ema is not None else nan
+        rsi = self._rsi2
+        hacim = self._hacim2
+        hacim5 = self._h5.kuyruk_ortalamasi()
+        hacim10 = self._h10.kuyruk_ortalamasi()
+        ma20_r = self._c20_r.ortalama()
+        ma50_r = self._c50_r.ortalama()
+
+        # tahmini_olasilik
+        if self.gun2 >= 60:
+            yukselis60 = self._yukselis.toplam / 60 * 100
+            tahmini = (yukselis60 + (10 if fiyat > ema10 else 0) + (5 if rsi < 30 else 0)
+                       + (5 if hacim > hacim5 else 0))
+        else:
+            yukselis60 = tahmini = 50.0
+
+        # tavan_skoru
+        if self.gun1 >= 50 and self.gun2 >= 2:
+            onceki = self._onceki2_once
+            degisim = (fiyat - onceki) / onceki * 100 if onceki else nan
+            skor = ((30 if degisim > 7 else 0) + (25 if hacim > hacim10 * 1.5 else 0)
+                    + (15 if rsi > 50 else 0) + (15 if fiyat > ma20_r else 0)
+                    + (15 if fiyat > ma50_r else 0))
+        else:
+            degisim, skor = nan, 0
+
+        return {
+            "Gun1": self.gun1,
+            "Gun2": self.gun2,
+            "Fiyat": fiyat,
+            "MA20": self._c20.ortalama(),
+            "MA50": self._c50.ortalama(),
+            "MA20_R": ma20_r,
+            "MA50_R": ma50_r,
+            "RSI14": rsi,
+            "EMA10": ema10,
+            "Yukselis60": yukselis60,
+            "Hacim": hacim,
+            "Hacim5": hacim5,
+            "Hacim10": hacim10,
+            "Tahmini_Yuzde": tahmini,
+            "Degisim": degisim,
+            "Tavan_Skoru": skor,
+        }
+
+
+def panelden_durumlar(close, volume):
+    # Geniş Close/Volume panelinden hisse başına ısıtılmış durumlar
+    return {t: GostergeDurumu.gecmisten(pd.DataFrame({"Close": close[t], "Volume": volume[t]}))
+            for t in close.columns}
@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from hisse_analiz.veri import varsayilan_depo
+from hisse_analiz.servis import AnlikGoruntu
+from hisse_analiz.sorgu import TaramaIndeksi, kosul, eksik_sutunlar, ALIM_KURALI
+from hisse_analiz.metrikler import asama
+
+# --- Tarama arşivi ---
+# Tamamlanan tarama görüntüleri (otomatik, tavan, sorgu indeksi, toplu alım)
+# görüntü başına bir klasöre, tablo başına bir Arrow IPC dosyası olarak yazılır:
+#   <dizin>/<YYYY-MM-DD>/<SSDDss-mikrosaniye>_<veri sürümü>/<tablo>.arrow
+#   <dizin>/SON   -> son tam görüntünün kimliği ("<gün>/<klasör>")
+# Görüntü klasörü geçici adla yazılıp tek rename ile yayınlanır; hiçbir
+# görüntü üzerine yazılmaz, SON işaretçisi en son (atomik) değiştirilir.
+# Zaman, veri sürümü ve biçim sürümü her dosyanın şema üst verisindedir;
+# indirme durumları _durumlar.arrow tablosundadır. Dosyalar sıkıştırılmaz:
+# okurken bellek eşlenir (memory map), sütunlar kopyalanmadan diskteki
+# tampona bağlanır. Açılışta son görüntü, geçmiş günler ve günler arası
+# farklar (alım bölgesine yeni girenler) hesap yapılmadan arşivden okunur.
+# Dizin verilmezse HISSE_ARSIV_DIZINI, o da yoksa o anki varsayılan bar
+# deposunun altındaki arsiv klasörü (komut satırındaki --depo ile taşınır)
+ARSIV_DIZINI = os.environ.get("HISSE_ARSIV_DIZINI")
+BICIM_SURUMU = 2   # dosya düzeni değişince artırılır; eski biçimli dosyalar okunmaz
+UZANTI = ".arrow"
+DURUMLAR = "_durumlar"
+SON = "SON"
+META_ANAHTARI = b"hisse_analiz"
+
+
+def _tablo_yaz(yol, df, meta):
+    tablo = pa.Table.from_pandas(df, preserve_index=False)
+    ust_veri = dict(tablo.schema.metadata or {})
+    ust_veri[META_ANAHTARI] = json.dumps({"bicim": BICIM_SURUMU, **meta}).encode()
+    tablo = tablo.replace_schema_metadata(ust_veri)
+    # Yarım kalan yazma okuyucuya bozuk dosya göstermesin
+    gecici = yol + ".tmp"
+    with pa.OSFile(gecici, "wb") as f, pa.ipc.new_file(f, tablo.schema) as yazici:
+        yazici.write_table(tablo)
+    os.replace(gecici, yol)
+
+
+def _tablo_oku(yol):
+    # (DataFrame, meta) ya da biçim sürümü farklıysa (None, meta)
+    tablo = pa.ipc.open_file(pa.memory_map(yol)).read_all()
+    meta = json.loads((tablo.schema.metadata or {}).get(META_ANAHTARI, b"{}"))
+    if meta.get("bicim") != BICIM_SURUMU:
+        return None, meta
+    # split_blocks: sütunlar tek bloğa birleştirilmez, boşluksuz sayısal sütunlar kopyalanmaz
+    return tablo.to_pandas(split_blocks=True), meta
+
+
+def fark(yeni, eski, ifade=ALIM_KURALI, tablo="tablo"):
+    # İki tablo arasında koşulu yeni sağlayan ve artık sağlamayan hisseler:
+    # (girenler: yeni tablodan satırlar, cikanlar: eski tablodan satırlar).
+    # Koşulun sütunları tablolarda yoksa (boş olsalar da) ValueError
+    for df in (yeni, eski):
+        eksik = eksik_sutunlar(ifade, df.columns) if len(df.columns) else []   # sütunsuz: boş tarama
+        if eksik:
+            raise ValueError(f"'{tablo}' tablosunda koşulun kullandığı sütun yok: {', '.join(eksik)}"
+                             f" (sütunlar: {', '.join(map(str, df.columns))})")
+    yeni, eski = (df[kosul(df, ifade)] if len(df) else df for df in (yeni, eski))
+    yeni_h, eski_h = (set(df["Hisse"]) if len(df) else set() for df in (yeni, eski))
+    girenler = yeni[~yeni["Hisse"].isin(eski_h)] if len(yeni) else yeni
+    cikanlar = eski[~eski["Hisse"].isin(yeni_h)] if len(eski) else eski
+    return girenler.reset_index(drop=True), cikanlar.reset_index(drop=True)
+
+
+def _gun(kimlik):
+    # "2024-06-14/093000-000000_ab12" ya da "2024-06-14" -> "2024-06-14"
+    return str(kimlik).split("/")[0]
+
+
+def kimlik_bilgisi(kimlik):
+    # "2024-06-14/093000-000000_ab12" -> (datetime, "ab12")
+    gun, klasor = str(kimlik).split("/")
+    saat, _, surum = klasor.partition("_")
+    return datetime.datetime.strptime(f"{gun} {saat}", "%Y-%m-%d %H%M%S-%f"), surum
+
+
+class Arsiv:
+    def __init__(self, dizin=None):
+        self.dizin = dizin or ARSIV_DIZINI or os.path.join(varsayilan_depo().dizin, "arsiv")
+
+    def _klasor(self, kimlik):
+        return os.path.join(self.dizin, *str(kimlik).split("/"))
+
+    def goruntuler(self, gun=None):
+        # Görüntü kimlikleri ("<gün>/<klasör>"), eskiden yeniye; gun verilirse yalnızca o gün
+        if not os.path.isdir(self.dizin):
+            return []
+        sonuc = []
+        for g in sorted(os.listdir(self.dizin)) if gun is None else [_gun(gun)]:
+            if not os.path.isdir(self._klasor(g)):
+                continue
+            sonuc += [f"{g}/{k}" for k in sorted(os.listdir(self._klasor(g)))
+                      if not k.endswith(".tmp") and os.path.isdir(self._klasor(f"{g}/{k}"))]
+        return sonuc
+
+    def gunler(self, tablo=None):
+        # Görüntüsü (tablo verilirse o tabloyu içeren görüntüsü) olan günler (ISO tarih), eskiden yeniye
+        kimlikler = self.goruntuler()
+        if tablo is not None:
+            kimlikler = [k for k in kimlikler if os.path.exists(os.path.join(self._klasor(k), tablo + UZANTI))]
+        return list(dict.fromkeys(_gun(k) for k in kimlikler))
+
+    def onceki_gun(self, gun, tablo=None):
+        onceki = [g for g in self.gunler(tablo) if g < _gun(gun)]
+        return onceki[-1] if onceki else None
+
+    def son(self):
+        # SON işaretçisinin gösterdiği görüntü; işaretçi yoksa en yeni görüntü
+        try:
+            with open(os.path.join(self.dizin, SON), encoding="utf-8") as f:
+                kimlik = f.read().strip()
+            if os.path.isdir(self._klasor(kimlik)):
+                return kimlik
+        except OSError:
+            pass
+        goruntuler = self.goruntuler()
+        return goruntuler[-1] if goruntuler else None
+
+    # --- Yazma ---
+    def _goruntu_yaz(self, tablolar, zaman=None, surum=None, durumlar=None):
+        # Yeni görüntü klasörü yazar ve kimliğini döndürür.
+        # tablolar: ad -> DataFrame ya da sorgu.TaramaIndeksi (tablosu yazılır, okurken yeniden kurulur)
+        zaman = zaman or datetime.datetime.now()
+        etiket = re.sub(r"\W", "", str(surum or "")) or "0"
+        kimlik = f"{zaman:%Y-%m-%d}/{zaman:%H%M%S-%f}_{etiket}"
+        klasor = self._klasor(kimlik)
+        gecici = f"{klasor}.{os.getpid()}.tmp"
+        os.makedirs(gecici)
+        meta = {"zaman": zaman.isoformat(), "surum": surum}
+        with asama("arsiv_yaz") as bilgi:
+            bilgi["tablo"] = len(tablolar)
+            for ad, tablo in tablolar.items():
+                indeks = isinstance(tablo, TaramaIndeksi)
+                _tablo_yaz(os.path.join(gecici, ad + UZANTI), tablo.tablo if indeks else tablo,
+                           {**meta, "indeks": indeks})
+            if durumlar is not None:
+                df = pd.DataFrame([(t, d, a) for t, (d, a) in durumlar.items()],
+                                  columns=["Ticker", "Durum", "Aciklama"])
+                _tablo_yaz(os.path.join(gecici, DURUMLAR + UZANTI), df, meta)
+            # Görüntü tek adımda görünür olur; yarım klasör okunmaz
+            os.rename(gecici, klasor)
+        return kimlik
+
+    def tablo_kaydet(self, ad, tablo, zaman=None, surum=None):
+        # Tek tablolu görüntü (ör. toplu alım); SON işaretçisi değişmez
+        return self._goruntu_yaz({ad: tablo}, zaman, surum)
+
+    def kaydet(self, anlik):
+        # servis.AnlikGoruntu; eksik (ilk turun ara) görüntüleri yazılmaz
+        if anlik.eksik:
+            return None
+        kimlik = self._goruntu_yaz(anlik.tablolar, anlik.zaman, anlik.surum, anlik.durumlar)
+        gecici = os.path.join(self.dizin, f"{SON}.{os.getpid()}.tmp")
+        with open(gecici, "w", encoding="utf-8") as f:
+            f.write(kimlik)
+        os.replace(gecici, os.path.join(self.dizin, SON))
+        return kimlik
+
+    # --- Okuma ---
+    def _dosyalar(self, kimlik, tablolar=None):
+        # {tablo adı: yol}: görüntü kimliği verilirse o görüntü; gün verilirse
+        # her tablo o günün onu içeren en yeni görüntüsünden
+        kimlikler = [kimlik] if "/" in str(kimlik) else self.goruntuler(kimlik)
+        dosyalar = {}
+        for k in kimlikler:
+            klasor = self._klasor(k)
+            if not os.path.isdir(klasor):
+                continue
+            for dosya in os.listdir(klasor):
+                ad = dosya[:-len(UZANTI)]
+                if dosya.endswith(UZANTI) and (not tablolar or ad in tablolar or ad == DURUMLAR):
+                    dosyalar[ad] = os.path.join(klasor, dosya)
+        return dosyalar
+
+    def yukle(self, kimlik=None, tablolar=None):
+        # Görüntü (kimlik: görüntü kimliği, gün ya da None -> SON) veya yoksa None.
+        # Görüntünün zamanı en yeni tablonun, sürümü sürümlü tabloların ortak
+        # veri sürümüdür (tablolar farklı turlardan geldiyse None).
+        kimlik = kimlik or self.son()
+        if kimlik is None:
+            return None
+        sonuc, durumlar, zamanlar, surumler = {}, {}, [], set()
+        with asama("arsiv_oku") as bilgi:
+            for ad, yol in sorted(self._dosyalar(kimlik, tablolar).items()):
+                df, meta = _tablo_oku(yol)
+                if df is None:
+                    continue
+                zaman = datetime.datetime.fromisoformat(meta["zaman"])
+                if ad == DURUMLAR:
+                    durumlar = dict(zip(df["Ticker"], zip(df["Durum"], df["Aciklama"])))
+                    continue
+                sonuc[ad] = TaramaIndeksi(df, zaman) if meta.get("indeks") else df
+                zamanlar.append(zaman)
+                if meta.get("surum") is not None:
+                    surumler.add(meta["surum"])
+            bilgi["tablo"] = len(sonuc)
+        if not sonuc:
+            return None
+        surum = surumler.pop() if len(surumler) == 1 else None
+        return AnlikGoruntu(max(zamanlar), surum, sonuc, durumlar)
+
+    def gun_farki(self, ifade=ALIM_KURALI, gun=None, onceki=None, tablo="indeks"):
+        # Günün (ya da görüntünün) tablosunu bir önceki günle (ya da verilen
+        # gün/görüntüyle) karşılaştırır: (gun, onceki, girenler, cikanlar);
+        # karşılaştırılacak gün yoksa None
+        gun = gun or (self.gunler(tablo) or [None])[-1]
+        onceki = onceki or (self.onceki_gun(gun, tablo) if gun else None)
+        if gun is None or onceki is None:
+            return None
+        yeni, eski = self.yukle(gun, [tablo]), self.yukle(onceki, [tablo])
+        if yeni is None or eski is None or tablo not in yeni.tablolar or tablo not in eski.tablolar:
+            return None
+        yeni, eski = yeni.tablolar[tablo], eski.tablolar[tablo]
+        if isinstance(yeni, TaramaIndeksi):
+            yeni, eski = yeni.tablo, eski.tablo
+        return (gun, onceki, *fark(yeni, eski, ifade, tablo))
@@ -0,0 +1,134 @@
+import os
+import json
+import datetime
+import pandas as pd
+
+# --- Yerel OHLCV deposu ---
+# Her hisse ve zaman dilimi için tek bir Parquet dosyası tutulur:
+#   <dizin>/<interval>/<TICKER>.parquet
+# Hangi hissenin hangi tarih aralığını tuttuğumuz _indeks.json dosyasında
+# saklanır; böylece son barı öğrenmek için her dosyayı açmamız gerekmez.
+VARSAYILAN_DIZIN = os.environ.get("HISSE_VERI_DIZINI", "veri")
+ALANLAR = ["Open", "High", "Low", "Close", "Volume"]
+INDEKS_DOSYASI = "_indeks.json"
+
+
+def _atomik_yaz(yol, yazici):
+    # Yarım kalan yazma başka bir işçinin bozuk dosya okumasına yol açmasın
+    gecici = yol + ".tmp"
+    yazici(gecici)
+    os.replace(gecici, yol)
+
+
+class BarDeposu:
+    def __init__(self, dizin=VARSAYILAN_DIZIN):
+        self.dizin = dizin
+        self._indeksler = {}
+
+    def _klasor(self, interval):
+        klasor = os.path.join(self.dizin, interval)
+        os.makedirs(klasor, exist_ok=True)
+        return klasor
+
+    def _yol(self, ticker, interval):
+        return os.path.join(self._klasor(interval), ticker + ".parquet")
+
+    # --- İndeks (ilk/son bar bilgisi) ---
+    def indeks(self, interval):
+        if interval not in self._indeksler:
+            yol = os.path.join(self._klasor(interval), INDEKS_DOSYASI)
+            if os.path.exists(yol):
+                with open(yol, encoding="utf-8") as f:
+                    self._indeksler[interval] = json.load(f)
+            else:
+                self._indeksler[interval] = {}
+        return self._indeksler[interval]
+
+    def indeksi_kaydet(self, interval):
+        yol = os.path.join(self._klasor(interval), INDEKS_DOSYASI)
+
+        def yaz(gecici):
+            with open(gecici, "w", encoding="utf-8") as f:
+                json.dump(self.indeks(interval), f)
+
+        _atomik_yaz(yol, yaz)
+
+    def aralik(self, ticker, interval):
+        # (ilk bar, son bar) ya da depoda yoksa None
+        kayit = self.indeks(interval).get(ticker)
+        if not kayit or "son" not in kayit:
+            return None
+        return pd.Timestamp(kayit["ilk"]), pd.Timestamp(kayit["son"])
+
+    def kapsam(self, ticker, interval):
+        # Bu hisse için şimdiye kadar istenen en erken başlangıç tarihi. İlk bar
+        # bundan sonra olabilir (tatiller, yeni halka arz); yine de geçmiş tam sayılır.
+        kayit = self.indeks(interval).get(ticker)
+        if not kayit or "kapsam" not in kayit:
+            return None
+        return pd.Timestamp(kayit["kapsam"])
+
+    def kapsami_genislet(self, ticker, interval, baslangic):
+        kayit = self.indeks(interval).setdefault(ticker, {})
+        onceki = kayit.get("kapsam")
+        if onceki is None or pd.Timestamp(baslangic) < pd.Timestamp(onceki):
+            kayit["kapsam"] = pd.Timestamp(baslangic).isoformat()
+
+    def guncelleme(self, ticker, interval):
+        # Sağlayıcıya bu hisse için en son ne zaman sorulduğu
+        kayit = self.indeks(interval).get(ticker)
+        if not kayit or "guncelleme" not in kayit:
+            return None
+        return pd.Timestamp(kayit["guncelleme"])
+
+    def guncellendi(self, ticker, interval):
+        kayit = self.indeks(interval).setdefault(ticker, {})
+        kayit["guncelleme"] = datetime.datetime.now().isoformat(timespec="seconds")
+
+    def bos_isaretli(self, ticker, interval, sure=datetime.timedelta(days=1)):
+        # Veri sağlayıcısının hiç bar döndürmediği semboller (endeks kodları,
+        # kote olmayan hisseler) her taramada baştan indirilmesin
+        kayit = self.indeks(interval).get(ticker)
+        if not kayit or "bos" not in kayit:
+            return False
+        return datetime.datetime.now() - datetime.datetime.fromisoformat(kayit["bos"]) < sure
+
+    def bos_isaretle(self, ticker, interval):
+        kayit = self.indeks(interval).setdefault(ticker, {})
+        kayit["bos"] = datetime.datetime.now().isoformat(timespec="seconds")
+
+    # --- Okuma / yazma ---
+    def oku(self, ticker, interval, alanlar=None):
+        # alanlar verilirse parquet'ten yalnızca o sütunlar okunur
+        yol = self._yol(ticker, interval)
+        if not os.path.exists(yol):
+            return pd.DataFrame(columns=alanlar or ALANLAR, index=pd.DatetimeIndex([]), dtype="float64")
+        return pd.read_parquet(yol, columns=alanlar)
+
+    def birlestir(self, ticker, interval, yeni):
+        # Yeni barları mevcut geçmişe ekle; aynı tarihli bar varsa yenisi
+        # geçerli olur (gün içinde güncellenen son bar için). Depodaki veri
+        # gerçekten değiştiyse hissenin sürüm sayacı artar ve True döner.
+        yeni = yeni[[c for c in ALANLAR if c in yeni.columns]].dropna(how="all")
+        if yeni.empty:
+            return False
+        eski = self.oku(ticker, interval)
+        if not eski.empty:
+            if yeni.index.isin(eski.index).all() and \
+                    eski.loc[yeni.index, yeni.columns].astype("float64").equals(yeni.astype("float64")):
+                return False  # Yeni bar yok, son bar da değişmemiş
+            yeni = pd.concat([eski, yeni])
+            yeni = yeni[~yeni.index.duplicated(keep="last")]
+        yeni = yeni.sort_index()
+        _atomik_yaz(self._yol(ticker, interval), lambda gecici: yeni.to_parquet(gecici))
+
+        kayit = self.indeks(interval).setdefault(ticker, {})
+        kayit.pop("bos", None)
+        kayit["ilk"] = yeni.index[0].isoformat()
+        kayit["son"] = yeni.index[-1].isoformat()
+        kayit["surum"] = kayit.get("surum", 0) + 1
+        return True
+
+    def surum(self, ticker, interval):
+        kayit = self.indeks(interval).get(ticker)
+        return kayit.get("surum", 0) if kayit else 0
@@ -0,0 +1,75 @@
+import sys
+
+# --- Evren kaydı ---
+# Elle yazılmış listeler tekrarlı semboller (ARCLK, FROTO, PGSUS ...), endeks
+# kodları (XU100, X030S ...) ve borsa yatırım fonları içeriyor; hepsi hisse
+# gibi indirilip puanlanıyordu. Kayıt her sembolü bir kez (sys.intern ile)
+# tutar, türünü (hisse / endeks / fon) belirler ve listeleri sırası korunmuş,
+# tekrarsız demetler olarak saklar. Tür sembol adından tahmin edilmez: endeks
+# ve fon kodları açıkça kaydedilir (listeler.ENDEKSLER, listeler.FONLAR),
+# kaydedilmemiş her sembol hissedir. Taramalar yalnızca seçilen listelerin
+# hisse birleşimini ister.
+HISSE = "hisse"
+ENDEKS = "endeks"
+FON = "fon"
+
+
+class EvrenKaydi:
+    def __init__(self):
+        self._turler = {}    # sembol -> tür
+        self._listeler = {}  # liste adı -> sembol demeti
+
+    def turle(self, semboller, tur):
+        # Sembollerin türünü listelerden önce açıkça kaydeder
+        for sembol in semboller:
+            self._turler[sys.intern(sembol.strip().upper())] = tur
+        return self
+
+    def ekle(self, ad, semboller, tur=None):
+        liste = []
+        for sembol in semboller:
+            sembol = sys.intern(sembol.strip().upper())
+            self._turler.setdefault(sembol, tur or HISSE)
+            liste.append(sembol)
+        self._listeler[ad] = tuple(dict.fromkeys(liste))
+        return self
+
+    def adlar(self):
+        return list(self._listeler)
+
+    def tur(self, sembol):
+        return self._turler.get(sembol)
+
+    def liste(self, ad, tur=HISSE):
+        # tur=None: tüm semboller
+        return [s for s in self._listeler[ad] if tur is None or self._turler[s] == tur]
+
+    def birlesim(self, adlar=None, tur=HISSE):
+        # Seçilen listelerin tekrarsız birleşimi; tek indirme isteği için
+        adlar = self.adlar() if adlar is None else adlar
+        return list(dict.fromkeys(s for ad in adlar for s in self.liste(ad, tur)))
+
+    def sozluk(self, adlar=None, tur=HISSE, ayrik=False):
+        # Taramaların beklediği {liste adı: [sembol, ...]} sözlüğü. ayrik=True
+        # ise her sembol yalnızca ilk geçtiği listede kalır (BIST50 satırlarında
+        # BIST30 hisseleri tekrar görünmez)
+        adlar = self.adlar() if adlar is None else adlar
+        goruldu = set()
+        sonuc = {}
+        for ad in adlar:
+            liste = self.liste(ad, tur)
+            if ayrik:
+                liste = [s for s in liste if s not in goruldu]
+                goruldu.update(liste)
+            sonuc[ad] = liste
+        return sonuc
+
+    def ozet(self):
+        # Liste başına tür sayıları: {ad: {"hisse": n, "endeks": m, ...}}
+        sonuc = {}
+        for ad, semboller in self._listeler.items():
+            sayilar = {}
+            for s in semboller:
+                sayilar[self._turler[s]] = sayilar.get(self._turler[s], 0) + 1
+            sonuc[ad] = sayilar
+        return sonuc
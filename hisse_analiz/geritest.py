@@ -0,0 +1,170 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.motor import alta_yasla, kayan_ortalama, rsi_2d, ema_2d
+
+# --- Geriye dönük test ---
+# tahmini_olasilik ve tavan_skoru sinyalleri her (tarih x hisse) için tek
+# seferde hesaplanır ve ertesi işlem gününün gerçekleşen getirisiyle
+# karşılaştırılır. Her tarihteki sinyal, motor.toplu_gostergeler'in o tarihe
+# kadarki geçmişle vereceği sonuçla aynıdır (aynı NaN temizliği kuralları);
+# tek fark, taramalardaki 3/6 aylık pencere yerine tüm geçmişin kullanılmasıdır.
+# 3 aylık pencerede 60 günlük koşul hiç sağlanmadığından tahmin hep 50 olurdu.
+#
+# Yeterli geçmişi olmayan barlarda sinyal NaN'dır (taramalarda 50 / 0 yazılır).
+TAVAN_ESIGI = 0.095     # BIST ±%10 sınırı; fiyat adımı yuvarlaması için biraz altı
+TAHMIN_ESIGI = 70       # "🚀 Yüksek Yükseliş"
+TAVAN_SKOR_ESIGI = 70   # "🚀 Tavan ihtimali yüksek"
+KALIBRASYON_KOVALARI = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, np.inf]
+
+
+def _sayac(n, T):
+    # Alta yaslanmış dizide her satırın hissenin kaçıncı geçerli barı olduğu
+    k = np.arange(T)[:, None] - (T - n)[None, :] + 1.0
+    return np.where(k >= 1, k, np.nan)
+
+
+def _kuyruk_ortalamasi(x, pencere):
+    # tail(pencere).mean() her satır için: pencerede NaN olmayanların ortalaması
+    dolu = ~np.isnan(x)
+    toplam = np.vstack([np.zeros((1, x.shape[1])), np.cumsum(np.where(dolu, x, 0.0), axis=0)])
+    adet = np.vstack([np.zeros((1, x.shape[1])), np.cumsum(dolu, axis=0)])
+    bas = np.maximum(np.arange(1, x.shape[0] + 1) - pencere, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (toplam[1:] - toplam[bas]) / (adet[1:] - adet[bas])
+
+
+def _tarihe_dagit(deger, satir, T, N):
+    # Yaslanmış dizideki değerleri özgün tarih satırlarına geri yazar
+    cikis = np.full((T, N), np.nan)
+    gecerli = ~np.isnan(satir) & ~np.isnan(deger)
+    cikis[satir[gecerli].astype(int), np.nonzero(gecerli)[1]] = deger[gecerli]
+    return cikis
+
+
+def sinyal_dizileri(C, V):
+    # (tarih x hisse) Close / Volume dizilerinden aynı boyutta Tahmini_Yuzde,
+    # Tavan_Skoru ve ertesi bar getirisi dizileri
+    T, N = C.shape
+    satir = np.broadcast_to(np.arange(T, dtype="float64")[:, None], (T, N))
+
+    # 1. seviye: Close ve Volume dolu barlar
+    (C1, V1, I1), n1 = alta_yasla(~np.isnan(C) & ~np.isnan(V), C, V, satir)
+    K1 = _sayac(n1, T)
+    R1 = rsi_2d(C1)
+
+    # Ertesi işlem gününün getirisi (hissenin bir sonraki geçerli barı)
+    getiri1 = np.full((T, N), np.nan)
+    getiri1[:-1] = C1[1:] / C1[:-1] - 1
+
+    # 2. seviye: RSI14 dolu barlar
+    (C2, V2, R2, I2, K1_2), n2 = alta_yasla(~np.isnan(R1), C1, V1, R1, I1, K1)
+    K2 = _sayac(n2, T)
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        ema10 = ema_2d(C2, 10)
+        yukselen = np.zeros((T, N))
+        yukselen[1:] = C2[1:] > C2[:-1]
+        yukselis60 = kayan_ortalama(yukselen, 59) * 59 / 60 * 100
+        hacim5 = _kuyruk_ortalamasi(V2, 5)
+        tahmini = (yukselis60 + np.where(C2 > ema10, 10, 0) + np.where(R2 < 30, 5, 0)
+                   + np.where(V2 > hacim5, 5, 0))
+        tahmini = np.where(K2 >= 60, tahmini, np.nan)
+
+        onceki = np.full((T, N), np.nan)
+        onceki[1:] = C2[:-1]
+        degisim = (C2 - onceki) / onceki * 100
+        hacim10 = _kuyruk_ortalamasi(V2, 10)
+        skor = (np.where(degisim > 7, 30, 0) + np.where(V2 > hacim10 * 1.5, 25, 0)
+                + np.where(R2 > 50, 15, 0) + np.where(C2 > kayan_ortalama(C2, 20), 15, 0)
+                + np.where(C2 > kayan_ortalama(C2, 50), 15, 0))
+        skor = np.where((K1_2 >= 50) & (K2 >= 2), skor, np.nan)
+
+    return (_tarihe_dagit(tahmini, I2, T, N), _tarihe_dagit(skor, I2, T, N),
+            _tarihe_dagit(getiri1, I1, T, N))
+
+
+def sinyal_panelleri(close, volume):
+    volume = volume.reindex(index=close.index, columns=close.columns)
+    tahmini, skor, getiri = sinyal_dizileri(close.to_numpy(dtype="float64"), volume.to_numpy(dtype="float64"))
+    return {ad: pd.DataFrame(d, index=close.index, columns=close.columns)
+            for ad, d in (("Tahmini_Yuzde", tahmini), ("Tavan_Skoru", skor), ("Ertesi_Getiri", getiri))}
+
+
+def _devir(secili):
+    # Günlük devir: o gün listeye yeni giren hisselerin listeye oranı
+    secili = secili.astype(bool)
+    adet = secili.sum(axis=1)
+    giren = (secili[1:] & ~secili[:-1]).sum(axis=1)
+    dolu = adet[1:] > 0
+    return {
+        "gunluk_ort_hisse": float(adet.mean()) if len(adet) else np.nan,
+        "ort_devir": float((giren[dolu] / adet[1:][dolu]).mean()) if dolu.any() else np.nan,
+    }
+
+
+def geriye_test(close, volume, tavan_esigi=TAVAN_ESIGI):
+    # Sonuç tabloları: ozet, kalibrasyon, tavan_skorlari, devir
+    tahmini, skor, getiri = sinyal_dizileri(close.to_numpy(dtype="float64"),
+                                            volume.reindex(index=close.index, columns=close.columns).to_numpy(dtype="float64"))
+    tavan = getiri >= tavan_esigi
+    taban = getiri <= -tavan_esigi
+
+    # tahmini_olasilik: yükseliş olasılığı (%) -> ertesi gün yükseldi mi
+    m = ~np.isnan(tahmini) & ~np.isnan(getiri)
+    p, yukseldi = tahmini[m], getiri[m] > 0
+    olasilik = np.clip(p / 100, 0, 1)
+    kova = np.digitize(p, KALIBRASYON_KOVALARI[1:-1])
+    adet = np.bincount(kova, minlength=len(KALIBRASYON_KOVALARI) - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        kalibrasyon = pd.DataFrame({
+            "kova": [f"{a:g}-{b:g}" for a, b in zip(KALIBRASYON_KOVALARI[:-1], KALIBRASYON_KOVALARI[1:])],
+            "adet": adet,
+            "ort_tahmin_%": np.bincount(kova, p, len(adet)) / adet,
+            "gerceklesen_%": np.bincount(kova, yukseldi, len(adet)) / adet * 100,
+            "ort_getiri_%": np.bincount(kova, getiri[m], len(adet)) / adet * 100,
+        })
+    kalibrasyon = kalibrasyon[kalibrasyon["adet"] > 0].reset_index(drop=True)
+
+    # tavan_skoru: skor düzeyine göre ertesi gün tavan/taban oranı
+    m2 = ~np.isnan(skor) & ~np.isnan(getiri)
+    duzey = (skor[m2] // 5).astype(int)
+    adet2 = np.bincount(duzey, minlength=21)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tavan_skorlari = pd.DataFrame({
+            "skor": np.arange(len(adet2)) * 5,
+            "adet": adet2,
+            "tavan_%": np.bincount(duzey, tavan[m2], len(adet2)) / adet2 * 100,
+            "taban_%": np.bincount(duzey, taban[m2], len(adet2)) / adet2 * 100,
+            "ort_getiri_%": np.bincount(duzey, getiri[m2], len(adet2)) / adet2 * 100,
+        })
+    tavan_skorlari = tavan_skorlari[tavan_skorlari["adet"] > 0].reset_index(drop=True)
+
+    yuksek_skor = skor[m2] >= TAVAN_SKOR_ESIGI
+    tavanlar = tavan[m2]
+    ozet = {
+        "tarih": len(close.index),
+        "hisse": close.shape[1],
+        "tahmin_gozlem": int(m.sum()),
+        "yukselis_tabani_%": yukseldi.mean() * 100 if m.any() else np.nan,
+        "yon_isabeti_%": ((p > 50) == yukseldi).mean() * 100 if m.any() else np.nan,
+        "brier": ((olasilik - yukseldi) ** 2).mean() if m.any() else np.nan,
+        f"tahmin>{TAHMIN_ESIGI}_isabet_%": yukseldi[p > TAHMIN_ESIGI].mean() * 100 if (p > TAHMIN_ESIGI).any() else np.nan,
+        "skor_gozlem": int(m2.sum()),
+        "tavan_tabani_%": tavanlar.mean() * 100 if m2.any() else np.nan,
+        f"skor>={TAVAN_SKOR_ESIGI}_tavan_%": tavanlar[yuksek_skor].mean() * 100 if yuksek_skor.any() else np.nan,
+        f"skor>={TAVAN_SKOR_ESIGI}_yakalanan_tavan_%": yuksek_skor[tavanlar].mean() * 100 if tavanlar.any() else np.nan,
+    }
+
+    devir = pd.DataFrame([
+        {"sinyal": f"Tahmini_Yuzde>{TAHMIN_ESIGI}", **_devir(np.nan_to_num(tahmini) > TAHMIN_ESIGI)},
+        {"sinyal": f"Tavan_Skoru>={TAVAN_SKOR_ESIGI}", **_devir(np.nan_to_num(skor) >= TAVAN_SKOR_ESIGI)},
+    ])
+    return {
+        "ozet": pd.DataFrame({"olcu": list(ozet), "deger": list(ozet.values())}),
+        "kalibrasyon": kalibrasyon,
+        "tavan_skorlari": tavan_skorlari,
+        "devir": devir,
+    }
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.kotasyon import toplu_kotasyon
+from hisse_analiz.metrikler import olculen, atla
+
+# Tekli hisse göstergeleri, hedef fiyatlar ve yorum metni. Streamlit'e
+# bağlı değildir; uygulama, komut satırı ve toplu işler aynı fonksiyonları
+# kullanır. yfinance yalnızca hedef_analizi çağrıldığında içe aktarılır.
+
+# --- Ticker oluştur ---
+def get_ticker(symbol):
+    return symbol.upper() + ".IS" if not symbol.endswith(".IS") else symbol.upper()
+
+# --- RSI hesaplama ---
+def compute_RSI(data, period=14):
+    # NaN değerlerini temizleme
+    data = data.dropna(subset=['Close'])
+    if len(data) < period:
+        return pd.Series([float('nan')] * len(data), index=data.index)
+        
+    delta = data['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
+    RS = gain / loss
+    RSI = 100 - (100 / (1 + RS))
+    return RSI
+
+# --- Hedef analizi ---
+def hedef_hesapla(fiyat, zirve, dip, yuzdeler, direnc_kisa=None, direnc_orta=None):
+    # Tek hisse (sayı) ya da toplu tarama (Series/dizi) için aynı hesap
+    hedef1 = fiyat * (1 + yuzdeler[0]/100)
+    hedef2 = fiyat * (1 + yuzdeler[1]/100)
+    hedef3 = fiyat * (1 + yuzdeler[2]/100)
+    destek = zirve * 0.95
+
+    if direnc_kisa is None:
+        direnc_kisa = zirve * 1.02  # fallback
+    if direnc_orta is None:
+        direnc_orta = zirve * 1.05  # fallback
+
+    trend = np.where(fiyat > destek, "📈 Yükseliş trendi", "⚠️ Zayıflama riski")
+    if np.ndim(trend) == 0:
+        trend = str(trend)
+
+    return {
+        "fiyat": fiyat,
+        "zirve": zirve,
+        "dip": dip,
+        "hedef1": hedef1,
+        "hedef2": hedef2,
+        "hedef3": hedef3,
+        "destek": destek,
+        "direnc_kisa": direnc_kisa,
+        "direnc_orta": direnc_orta,
+        "direnc_uzun": zirve,
+        "trend": trend
+    }
+
+@olculen("hedef_analizi", tarama="tekli")
+def hedef_analizi(ticker, yuzdeler, data=None):
+    try:
+        import yfinance as yf
+        stock = yf.Ticker(ticker)
+        # Hissede işlem yoksa lastPrice NaN dönebilir.
+        fiyat = stock.fast_info.get('lastPrice')
+        zirve = stock.fast_info.get('yearHigh')
+        dip = stock.fast_info.get('yearLow')
+
+        if fiyat is None or zirve is None or dip is None:
+            atla(ticker, "kotasyon_yok", "hedef_analizi")
+            return None # Veri eksikse analizi yapma
+
+        # Eğer data gönderildiyse daha doğru direnç hesapla
+        direnç_kisa = direnç_orta = None
+        if data is not None and not data.empty:
+            direnç_kisa = data['Close'].rolling(20).max().iloc[-1]
+            direnç_orta = data['Close'].rolling(50).max().iloc[-1]
+
+        return hedef_hesapla(fiyat, zirve, dip, yuzdeler, direnç_kisa, direnç_orta)
+    except Exception as e:
+        atla(ticker, f"hata: {type(e).__name__}", "hedef_analizi")
+        return None
+
+def toplu_hedef_analizi(tickers, yuzdeler):
+    # hedef_analizi'nin toplu hali: fiyat/zirve/dip tüm hisseler için tek
+    # panelden gelir, hedefler vektörel hesaplanır. Index ticker olan tablo döner.
+    kotasyon = toplu_kotasyon(tickers)
+    return pd.DataFrame(hedef_hesapla(kotasyon["fiyat"], kotasyon["zirve"], kotasyon["dip"], yuzdeler),
+                        index=kotasyon.index)
+
+def tahmini_olasilik(data):
+    # Gelen veriyi temizle
+    if 'Close' not in data.columns:
+        return 50, 50, 0, 0, 0
+    data = data.dropna(subset=['Close', 'RSI14'])
+    if data.empty or len(data) < 60:
+        return 50, 50, 0, 0, 0
+
+    # Son 60 gün yükseliş yüzdesi
+    son_60 = data.tail(60)
+    yuzde_yukselis = (son_60['Close'].diff() > 0).sum() / len(son_60) * 100
+
+    # EMA sinyali
+    ema10_series = data['Close'].ewm(span=10, adjust=False).mean().dropna()
+    close_last = data['Close'].iloc[-1]
+    EMA_bonus = 10 if not ema10_series.empty and close_last > ema10_series.iloc[-1] else 0
+
+    # RSI sinyali
+    rsi_series = data['RSI14'].dropna()
+    rsi = rsi_series.iloc[-1] if not rsi_series.empty else 50
+    RSI_bonus = 5 if rsi < 30 else 0
+
+    # Hacim sinyali
+    Hacim_bonus = 0
+    if 'Volume' in data.columns and not data['Volume'].dropna().empty:
+        vol_avg = data['Volume'].tail(5).mean()
+        if not pd.isna(vol_avg):
+            Hacim_bonus = 5 if data['Volume'].iloc[-1] > vol_avg else 0
+
+    P_tahmin = yuzde_yukselis + EMA_bonus + RSI_bonus + Hacim_bonus
+    return P_tahmin, yuzde_yukselis, EMA_bonus, RSI_bonus, Hacim_bonus
+
+# --- Tavan Skoru Hesaplama ---
+def tavan_skoru(data):
+    # RSI hesaplamadan önce 'Close' sütununda NaN olan satırları at
+    data = data.dropna(subset=['Close', 'Volume']) 
+    
+    # Yeterli veri yoksa (en az 2 gün) NaN dön
+    if len(data) < 50: # Ortalama ve RSI için yeterli veri
+        return 0, float('nan'), float('nan'), float('nan'), float('nan')
+        
+    data["RSI14"] = compute_RSI(data)
+    
+    # RSI hesaplandıktan sonra NaN içeren ilk satırları at
+    data = data.dropna(subset=['RSI14'])
+    
+    # Tekrar kontrol
+    if data.empty or len(data) < 2:
+         return 0, float('nan'), float('nan'), float('nan'), float('nan')
+
+    # En son geçerli değerleri al
+    close = data["Close"].iloc[-1]
+    prev_close = data["Close"].iloc[-2] # Dünkü kapanış
+    hacim = data["Volume"].iloc[-1]
+    
+    # Ort Hacim: Son 10 günün ortalamasını alırken
+    ort_hacim = data["Volume"].tail(10).mean()
+
+    # Hesaplamalar
+    fiyat_degisim = (close - prev_close) / prev_close * 100
+    rsi = data["RSI14"].iloc[-1]
+
+    # ... (Skor hesaplaması aynı kalır)
+    skor = 0
+    if fiyat_degisim > 7:
+        skor += 30
+    if hacim > ort_hacim * 1.5:
+        skor += 25
+    if rsi > 50:
+        skor += 15
+    if close > data["Close"].rolling(20).mean().iloc[-1]:
+        skor += 15
+    if close > data["Close"].rolling(50).mean().iloc[-1]:
+        skor += 15
+
+    return skor, fiyat_degisim, rsi, hacim, ort_hacim
+
+# --- Tekli analiz yorum ---
+def yorum_metni(hedefler, data):
+    # otomatik_yorum'un Streamlit'siz hali: markdown metni ya da veri yetersizse None
+    # RSI ve MA'lar için NaN kontrolü
+    data = data.dropna(subset=["RSI14", "MA20", "MA50"])
+    if data.empty:
+        return None
+        
+    son_rsi = data["RSI14"].iloc[-1]
+    ma20 = data["MA20"].iloc[-1]
+    ma50 = data["MA50"].iloc[-1]
+
+    P_tahmin, P_tarihce, EMA_bonus, RSI_bonus, Hacim_bonus = tahmini_olasilik(data)
+    
+    # Tahmini yön açıklaması
+    if P_tahmin > 70:
+        tahmin = f"🔮 Yükseliş olasılığı yüksek ({P_tahmin:.1f}%)"
+    elif P_tahmin > 55:
+        tahmin = f"🔮 Hafif Yükseliş beklenebilir ({P_tahmin:.1f}%)"
+    elif P_tahmin < 30:
+        tahmin = f"🔮 Düşüş olasılığı yüksek ({P_tahmin:.1f}%)"
+    else:
+        tahmin = f"🔮 Nötr/Belirsiz ({P_tahmin:.1f}%)"
+
+    # 📌 Yorum çıktısı
+    yorum = f"""
+### 📌 Güncel Fiyat: {hedefler['fiyat']:.2f} ₺
+**Genel Trend:** {hedefler['trend']}
+**Tahmini Yön (Ertesi Gün):** {tahmin}
+- RSI: {son_rsi:.1f}
+- MA20: {ma20:.2f} | MA50: {ma50:.2f}
+
+### 🎯 Hedef Fiyatlar:
+- Hedef1: {hedefler['hedef1']:.2f} ₺
+- Hedef2: {hedefler['hedef2']:.2f} ₺
+- Hedef3: {hedefler['hedef3']:.2f} ₺
+
+### 🛡️ Destek / Direnç Seviyeleri:
+- **Destek:** {hedefler['destek']:.2f} ₺
+- **Kısa Vadeli Direnç (20G):** {hedefler['direnc_kisa']:.2f} ₺
+- **Orta Vadeli Direnç (50G):** {hedefler['direnc_orta']:.2f} ₺
+- **Uzun Vadeli Direnç (Yıllık Zirve):** {hedefler['direnc_uzun']:.2f} ₺
+"""
+    return yorum
@@ -0,0 +1,281 @@
+import datetime
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.akis import GostergeDurumu, panelden_durumlar
+from hisse_analiz.metrikler import asama, say
+from hisse_analiz.onbellek import ISTANBUL, piyasa_acik_mi
+from hisse_analiz.veri import varsayilan_depo, depoyu_guncelle, toplu_veri, TARAMA_ALANLARI
+
+# --- Canlı izleme listesi ---
+# Favori hisselerin son fiyatları bir kaynaktan (sağlayıcı yoklaması, akış
+# bağdaştırıcısı ya da simülasyon) düzenli aralıklarla alınır. Yalnızca
+# fiyatı ya da hacmi değişen hisselerin göstergeleri akis.GostergeDurumu ile
+# artımlı güncellenir; bugünün barı gün bitene kadar geçici (kesin=False)
+# işlenir. Eşik geçişleri alarm üretir. Sonuç sürüm numaralı bir
+# IzlemeGoruntusu olarak yayınlanır: sayfalar onu tam yeniden çalışma olmadan
+# (st.fragment) okur, abone fonksiyonlar her yayında çağrılır.
+#
+# Kaynak, kaynak(tickers) -> {ticker: (zaman, fiyat, gunluk_hacim)} döndüren
+# herhangi bir fonksiyondur; yalnızca yeni değeri olan hisseler döner.
+RSI_ESIGI = 30
+TAVAN_SKOR_ESIGI = 70
+ALARM_SAYISI = 200   # bellekte tutulan son alarmlar
+
+
+def _simdi():
+    return datetime.datetime.now(ISTANBUL).replace(tzinfo=None)
+
+
+# --- Kaynaklar ---
+def depo_kaynagi(depo=None, saglayici=None, yalniz_seans=True):
+    # Sağlayıcı yoklaması: bugünün 5 dakikalık barları depoya indirilir (tek
+    # toplu istek), son kapanış ve günün toplam hacmi döner. Seans dışında
+    # ağa gidilmez.
+    def kaynak(tickers):
+        if not tickers or (yalniz_seans and not piyasa_acik_mi()):
+            return {}
+        bugun = pd.Timestamp(datetime.date.today())
+        depoyu_guncelle(tickers, "5m", bugun, None, depo, saglayici)
+        d = depo or varsayilan_depo()
+        sonuc = {}
+        for t in tickers:
+            barlar = d.oku(t, "5m", TARAMA_ALANLARI)
+            barlar = barlar[barlar.index >= bugun].dropna(subset=["Close"])
+            if not barlar.empty:
+                sonuc[t] = (barlar.index[-1].to_pydatetime(), float(barlar["Close"].iloc[-1]),
+                            float(barlar["Volume"].sum()))
+        return sonuc
+    return kaynak
+
+
+class AkisKaynagi:
+    # Akış (websocket vb.) bağdaştırıcıları için: dış iş parçacığı gonder()
+    # ile tik bırakır, servis her turda hisse başına son tiki alır
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._son = {}
+
+    def gonder(self, ticker, fiyat, gunluk_hacim, zaman=None):
+        with self._kilit:
+            self._son[ticker] = (zaman or _simdi(), float(fiyat), float(gunluk_hacim))
+
+    def __call__(self, tickers):
+        with self._kilit:
+            return {t: self._son.pop(t) for t in tickers if t in self._son}
+
+
+def son_kapanis(ticker, depo=None):
+    data = (depo or varsayilan_depo()).oku(ticker, "1d")["Close"].dropna()
+    return float(data.iloc[-1]) if not data.empty else 100.0
+
+
+class SimuleKaynak:
+    # Yerel simüle tik akışı (deneme ve ölçüm için). Her çağrıda hisselerin bir
+    # kısmı rastgele yürüyüşle hareket eder; fiyat günün referansına göre ±%10
+    # taban/tavan sınırında kalır. saat verilirse gün geçişleri de denenebilir.
+    def __init__(self, referans=son_kapanis, oynaklik=0.004, hareket_orani=0.5, tohum=0, saat=_simdi):
+        self.referans = referans
+        self.oynaklik = oynaklik
+        self.hareket_orani = hareket_orani
+        self.saat = saat
+        self._rng = np.random.default_rng(tohum)
+        self._durum = {}  # ticker -> [gün, referans, fiyat, hacim]
+
+    def __call__(self, tickers):
+        an = self.saat()
+        sonuc = {}
+        for t in tickers:
+            d = self._durum.get(t)
+            if d is None:
+                r = self.referans(t)
+                d = self._durum[t] = [an.date(), r, r, 0.0]
+            elif d[0] != an.date():
+                d[:] = [an.date(), d[2], d[2], 0.0]  # yeni gün: referans dünkü kapanış
+            if self._rng.random() >= self.hareket_orani:
+                continue
+            d[2] = round(float(np.clip(d[2] * (1 + self._rng.normal(0, self.oynaklik)), d[1] * 0.9, d[1] * 1.1)), 2)
+            d[3] += float(self._rng.integers(100, 10000))
+            sonuc[t] = (an, d[2], d[3])
+        return sonuc
+
+
+# --- Alarmlar ---
+def alarmlar(onceki, yeni):
+    # İki gösterge sözlüğü arasındaki eşik geçişleri: [(tür, mesaj), ...]
+    # NaN karşılaştırmaları False döndüğünden ısınmamış göstergeler alarm üretmez
+    sonuc = []
+    r0, r1 = onceki["RSI14"], yeni["RSI14"]
+    if r0 >= RSI_ESIGI > r1:
+        sonuc.append(("rsi", f"RSI {RSI_ESIGI} altına indi ({r1:.1f})"))
+    elif r0 < RSI_ESIGI <= r1:
+        sonuc.append(("rsi", f"RSI {RSI_ESIGI} üstüne çıktı ({r1:.1f})"))
+    f0, f1 = onceki["MA20"] - onceki["MA50"], yeni["MA20"] - yeni["MA50"]
+    if f0 <= 0 < f1:
+        sonuc.append(("kesisim", "MA20, MA50'yi yukarı kesti (altın kesişim)"))
+    elif f0 >= 0 > f1:
+        sonuc.append(("kesisim", "MA20, MA50'yi aşağı kesti (ölüm kesişimi)"))
+    if onceki["Tavan_Skoru"] < TAVAN_SKOR_ESIGI <= yeni["Tavan_Skoru"]:
+        sonuc.append(("tavan", f"Tavan skoru {yeni['Tavan_Skoru']} (≥{TAVAN_SKOR_ESIGI})"))
+    return sonuc
+
+
+def gunluk_gecmis(tickers):
+    # Isınma için bugünden önceki günlük barlar; bugünün barı kaynaktan gelir
+    panel = toplu_veri(tickers, period="6mo", alanlar=TARAMA_ALANLARI)
+    panel = panel[panel.index < pd.Timestamp(datetime.date.today())]
+    durumlar = panelden_durumlar(panel["Close"], panel["Volume"]) if not panel.empty else {}
+    return {t: durumlar.get(t) or GostergeDurumu() for t in tickers}
+
+
+class IzlemeGoruntusu:
+    def __init__(self, zaman, surum, tablo, alarmlar):
+        self.zaman = zaman          # datetime, yayın anı
+        self.surum = surum          # her yayında bir artar
+        self.tablo = tablo          # hisse başına son göstergeler
+        self.alarmlar = alarmlar    # son alarmlar (eskiden yeniye), her biri sözlük
+
+
+class IzlemeServisi:
+    def __init__(self, kaynak, gecmis=gunluk_gecmis, aralik=15):
+        # kaynak: yukarıdaki kaynaklardan biri; gecmis: tickers -> {ticker: GostergeDurumu}
+        self.kaynak = kaynak
+        self.gecmis = gecmis
+        self.aralik = aralik
+        self._durumlar = {}   # ticker -> GostergeDurumu (kapanmış barlarla)
+        self._acik = {}       # ticker -> (gün, fiyat, hacim): henüz kapanmamış bar
+        self._degerler = {}   # ticker -> son gösterge sözlüğü
+        self._zamanlar = {}   # ticker -> son tik zamanı
+        self._bekleyen = set()
+        self._alarmlar = deque(maxlen=ALARM_SAYISI)
+        self._aboneler = []
+        self._surum = 0
+        self._anlik = None
+        self._kosul = threading.Condition()
+        self._kilit = threading.Lock()  # aynı anda tek tur
+        self._liste_kilidi = threading.Lock()  # _bekleyen / _durumlar: izle() sayfa iş parçacığında çalışır
+        self._tetik = threading.Event()
+        self._dur = threading.Event()
+        self._is_parcacigi = None
+        self.son_hata = None
+
+    def baslat(self):
+        if self._is_parcacigi is None:
+            self._is_parcacigi = threading.Thread(target=self._dongu, name="izleme-servisi", daemon=True)
+            self._is_parcacigi.start()
+        return self
+
+    def durdur(self):
+        self._dur.set()
+        self._tetik.set()
+
+    def izle(self, tickers):
+        # Yeni hisseler bir sonraki turda ısıtılıp listeye katılır
+        with self._liste_kilidi:
+            yeni = set(tickers) - set(self._durumlar) - self._bekleyen
+            self._bekleyen |= yeni
+        if yeni:
+            self._tetik.set()
+
+    def abone_ol(self, fonksiyon):
+        # fonksiyon(IzlemeGoruntusu) her yayında servis iş parçacığında çağrılır
+        self._aboneler.append(fonksiyon)
+
+    def _dongu(self):
+        while not self._dur.is_set():
+            try:
+                self.tur()
+                self.son_hata = None
+            except Exception as e:
+                self.son_hata = e
+            self._tetik.wait(self.aralik)
+            self._tetik.clear()
+
+    def _isitma(self):
+        # Bekleyenler yalnızca geçmiş başarıyla alınınca düşülür: hata olursa
+        # sonraki turda yeniden denenir, bu arada izle() ile eklenenler de kalır
+        with self._liste_kilidi:
+            bekleyen = set(self._bekleyen)
+        if not bekleyen:
+            return False
+        with asama("izleme_isitma") as bilgi:
+            bilgi["hisse"] = len(bekleyen)
+            durumlar = self.gecmis(sorted(bekleyen))
+        with self._liste_kilidi:
+            for t, durum in durumlar.items():
+                self._durumlar[t] = durum
+                self._degerler[t] = durum.degerler()
+            self._bekleyen -= bekleyen
+        return True
+
+    def _isle(self, t, zaman, fiyat, hacim):
+        # Değişmemiş tik atlanır; gün değiştiyse açık bar önce kesinleşir
+        durum = self._durumlar[t]
+        gun = zaman.date()
+        acik = self._acik.get(t)
+        if acik is not None:
+            if (gun, fiyat, hacim) == acik or gun < acik[0]:
+                return False
+            if gun > acik[0]:
+                durum.ekle(acik[1], acik[2], kesin=True)
+        self._acik[t] = (gun, fiyat, hacim)
+        self._zamanlar[t] = zaman
+        onceki = self._degerler[t]
+        self._degerler[t] = yeni = durum.ekle(fiyat, hacim, kesin=False)
+        for tur, mesaj in alarmlar(onceki, yeni):
+            say("izleme_alarm", tur=tur)
+            self._alarmlar.append({"surum": self._surum + 1, "zaman": zaman, "Hisse": t.replace(".IS", ""),
+                                   "tur": tur, "mesaj": mesaj})
+        return True
+
+    def tur(self):
+        # Tek yoklama turu; değişiklik varsa yeni görüntü yayınlanır
+        with self._kilit:
+            degisti = self._isitma()
+            with asama("izleme_turu") as bilgi:
+                tikler = self.kaynak(list(self._durumlar)) if self._durumlar else {}
+                guncellenen = [t for t, (zaman, fiyat, hacim) in tikler.items()
+                               if t in self._durumlar and self._isle(t, zaman, fiyat, hacim)]
+                bilgi["hisse"] = len(guncellenen)
+            say("izleme_tik", len(tikler))
+            say("izleme_guncellenen", len(guncellenen))
+            if degisti or guncellenen:
+                self._yayinla()
+            return self._anlik
+
+    def _tablo(self):
+        tickers = list(self._degerler)
+        d = pd.DataFrame([self._degerler[t] for t in tickers], index=tickers)
+        return pd.DataFrame({
+            "Hisse": [t.replace(".IS", "") for t in tickers],
+            "Fiyat": d["Fiyat"].round(2).to_numpy(),
+            "Günlük % Değişim": d["Degisim"].round(2).to_numpy(),
+            "RSI14": d["RSI14"].round(1).to_numpy(),
+            "MA20": d["MA20"].round(2).to_numpy(),
+            "MA50": d["MA50"].round(2).to_numpy(),
+            "Tahmini_Yuzde": d["Tahmini_Yuzde"].round(1).to_numpy(),
+            "Tavan Skoru": d["Tavan_Skoru"].to_numpy(),
+            "Son Tik": [self._zamanlar.get(t) for t in tickers],
+        })
+
+    def _yayinla(self):
+        with self._kosul:
+            self._surum += 1
+            self._anlik = IzlemeGoruntusu(_simdi(), self._surum, self._tablo(), list(self._alarmlar))
+            self._kosul.notify_all()
+        for fonksiyon in list(self._aboneler):
+            try:
+                fonksiyon(self._anlik)
+            except Exception:
+                say("izleme_abone_hata")
+
+    def anlik(self):
+        return self._anlik
+
+    def bekle(self, surum=0, zaman_asimi=None):
+        # surum'dan yeni bir görüntü yayınlanana kadar bekler (uzun yoklama)
+        with self._kosul:
+            self._kosul.wait_for(lambda: self._surum > surum, zaman_asimi)
+            return self._anlik
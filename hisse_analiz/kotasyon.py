@@ -0,0 +1,35 @@
+import time
+import pandas as pd
+
+from hisse_analiz.veri import toplu_veri
+
+# --- Toplu kotasyon (son fiyat, 52 haftalık zirve/dip) ---
+# hedef_analizi her hisse için yf.Ticker(...).fast_info üzerinden üç ayrı
+# sorgu yapıyordu. Aynı değerler 1 yıllık günlük panelden (yfinance'in
+# fast_info'da yaptığı gibi) tüm hisseler için tek seferde türetilir.
+KOTASYON_TTL = 300  # saniye
+
+_onbellek = {}  # ticker -> (zaman, fiyat, zirve, dip)
+
+
+def kotasyon_tablosu(panel):
+    # panel: (Price, Ticker) MultiIndex sütunlu günlük OHLCV paneli
+    return pd.DataFrame({
+        "fiyat": panel["Close"].ffill().iloc[-1],
+        "zirve": panel["High"].max(),
+        "dip": panel["Low"].min(),
+    }).dropna()
+
+
+def toplu_kotasyon(tickers, ttl=KOTASYON_TTL, depo=None, saglayici=None):
+    # Süresi geçmemiş kotasyonlar bellekten, kalanlar tek panel okumasıyla gelir
+    simdi = time.monotonic()
+    eksik = [t for t in tickers if t not in _onbellek or simdi - _onbellek[t][0] > ttl]
+    if eksik:
+        panel = toplu_veri(eksik, period="1y", depo=depo, saglayici=saglayici)
+        if not panel.empty:
+            for t, satir in kotasyon_tablosu(panel).iterrows():
+                _onbellek[t] = (simdi, satir["fiyat"], satir["zirve"], satir["dip"])
+
+    satirlar = {t: _onbellek[t][1:] for t in tickers if t in _onbellek}
+    return pd.DataFrame.from_dict(satirlar, orient="index", columns=["fiyat", "zirve", "dip"])
@@ -0,0 +1,125 @@
+from hisse_analiz.evren import EvrenKaydi, ENDEKS, FON
+
+# --- Hisse Listeleri ---
+BIST30 = ["AKBNK", "ARCLK", "ASELS", "BIMAS", "DOHOL", "EKGYO", "EREGL", "FROTO",
+    "GWIND", "GUBRF", "SAHOL", "HEKTS", "KCHOL", "KOZAL", "KOZAA", "MAVI",
+    "OYAKC", "PGSUS", "PETKM", "SISE", "SODA", "TAVHL", "THYAO", "TTKOM",
+    "TUPRS", "ISCTR", "TCELL", "TTRAK", "ULKER", "VAKBN"]
+# ... (Diğer BIST listeleri aynı kalır)
+BIST50 = ["AKBNK", "ARCLK", "ASELS", "BIMAS", "DOHOL", "EKGYO", "EREGL", "FROTO",
+    "GWIND", "GUBRF", "SAHOL", "HEKTS", "KCHOL", "KOZAL", "KOZAA", "MAVI",
+    "OYAKC", "PGSUS", "PETKM", "SISE", "SODA", "TAVHL", "THYAO", "TTKOM",
+    "TUPRS", "ISCTR", "TCELL", "TTRAK", "ULKER", "VAKBN", "AKSA", "AKSGY",
+    "ANHYT", "ARCLK", "AYDEM", "BJKAS", "DENGE", "ENJSA", "FROTO", "GSDHO",
+    "HALKB", "ISGYO", "KRDMD", "MAVI", "ORMA", "OZKGY", "PGSUS", "SNGYO",
+    "TATEN", "TAVHL"]
+BIST100 = ["AKBNK", "ARCLK", "ASELS", "BIMAS", "DOHOL", "EKGYO", "EREGL", "FROTO","GWIND", "GUBRF", "SAHOL", "HEKTS", "KCHOL", "KOZAL", "KOZAA", "MAVI",
+           "OYAKC", "PGSUS", "PETKM", "SISE", "SODA", "TAVHL", "THYAO", "TTKOM","TUPRS", "ISCTR", "TCELL", "TTRAK", "ULKER", "VAKBN", "AKSA", "AKSGY",
+           "ANHYT", "AYDEM", "BJKAS", "DENGE", "ENJSA", "GSDHO", "HALKB", "ISGYO","KRDMD", "ORMA", "OZKGY", "SNGYO", "TATEN", "AKGRT", "ADEL", "AFYON",
+           "AGHOL", "AKFGY", "AKMGY", "ALARK", "ALGYO", "ANACM", "ANHYT", "ASELS","BEYAZ", "BOSSA", "BRISA", "BUNY", "CCOLA", "CEMAS", "CIMSA", "CLEBI",
+           "CRFSA", "DEVA", "DOAS", "EGEEN", "ENKAI", "ESEN", "ETILR", "GARAN","GLYHO", "GOZDE", "GRNYO", "GSRAY", "HEKTS", "HLGYO", "HURGZ", "IPEKE",
+           "ISDMR", "ISCTR", "IZMDC", "JANTS", "KCHOL", "KORDS", "KRONT", "KUL","MAVI", "MGROS", "MPARK", "NTHOL", "NUHCM", "ORGL", "PRKME", "SASA",
+           "SELEC", "SISE", "SKBNK", "SNGYO", "SODASN", "SRV", "TAVHL", "TAVHL","TOASO", "TRGYO", "TRKCM", "TSKB", "TTKOM", "TUKAS", "TUPRS", "VAKBN",
+           "VESTL", "YATAS", "YKBNK", "ZOREN"]
+# ... (Hisse listeleri aynı kalır)
+MENKUL_HISSELER = ["A1CAP","A1YEN","ACSEL","ADEL","ADESE","ADGYO","AEFES","AFYON","AGESA","AGHOL",
+    "AGROT","AGYO","AHGAZ","AHSGY","AKBNK","AKCNS","AKENR","AKFGY","AKFIS","AKFYE",
+    "AKGRT","AKMGY","AKSA","AKSEN","AKSGY","AKSUE","AKYHO","ALARK","ALBRK","ALCAR",
+    "ALCTL","ALFAS","ALGYO","ALKA","ALKIM","ALKLC","ALTNY","ALVES","ANELE","ANGEN",
+    "ANHYT","ANSGR","APBDL","APLIB","APMDL","APX30","ARASE","ARCLK","ARDYZ","ARENA",
+    "ARMGD","ARSAN","ARTMS","ARZUM","ASELS","ASGYO","ASTOR","ASUZU","ATAGY","ATAKP",
+    "ATATP","ATEKS","ATLAS","ATSYH","AVGYO","AVHOL","AVOD","AVPGY","AVTUR","AYCES",
+    "AYDEM","AYEN","AYES","AYGAZ","AZTEK","BAGFS","BAHKM","BAKAB","BALAT","BALSU",
+    "BANVT","BARMA","BASCM","BASGZ","BAYRK","BEGYO","BERA","BESLR","BEYAZ","BFREN",
+    "BIENY","BIGCH","BIGEN","BIMAS","BINBN","BINHO","BIOEN","BIZIM","BJKAS","BLCYT",
+    "BLUME","BMSCH","BMSTL","BNTAS","BOBET","BORLS","BORSK","BOSSA","BRISA","BRKO",
+    "BRKSN","BRKVY","BRLSM","BRMEN","BRSAN","BRYAT","BSOKE","BTCIM","BUCIM","BULGS",
+    "BURCE","BURVA","BVSAN","BYDNR","CANTE","CASA","CATES","CCOLA","CELHA","CEMAS",
+    "CEMTS","CEMZY","CEOEM","CGCAM","CIMSA","CLEBI","CMBTN","CMENT","CONSE","COSMO",
+    "CRDFA","CRFSA","CUSAN","CVKMD","CWENE","DAGI","DAPGM","DARDL","DCTTR","DENGE",
+    "DERHL","DERIM","DESA","DESPC","DEVA","DGATE","DGGYO","DGNMO","DIRIT","DITAS",
+    "DMRGD","DMSAS","DNISI","DOAS","DOBUR","DOCO","DOFER","DOFRB","DOGUB","DOHOL",
+    "DOKTA","DSTKF","DUNYH","DURDO","DURKN","DYOBY","DZGYO","EBEBK","ECILC","ECZYT",
+    "EDATA","EDIP","EFORC","EGEEN","EGEGY","EGEPO","EGGUB","EGPRO","EGSER","EKGYO",
+    "EKIZ","EKOS","EKSUN","ELITE","EMKEL","EMNIS","ENDAE","ENERY","ENJSA","ENKAI",
+    "ENSRI","ENTRA","EPLAS","ERBOS","ERCB","EREGL","ERSU","ESCAR","ESCOM","ESEN",
+    "ETILR","ETYAT","EUHOL","EUKYO","EUPWR","EUREN","EUYO","EYGYO","FADE","FENER",
+    "FLAP","FMIZP","FONET","FORMT","FORTE","FRIGO","FROTO","FZLGY","GARAN","GARFA",
+    "GEDIK","GEDZA","GENIL","GENTS","GEREL","GESAN","GIPTA","GLBMD","GLCVY","GLDTR",
+    "GLRMK","GLRYH","GLYHO","GMSTR","GMTAS","GOKNR","GOLTS","GOODY","GOZDE","GRNYO",
+    "GRSEL","GRTHO","GSDDE","GSDHO","GSRAY","GUBRF","GUNDG","GWIND","GZNMI","HALKB",
+    "HALKS","HATEK","HATSN","HDFGS","HEDEF","HEKTS","HKTM","HLGYO","HOROZ","HRKET",
+    "HTTBT","HUBVC","HUNER","HURGZ","ICBCT","ICUGS","IDGYO","IEYHO","IHAAS","IHEVA",
+    "IHGZT","IHLAS","IHLGM","IHYAY","IMASM","INDES","INFO","INGRM","INTEK","INTEM",
+    "INVEO","INVES","IPEKE","ISATR","ISBIR","ISBTR","ISCTR","ISDMR","ISFIN","ISGLK",
+    "ISGSY","ISGYO","ISIST","ISKPL","ISKUR","ISMEN","ISSEN","ISYAT","IZENR","IZFAS",
+    "IZINV","IZMDC","JANTS","KAPLM","KAREL","KARSN","KARTN","KATMR","KAYSE","KBORU",
+    "KCAER","KCHOL","KENT","KERVN","KFEIN","KGYO","KIMMR","KLGYO","KLKIM","KLMSN",
+    "KLNMA","KLRHO","KLSER","KLSYN","KLYPV","KMPUR","KNFRT","KOCMT","KONKA","KONTR",
+    "KONYA","KOPOL","KORDS","KOTON","KOZAA","KOZAL","KRDMA","KRDMB","KRDMD","KRGYO",
+    "KRONT","KRPLS","KRSTL","KRTEK","KRVGD","KSTUR","KTLEV","KTSKR","KUTPO","KUVVA",
+    "KUYAS","KZBGY","KZGYO","LIDER","LIDFA","LILAK","LINK","LKMNH","LMKDC","LOGO",
+    "LRSHO","LUKSK","LYDHO","LYDYE","MAALT","MACKO","MAGEN","MAKIM","MAKTK","MANAS",
+    "MARBL","MARKA","MARMR","MARTI","MAVI","MEDTR","MEGAP","MEGMT","MEKAG","MEPET",
+    "MERCN","MERIT","MERKO","METRO","MGROS","MHRGY","MIATK","MMCAS","MNDRS","MNDTR",
+    "MOBTL","MOGAN","MOPAS","MPARK","MRGYO","MRSHL","MSGYO","MTRKS","MTRYO","MZHLD",
+    "NATEN","NETAS","NIBAS","NTGAZ","NTHOL","NUGYO","NUHCM","OBAMS","OBASE","ODAS",
+    "ODINE","OFSYM","ONCSM","ONRYT","OPK30","OPT25","OPTGY","OPTLR","OPX30","ORCAY",
+    "ORGE","ORMA","OSMEN","OSTIM","OTKAR","OTTO","OYAKC","OYAYO","OYLUM","OYYAT",
+    "OZATD","OZGYO","OZKGY","OZRDN","OZSUB","OZYSR","PAGYO","PAMEL","PAPIL","PARSN",
+    "PASEU","PATEK","PCILT","PEKGY","PENGD","PENTA","PETKM","PETUN","PGSUS","PINSU",
+    "PKART","PKENT","PLTUR","PNLSN","PNSUT","POLHO","POLTK","PRDGS","PRKAB","PRKME",
+    "PRZMA","PSDTC","PSGYO","QNBFK","QNBTR","QTEMZ","QUAGR","RALYH","RAYSG","REEDR",
+    "RGYAS","RNPOL","RODRG","RTALB","RUBNS","RUZYE","RYGYO","RYSAS","SAFKR","SAHOL",
+    "SAMAT","SANEL","SANFM","SANKO","SARKY","SASA","SAYAS","SDTTR","SEGMN","SEGYO",
+    "SEKFK","SEKUR","SELEC","SELVA","SERNT","SEYKM","SILVR","SISE","SKBNK","SKTAS",
+    "SKYLP","SKYMD","SMART","SMRTG","SMRVA","SNGYO","SNICA","SNKRN","SNPAM","SODSN",
+    "SOKE","SOKM","SONME","SRVGY","SUMAS","SUNTK","SURGY","SUWEN","TABGD","TARKM",
+    "TATEN","TATGD","TAVHL","TBORG","TCELL","TCKRC","TDGYO","TEHOL","TEKTU","TERA",
+    "TEZOL","TGSAS","THYAO","TKFEN","TKNSA","TLMAN","TMPOL","TMSN","TNZTP","TOASO",
+    "TRCAS","TRGYO","TRHOL","TRILC","TSGYO","TSKB","TSPOR","TTKOM","TTRAK","TUCLK",
+    "TUKAS","TUPRS","TUREX","TURGG","TURSG","UFUK","ULAS","ULKER","ULUFA","ULUSE",
+    "ULUUN","UNLU","USAK","USDTR","VAKBN","VAKFN","VAKKO","VANGD","VBTYZ","VERTU",
+    "VERUS","VESBE","VESTL","VKFYO","VKGYO","VKING","VRGYO","VSNMD","X030S","X100S",
+    "XBANA","XBANK","XBLSM","XELKT","XFINK","XGIDA","XGMYO","XHARZ","XHOLD","XILTM",
+    "XINSA","XKAGT","XKMYA","XKOBI","XKURY","XMADN","XMANA","XMESY","XSADA","XSANK",
+    "XSANT","XSBAL","XSBUR","XSDNZ","XSGRT","XSIST","XSIZM","XSKAY","XSKOC","XSKON",
+    "XSPOR","XSTKR","XTAST","XTCRT","XTEKS","XTM25","XTMTU","XTRZM","XTUMY","XU030",
+    "XU050","XU100","XUHIZ","XULAS","XUMAL","XUSIN","XUSRD","XUTEK","XUTUM","XYLDZ",
+    "XYORT"]
+
+
+YILDIZ_PAZAR = ["ASGYO","SASA","HEKTS","KONTR","GWIND","GESAN","BIOEN","NTHOL",
+                "PENTA","KMPUR","SMRTG","ENJSA","ESEN","ALARK","SISE","KRDMD",
+                "AKFGY","YKBNK","VESTL","TUPRS","EREGL","THYAO","AKBNK","GARAN"]
+
+# Listelerde geçen endeks kodları ve borsa yatırım fonları / sertifikalar;
+# burada olmayan semboller hisse sayılır
+ENDEKSLER = ["X030S","X100S","XBANA","XBANK","XBLSM","XELKT","XFINK","XGIDA","XGMYO","XHARZ",
+    "XHOLD","XILTM","XINSA","XKAGT","XKMYA","XKOBI","XKURY","XMADN","XMANA","XMESY",
+    "XSADA","XSANK","XSANT","XSBAL","XSBUR","XSDNZ","XSGRT","XSIST","XSIZM","XSKAY",
+    "XSKOC","XSKON","XSPOR","XSTKR","XTAST","XTCRT","XTEKS","XTM25","XTMTU","XTRZM",
+    "XTUMY","XU030","XU050","XU100","XUHIZ","XULAS","XUMAL","XUSIN","XUSRD","XUTEK",
+    "XUTUM","XYLDZ","XYORT"]
+FONLAR = ["APX30","GLDTR","GMSTR","ISGLK","OPK30","OPT25","OPX30","USDTR"]
+
+# --- Evren kaydı ---
+# Listeler yukarıda elle yazıldığı gibi kalır; taramalar tekrarsız, yalnızca
+# hisse içeren görünümleri kullanır (endeks kodları ve fonlar ayrılır)
+evren = EvrenKaydi().turle(ENDEKSLER, ENDEKS).turle(FONLAR, FON)
+evren.ekle("BIST30", BIST30)
+evren.ekle("BIST50", BIST50)
+evren.ekle("BIST100", BIST100)
+evren.ekle("MENKUL", MENKUL_HISSELER)
+evren.ekle("Yıldız Pazar", YILDIZ_PAZAR)
+
+# Toplu taramalar: her hisse ilk geçtiği listenin satırında
+toplu_listeler = evren.sozluk(["BIST30", "BIST50", "BIST100"], ayrik=True)
+
+# Tavan taraması: "BIST100" seçimi tüm piyasayı (BIST50 + menkul hisseler) kapsar
+borsalar = {
+    "BIST30": toplu_listeler["BIST30"],
+    "BIST50": toplu_listeler["BIST50"],
+    "BIST100": evren.birlesim(["BIST50", "MENKUL"]),
+    "Yıldız Pazar": evren.liste("Yıldız Pazar"),
+}
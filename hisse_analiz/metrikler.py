@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextlib
+from collections import deque
+
+from hisse_analiz.onbellek import tum_istatistikler
+
+# --- Ölçümleme ---
+# Taramaların aşamaları (indirme, panel okuma, gösterge hesabı, hedef analizi,
+# tablo çizimi) için süreler ve sayaçlar süreç içinde toplanır. Atlanan
+# hisseler sessizce düşmez, nedeniyle kaydedilir. Tanılama paneli bu değerleri
+# okur; izleme için Prometheus metin biçimi ya da JSON satırları üretilir.
+# HISSE_METRIK_DOSYASI verilirse her olay o dosyaya JSON satırı olarak eklenir.
+OLAY_SAYISI = 1000      # bellekte tutulan son olaylar
+ATLANAN_SAYISI = 500    # bellekte tutulan son atlanan hisseler
+METRIK_DOSYASI = os.environ.get("HISSE_METRIK_DOSYASI")
+ONEK = "hisse_"
+
+_kilit = threading.Lock()
+_sayaclar = {}    # (ad, etiketler) -> değer
+_sureler = {}     # (ad, etiketler) -> [adet, toplam, en_fazla, son]
+_olaylar = deque(maxlen=OLAY_SAYISI)
+_atlananlar = deque(maxlen=ATLANAN_SAYISI)
+
+
+def _anahtar(ad, etiketler):
+    return ad, tuple(sorted((k, str(v)) for k, v in etiketler.items()))
+
+
+def _olay_ekle(olay):
+    # _kilit tutulurken çağrılır
+    olay["zaman"] = round(time.time(), 3)
+    _olaylar.append(olay)
+    if METRIK_DOSYASI:
+        with open(METRIK_DOSYASI, "a", encoding="utf-8") as f:
+            f.write(json.dumps(olay, ensure_ascii=False, default=str) + "\n")
+
+
+def say(ad, deger=1, **etiketler):
+    anahtar = _anahtar(ad, etiketler)
+    with _kilit:
+        _sayaclar[anahtar] = _sayaclar.get(anahtar, 0) + deger
+
+
+def sure_kaydet(ad, saniye, **etiketler):
+    anahtar = _anahtar(ad, etiketler)
+    with _kilit:
+        kayit = _sureler.setdefault(anahtar, [0, 0.0, 0.0, 0.0])
+        kayit[0] += 1
+        kayit[1] += saniye
+        kayit[2] = max(kayit[2], saniye)
+        kayit[3] = saniye
+
+
+@contextlib.contextmanager
+def asama(ad, **etiketler):
+    # with asama("gosterge", tarama="tavan") as bilgi: bilgi["hisse"] = n
+    # Hisse sayısı verilirse hisse başına süre de kaydedilir
+    bilgi = {}
+    baslangic = time.perf_counter()
+    hata = None
+    try:
+        yield bilgi
+    except BaseException as e:
+        hata = e
+        raise
+    finally:
+        sure = time.perf_counter() - baslangic
+        sure_kaydet("asama_saniye", sure, asama=ad, **etiketler)
+        if bilgi.get("hisse"):
+            sure_kaydet("sembol_basina_saniye", sure / bilgi["hisse"], asama=ad, **etiketler)
+        if hata is not None:
+            say("asama_hata", asama=ad, **etiketler)
+        with _kilit:
+            _olay_ekle({"tur": "asama", "asama": ad, **etiketler, **bilgi,
+                        "saniye": round(sure, 6), "hata": repr(hata) if hata else None})
+
+
+def olculen(ad, **etiketler):
+    # Fonksiyonun tamamını bir aşama olarak ölçen dekoratör
+    def dekorator(fonksiyon):
+        @functools.wraps(fonksiyon)
+        def sarmalayici(*args, **kwargs):
+            with asama(ad, **etiketler):
+                return fonksiyon(*args, **kwargs)
+        return sarmalayici
+    return dekorator
+
+
+def atla(ticker, neden, asama_adi):
+    # Hesaba girmeyen hisse; neden kısa bir etikettir (veri_yok, yetersiz_veri ...)
+    say("atlanan_hisse", asama=asama_adi, neden=neden)
+    with _kilit:
+        kayit = {"tur": "atlanan", "ticker": ticker, "asama": asama_adi, "neden": neden}
+        _atlananlar.append(kayit)
+        _olay_ekle(dict(kayit))
+
+
+def asama_ozeti():
+    with _kilit:
+        satirlar = []
+        for (ad, etiketler), (adet, toplam, en_fazla, son) in _sureler.items():
+            if ad != "asama_saniye":
+                continue
+            satirlar.append({**dict(etiketler), "adet": adet, "toplam_sn": round(toplam, 3),
+                             "ort_ms": round(toplam / adet * 1000, 1), "en_fazla_ms": round(en_fazla * 1000, 1),
+                             "son_ms": round(son * 1000, 1)})
+        return satirlar
+
+
+def sayac_ozeti():
+    with _kilit:
+        return [{"ad": ad, **dict(etiketler), "deger": deger} for (ad, etiketler), deger in _sayaclar.items()]
+
+
+def atlananlar():
+    with _kilit:
+        return list(_atlananlar)
+
+
+def _etiket_metni(etiketler):
+    if not etiketler:
+        return ""
+    parcalar = []
+    for k, v in etiketler:
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+        parcalar.append(f'{k}="{v}"')
+    return "{" + ",".join(parcalar) + "}"
+
+
+def prometheus_metni():
+    # Prometheus metin biçimi (text/plain; version=0.0.4)
+    satirlar = []
+    with _kilit:
+        sayaclar = dict(_sayaclar)
+        sureler = dict(_sureler)
+    for ad in sorted({ad for ad, _ in sayaclar}):
+        satirlar.append(f"# TYPE {ONEK}{ad}_total counter")
+        for (a, etiketler), deger in sayaclar.items():
+            if a == ad:
+                satirlar.append(f"{ONEK}{ad}_total{_etiket_metni(etiketler)} {deger}")
+    for ad in sorted({ad for ad, _ in sureler}):
+        satirlar.append(f"# TYPE {ONEK}{ad} summary")
+        for (a, etiketler), (adet, toplam, _, _) in sureler.items():
+            if a == ad:
+                satirlar.append(f"{ONEK}{ad}_count{_etiket_metni(etiketler)} {adet}")
+                satirlar.append(f"{ONEK}{ad}_sum{_etiket_metni(etiketler)} {toplam:.6f}")
+    # Önbellek sayaçları onbellek.Onbellek'te tutulur
+    istatistikler = tum_istatistikler()
+    for alan, tur in (("isabet", "counter"), ("disk_isabet", "counter"), ("iska", "counter"),
+                      ("tahliye", "counter"), ("birlesen", "counter"), ("kayit", "gauge"), ("bayt", "gauge")):
+        ad = f"{ONEK}onbellek_{alan}" + ("_total" if tur == "counter" else "")
+        satirlar.append(f"# TYPE {ad} {tur}")
+        for i in istatistikler:
+            satirlar.append(f"{ad}{_etiket_metni([('onbellek', i['ad'])])} {i[alan]}")
+    return "\n".join(satirlar) + "\n"
+
+
+def json_satirlari():
+    with _kilit:
+        return "".join(json.dumps(o, ensure_ascii=False, default=str) + "\n" for o in _olaylar)
+
+
+def sifirla():
+    with _kilit:
+        _sayaclar.clear()
+        _sureler.clear()
+        _olaylar.clear()
+        _atlananlar.clear()
@@ -0,0 +1,164 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+# --- Toplu gösterge motoru ---
+# Taramalar her hisse için ayrı DataFrame kurup compute_RSI, rolling ve
+# tahmini_olasilik çağırıyordu. Burada aynı hesaplar (tarih x hisse) panelleri
+# üzerinde tek seferde, 2-B NumPy işlemleriyle yapılır.
+#
+# Tekli fonksiyonlar her hisse için önce dropna() yapıp sonra hesap yaptığından,
+# her sütunun geçerli satırları önce tablonun altına yaslanır ("sıkıştırma").
+# Böylece her sütunun son satırı o hissenin son geçerli barı olur ve pencere
+# hesapları tekli koddakiyle aynı satırları görür.
+
+
+def alta_yasla(maske, *diziler):
+    # maske True olan satırları her sütunda sırasını koruyarak alta yaslar,
+    # üst kısmı NaN ile doldurur. (yaslanmış diziler, geçerli satır sayıları) döner.
+    T, N = maske.shape
+    n = maske.sum(axis=0)
+    satir, sutun = np.nonzero(maske)
+    hedef = (np.cumsum(maske, axis=0) - 1 + (T - n))[satir, sutun]
+    cikis = []
+    for d in diziler:
+        y = np.full((T, N), np.nan)
+        y[hedef, sutun] = d[satir, sutun]
+        cikis.append(y)
+    return cikis, n
+
+
+def kayan_ortalama(x, pencere):
+    # pandas rolling(pencere).mean() karşılığı: pencerede NaN varsa sonuç NaN
+    y = np.full(x.shape, np.nan)
+    if x.shape[0] >= pencere:
+        y[pencere - 1:] = np.lib.stride_tricks.sliding_window_view(x, pencere, axis=0).sum(axis=-1) / pencere
+    return y
+
+
+def rsi_2d(close, period=14):
+    # compute_RSI karşılığı (basit ortalamalı RSI). Serinin ilk barında
+    # delta NaN'dır ve tekli kodda olduğu gibi kazanç/kayıp 0 sayılır.
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    mevcut = ~np.isnan(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[~mevcut] = np.nan
+    loss[~mevcut] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        RS = kayan_ortalama(gain, period) / kayan_ortalama(loss, period)
+        return 100 - (100 / (1 + RS))
+
+
+def ema_2d(x, span):
+    # ewm(span=span, adjust=False).mean() karşılığı; her sütun kendi ilk
+    # geçerli değerinden başlar
+    alfa = 2 / (span + 1)
+    y = np.full(x.shape, np.nan)
+    onceki = np.full(x.shape[1], np.nan)
+    for i in range(x.shape[0]):
+        onceki = np.where(np.isnan(onceki), x[i], alfa * x[i] + (1 - alfa) * onceki)
+        y[i] = onceki
+    return y
+
+
+def _son_ortalama(x, pencere):
+    # rolling(pencere).mean().iloc[-1]: son pencere satırı tam değilse NaN
+    if x.shape[0] < pencere:
+        return np.full(x.shape[1], np.nan)
+    return x[-pencere:].mean(axis=0)
+
+
+GOSTERGE_SUTUNLARI = ["Gun1", "Gun2", "Fiyat", "MA20", "MA50", "MA20_R", "MA50_R", "RSI14", "EMA10",
+                      "Yukselis60", "Hacim", "Hacim5", "Hacim10", "Tahmini_Yuzde", "Degisim", "Tavan_Skoru"]
+
+
+def gosterge_dizileri(C, V):
+    # C / V: (tarih x hisse) float64 dizileri. Her hisse sütunu diğerlerinden
+    # bağımsız hesaplanır; bu yüzden sütun dilimleri ayrı süreçlerde de
+    # hesaplanabilir (paralel.py). GOSTERGE_SUTUNLARI sırasıyla diziler döner.
+    #   Gun1 / MA20 / MA50        : Close-Volume NaN temizliğinden sonra
+    #   Gun2 / MA20_R / MA50_R    : RSI14 NaN temizliğinden sonra (otomatik tarama ve tavan skoru bunu kullanır)
+    T, N = C.shape
+
+    # Close ve Volume dolu satırlar (tekli koddaki .dropna())
+    (C1, V1), n1 = alta_yasla(~np.isnan(C) & ~np.isnan(V), C, V)
+    R1 = rsi_2d(C1)
+
+    # RSI14 dolu satırlar (dropna(subset=['RSI14']))
+    (C2, V2, R2), n2 = alta_yasla(~np.isnan(R1), C1, V1, R1)
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # tamamen boş sütunlarda nanmean
+        fiyat = C2[-1] if T else np.full(N, np.nan)
+        rsi = R2[-1] if T else np.full(N, np.nan)
+        hacim = V2[-1] if T else np.full(N, np.nan)
+        ema10 = ema_2d(C2, 10)[-1] if T else np.full(N, np.nan)
+
+        # tahmini_olasilik: son 60 günde yükselen gün oranı + bonuslar
+        if T >= 60:
+            yukselis60 = (np.diff(C2[-60:], axis=0) > 0).sum(axis=0) / 60 * 100
+        else:
+            yukselis60 = np.full(N, 50.0)
+        hacim5 = np.nanmean(V2[-5:], axis=0) if T else np.full(N, np.nan)
+        hacim10 = np.nanmean(V2[-10:], axis=0) if T else np.full(N, np.nan)
+        ema_bonus = np.where(fiyat > ema10, 10, 0)
+        rsi_bonus = np.where(rsi < 30, 5, 0)
+        hacim_bonus = np.where(hacim > hacim5, 5, 0)
+        yeterli60 = n2 >= 60
+        yukselis60 = np.where(yeterli60, yukselis60, 50.0)
+        tahmini = np.where(yeterli60, yukselis60 + ema_bonus + rsi_bonus + hacim_bonus, 50.0)
+
+        # tavan_skoru
+        onceki = C2[-2] if T >= 2 else np.full(N, np.nan)
+        degisim = (fiyat - onceki) / onceki * 100
+        ma20_r = _son_ortalama(C2, 20)
+        ma50_r = _son_ortalama(C2, 50)
+        skor = (np.where(degisim > 7, 30, 0) + np.where(hacim > hacim10 * 1.5, 25, 0)
+                + np.where(rsi > 50, 15, 0) + np.where(fiyat > ma20_r, 15, 0)
+                + np.where(fiyat > ma50_r, 15, 0))
+        tavan_gecerli = (n1 >= 50) & (n2 >= 2)
+        skor = np.where(tavan_gecerli, skor, 0)
+        degisim = np.where(tavan_gecerli, degisim, np.nan)
+
+    return [n1, n2, fiyat, _son_ortalama(C1, 20), _son_ortalama(C1, 50), ma20_r, ma50_r, rsi, ema10,
+            yukselis60, hacim, hacim5, hacim10, tahmini, degisim, skor]
+
+
+# Hisse başına sonuç kaydı: bar sayıları ve skor tam sayı, diğerleri float64
+GOSTERGE_KAYDI = np.dtype([(ad, "int32" if ad in ("Gun1", "Gun2", "Tavan_Skoru") else "float64")
+                           for ad in GOSTERGE_SUTUNLARI])
+
+
+def gosterge_kayitlari(diziler):
+    # gosterge_dizileri çıktısını (ya da aynı sıradaki satırları) yapılı diziye yazar
+    kayitlar = np.empty(len(diziler[0]), dtype=GOSTERGE_KAYDI)
+    for ad, dizi in zip(GOSTERGE_SUTUNLARI, diziler):
+        kayitlar[ad] = dizi
+    return kayitlar
+
+
+def gosterge_tablosu(diziler, tickers):
+    # Hisse başına tablo (index ticker)
+    return pd.DataFrame(gosterge_kayitlari(diziler), index=tickers)
+
+
+def panel_dizileri(close, volume):
+    volume = volume.reindex(columns=close.columns)
+    return close.to_numpy(dtype="float64"), volume.to_numpy(dtype="float64")
+
+
+def toplu_gostergeler(close, volume):
+    # close / volume: index tarih, sütunlar hisse olan geniş tablolar
+    # (df_all["Close"], df_all["Volume"]). Hisse başına bir satır döner.
+    C, V = panel_dizileri(close, volume)
+    return gosterge_tablosu(gosterge_dizileri(C, V), close.columns)
+
+
+def hisse_borsa_tablosu(hisseler_dict, secilenler=None):
+    # {"BIST30": [...], ...} sözlüğünü taramaların sırasıyla (Hisse, Borsa, Ticker)
+    # satırlarına açar; toplu_gostergeler çıktısıyla Ticker üzerinden birleştirilir
+    satirlar = [(h, borsa, h + ".IS") for borsa, hisseler in hisseler_dict.items()
+                if secilenler is None or borsa in secilenler for h in hisseler]
+    return pd.DataFrame(satirlar, columns=["Hisse", "Borsa", "Ticker"])
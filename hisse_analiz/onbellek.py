@@ -0,0 +1,286 @@
+import os
+import sys
+import time
+import pickle
+import hashlib
+import datetime
+import functools
+import threading
+from collections import OrderedDict
+from zoneinfo import ZoneInfo
+
+# --- Önbellek katmanı ---
+# @st.cache_data yerine: süre (TTL) Borsa İstanbul seans saatlerine göre
+# belirlenir, bellek LRU ile sınırlanır, isabet/ıska sayaçları tutulur ve
+# istenirse sonuçlar birden fazla uygulama işçisinin paylaştığı bir disk
+# dizinine de yazılır.
+#
+# Aynı anahtar için eşzamanlı istekler tek hesapta birleşir (single-flight):
+# süreç içinde ilk gelen hesaplar, diğerleri onu bekler. Disk dizini
+# paylaşılıyorsa aynı kural süreçler (uygulama kopyaları) arasında bir kilit
+# dosyasıyla uygulanır; bekleyen süreç sonucu diskten okur.
+ISTANBUL = ZoneInfo("Europe/Istanbul")
+SEANS_ACILIS = datetime.time(10, 0)
+SEANS_KAPANIS = datetime.time(18, 10)  # kapanış seansı dahil
+KAPANIS_PAYI = datetime.timedelta(minutes=30)  # Yahoo BIST verisi gecikmeli: kapanış barı bu sürede gelir
+VARSAYILAN_DISK_DIZINI = os.environ.get("HISSE_ONBELLEK_DIZINI")  # None: yalnızca bellek
+KILIT_ZAMAN_ASIMI = 900   # saniye; daha eski kilit dosyası ölmüş bir sürece aittir
+KILIT_YOKLAMA = 0.2       # saniye; başka sürecin sonucunu bekleme aralığı
+
+
+def piyasa_acik_mi(an=None):
+    # Resmi tatiller dikkate alınmaz; tatil günü seans içi kısa TTL uygulanır
+    an = an or datetime.datetime.now(ISTANBUL)
+    return an.weekday() < 5 and SEANS_ACILIS <= an.time() < SEANS_KAPANIS
+
+
+def kapanis_payinda_mi(an=None):
+    # Kapanıştan sonraki bekleme süresi (hafta içi 18:10-18:40)
+    an = an or datetime.datetime.now(ISTANBUL)
+    bitis = (datetime.datetime.combine(an.date(), SEANS_KAPANIS) + KAPANIS_PAYI).time()
+    return an.weekday() < 5 and SEANS_KAPANIS <= an.time() < bitis
+
+
+def sonraki_acilis(an=None):
+    an = an or datetime.datetime.now(ISTANBUL)
+    gun = an.date()
+    if an.time() >= SEANS_ACILIS:
+        gun += datetime.timedelta(days=1)
+    while gun.weekday() >= 5:
+        gun += datetime.timedelta(days=1)
+    return datetime.datetime.combine(gun, SEANS_ACILIS, tzinfo=ISTANBUL)
+
+
+def piyasa_ttl(seans_ici=60, seans_disi_en_fazla=None):
+    # Seans içinde ve kapanış payında kısa süre; sonrasında veri değişmeyeceği
+    # için bir sonraki açılışa kadar geçerli
+    def hesapla(an=None):
+        an = an or datetime.datetime.now(ISTANBUL)
+        if piyasa_acik_mi(an) or kapanis_payinda_mi(an):
+            return seans_ici
+        kalan = (sonraki_acilis(an) - an).total_seconds()
+        if seans_disi_en_fazla is not None:
+            kalan = min(kalan, seans_disi_en_fazla)
+        return max(seans_ici, kalan)
+    return hesapla
+
+
+def _boyut(deger):
+    if hasattr(deger, "memory_usage"):
+        kullanim = deger.memory_usage(index=True)
+        return int(kullanim.sum() if hasattr(kullanim, "sum") else kullanim)
+    return sys.getsizeof(deger)
+
+
+class Onbellek:
+    def __init__(self, ad, ttl=60, max_kayit=128, max_bayt=None, disk_dizini=None):
+        self.ad = ad
+        self.ttl = ttl                  # saniye ya da saniye döndüren fonksiyon
+        self.max_kayit = max_kayit
+        self.max_bayt = max_bayt
+        self.disk_dizini = os.path.join(disk_dizini, ad) if disk_dizini else None
+        self._kayitlar = OrderedDict()  # anahtar -> (son_kullanma, değer, boyut)
+        self._bayt = 0
+        self._kilit = threading.Lock()
+        self._ucuslar = {}              # anahtar -> threading.Event, süren hesaplar
+        self.isabet = 0
+        self.disk_isabet = 0
+        self.iska = 0
+        self.tahliye = 0
+        self.birlesen = 0               # başka bir hesabı bekleyerek sonuç alan istekler
+
+    def _sure(self):
+        return self.ttl() if callable(self.ttl) else self.ttl
+
+    def _disk_yolu(self, anahtar):
+        return os.path.join(self.disk_dizini, anahtar + ".pkl")
+
+    def getir(self, anahtar):
+        # (bulundu_mu, değer)
+        simdi = time.time()
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None:
+                if kayit[0] > simdi:
+                    self._kayitlar.move_to_end(anahtar)
+                    self.isabet += 1
+                    return True, kayit[1]
+                self._cikar(anahtar)
+        if self.disk_dizini:
+            try:
+                with open(self._disk_yolu(anahtar), "rb") as f:
+                    son_kullanma, deger = pickle.load(f)
+                if son_kullanma > simdi:
+                    with self._kilit:
+                        self.disk_isabet += 1
+                        self._bellege_ekle(anahtar, son_kullanma, deger)
+                    return True, deger
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+        with self._kilit:
+            self.iska += 1
+        return False, None
+
+    def koy(self, anahtar, deger):
+        son_kullanma = time.time() + self._sure()
+        with self._kilit:
+            self._bellege_ekle(anahtar, son_kullanma, deger)
+        if self.disk_dizini:
+            os.makedirs(self.disk_dizini, exist_ok=True)
+            yol = self._disk_yolu(anahtar)
+            gecici = f"{yol}.{os.getpid()}.tmp"
+            with open(gecici, "wb") as f:
+                pickle.dump((son_kullanma, deger), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(gecici, yol)
+
+    def hesapla(self, anahtar, fonksiyon):
+        # Önbellekte yoksa fonksiyon() ile hesaplar; aynı anahtar için süren
+        # bir hesap varsa (bu süreçte ya da diski paylaşan başka bir süreçte)
+        # onu bekler. Hesaplayan hata verirse bekleyen kendisi dener.
+        bekledi = False
+        while True:
+            bulundu, deger = self.getir(anahtar)
+            if bulundu:
+                if bekledi:
+                    with self._kilit:
+                        self.birlesen += 1
+                return deger
+            with self._kilit:
+                ucus = self._ucuslar.get(anahtar)
+                lider = ucus is None
+                if lider:
+                    ucus = self._ucuslar[anahtar] = threading.Event()
+            if lider:
+                break
+            ucus.wait()
+            bekledi = True
+
+        kilitli = False
+        try:
+            bekledi = self._disk_kilidi_al(anahtar)
+            kilitli = bool(self.disk_dizini)
+            if bekledi:
+                # Kilit beklenirken başka bir süreç sonucu yazmış olabilir
+                bulundu, deger = self.getir(anahtar)
+                if bulundu:
+                    with self._kilit:
+                        self.birlesen += 1
+                    return deger
+            deger = fonksiyon()
+            self.koy(anahtar, deger)
+            return deger
+        finally:
+            if kilitli:
+                self._disk_kilidi_birak(anahtar)
+            with self._kilit:
+                del self._ucuslar[anahtar]
+            ucus.set()
+
+    def _disk_kilidi_al(self, anahtar):
+        # Kilit dosyasını alana kadar bekler; başka süreç tutuyorsa True döner
+        if not self.disk_dizini:
+            return False
+        os.makedirs(self.disk_dizini, exist_ok=True)
+        yol = self._disk_yolu(anahtar) + ".kilit"
+        bekledi = False
+        while True:
+            try:
+                os.close(os.open(yol, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return bekledi
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.path.getmtime(yol) > KILIT_ZAMAN_ASIMI:
+                    os.remove(yol)  # ölmüş sürecin kilidi
+                    continue
+            except OSError:
+                continue  # kilit bu arada bırakıldı
+            bekledi = True
+            time.sleep(KILIT_YOKLAMA)
+
+    def _disk_kilidi_birak(self, anahtar):
+        try:
+            os.remove(self._disk_yolu(anahtar) + ".kilit")
+        except OSError:
+            pass
+
+    def _bellege_ekle(self, anahtar, son_kullanma, deger):
+        if anahtar in self._kayitlar:
+            self._cikar(anahtar)
+        boyut = _boyut(deger)
+        self._kayitlar[anahtar] = (son_kullanma, deger, boyut)
+        self._bayt += boyut
+        while self._kayitlar and (len(self._kayitlar) > self.max_kayit or
+                                  (self.max_bayt is not None and self._bayt > self.max_bayt)):
+            self._cikar(next(iter(self._kayitlar)))
+            self.tahliye += 1
+
+    def _cikar(self, anahtar):
+        _, _, boyut = self._kayitlar.pop(anahtar)
+        self._bayt -= boyut
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+            self._bayt = 0
+
+    def istatistik(self):
+        with self._kilit:
+            return {
+                "ad": self.ad,
+                "kayit": len(self._kayitlar),
+                "bayt": self._bayt,
+                "isabet": self.isabet,
+                "disk_isabet": self.disk_isabet,
+                "iska": self.iska,
+                "tahliye": self.tahliye,
+                "birlesen": self.birlesen,
+            }
+
+
+_onbellekler = {}
+
+
+def tum_istatistikler():
+    return [o.istatistik() for o in _onbellekler.values()]
+
+
+def _kopya(deger):
+    # st.cache_data gibi: çağıran tarafın değiştirdiği tablo önbelleği bozmasın
+    return deger.copy() if hasattr(deger, "copy") else deger
+
+
+def onbellekle(ttl=None, max_kayit=128, max_bayt=None, disk_dizini=VARSAYILAN_DISK_DIZINI, surum=None,
+               anahtar=None):
+    # Fonksiyon sonucunu argümanlarına göre önbellekler. surum verilirse
+    # (aynı argümanları alan fonksiyon) anahtara eklenir; örneğin veri sürümü
+    # değişince eski sonuç kullanılmaz. Geri çağırma (fonksiyon) argümanları
+    # anahtara girmez. anahtar verilirse (aynı argümanları alan fonksiyon)
+    # argümanların yerine onun döndürdüğü değer kullanılır; sonucu
+    # etkilemeyen argümanlar (işçi sayısı, ilerleme) böylece ayrı kayıt açmaz.
+    ttl = ttl if ttl is not None else piyasa_ttl()
+
+    def dekorator(fonksiyon):
+        ad = f"{fonksiyon.__module__}.{fonksiyon.__qualname__}"
+        # Streamlit betiği her çalıştığında fonksiyonu yeniden tanımlar;
+        # aynı addaki önbellek korunur
+        if ad not in _onbellekler:
+            _onbellekler[ad] = Onbellek(ad, ttl, max_kayit, max_bayt, disk_dizini)
+        onbellek = _onbellekler[ad]
+
+        @functools.wraps(fonksiyon)
+        def sarmalayici(*args, **kwargs):
+            if anahtar is not None:
+                anahtar_verisi = (anahtar(*args, **kwargs), surum(*args, **kwargs) if surum else None)
+            else:
+                anahtar_verisi = (
+                    [a for a in args if not callable(a)],
+                    sorted((k, v) for k, v in kwargs.items() if not callable(v)),
+                    surum(*args, **kwargs) if surum else None,
+                )
+            ozet = hashlib.sha1(pickle.dumps(anahtar_verisi)).hexdigest()
+            return _kopya(onbellek.hesapla(ozet, lambda: fonksiyon(*args, **kwargs)))
+
+        sarmalayici.onbellek = onbellek
+        return sarmalayici
+    return dekorator
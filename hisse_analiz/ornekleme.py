@@ -0,0 +1,126 @@
+import datetime
+import pandas as pd
+
+from hisse_analiz.onbellek import ISTANBUL, SEANS_ACILIS
+
+# --- Zaman dilimleri ve yeniden örnekleme ---
+# Her hisse için yalnızca bir taban seri indirilip depolanır: gün içi zaman
+# dilimleri 5 dakikalık, gün ve üstü dilimler günlük seriden yerel olarak
+# türetilir. Zaman dilimi değiştirmek ağa gitmez.
+#
+# BIST seansı: 10:00 açılış, 18:00'e kadar sürekli işlem, ardından kapanış
+# seansı (18:00-18:10). Gün içi kovalar 10:00'a sabitlenir; açılış öncesi
+# barlar ilk kovaya, kapanış seansı barları son sürekli işlem kovasına
+# katılır. Böylece gün sonunda 10 dakikalık yapay bir "yarım bar" oluşmaz ve
+# hiçbir kova iki günü birleştirmez.
+SUREKLI_KAPANIS = datetime.time(18, 0)
+
+# zaman dilimi -> (taban seri, pandas kuralı; None ise taban serinin kendisi)
+ARALIKLAR = {
+    "5m": ("5m", None),
+    "15m": ("5m", "15min"),
+    "30m": ("5m", "30min"),
+    "1h": ("5m", "60min"),
+    "1d": ("1d", None),
+    "1wk": ("1d", "W-MON"),
+    "1mo": ("1d", "MS"),
+}
+
+# Sağlayıcının gün içi geçmiş sınırı (gün); daha eski başlangıç istenmez
+GUN_ICI_SINIR = {"5m": 59}
+
+TOPLAMA = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def taban_aralik(interval):
+    if interval not in ARALIKLAR:
+        raise ValueError(f"Desteklenmeyen zaman dilimi: {interval}")
+    return ARALIKLAR[interval][0]
+
+
+def gun_ici_mi(interval):
+    return taban_aralik(interval) != "1d"
+
+
+def taban_baslangic(interval, baslangic, bugun=None):
+    # Gün içi taban seride sağlayıcı sınırından eski başlangıç kırpılır
+    sinir = GUN_ICI_SINIR.get(taban_aralik(interval))
+    baslangic = pd.Timestamp(baslangic)
+    if sinir is None:
+        return baslangic
+    en_eski = pd.Timestamp(bugun or datetime.date.today()) - pd.Timedelta(days=sinir)
+    return max(baslangic, en_eski)
+
+
+def _topla(data, etiketler):
+    sutunlar = {k: v for k, v in TOPLAMA.items() if k in data.columns}
+    sonuc = data.groupby(etiketler).agg(sutunlar)
+    if "Volume" in sonuc.columns:
+        # Hacmi hiç gelmemiş kova 0 değil NaN kalsın
+        sonuc["Volume"] = data["Volume"].groupby(etiketler).sum(min_count=1)
+    return sonuc.dropna(how="all")
+
+
+def _gun_ici_etiketler(index, dakika):
+    # Kova etiketi: gün + 10:00 + k * dakika; seans dışı barlar sınırdaki kovaya
+    gun = index.normalize()
+    acilis = pd.Timedelta(hours=SEANS_ACILIS.hour, minutes=SEANS_ACILIS.minute)
+    kapanis = pd.Timedelta(hours=SUREKLI_KAPANIS.hour, minutes=SUREKLI_KAPANIS.minute)
+    gecen = (index - gun).to_series(index=index).clip(lower=acilis, upper=kapanis - pd.Timedelta(minutes=1)) - acilis
+    adim = pd.Timedelta(minutes=dakika)
+    return pd.DatetimeIndex(gun + acilis + (gecen // adim) * adim)
+
+
+def _kova_sonu(etiket, kural):
+    if kural == "W-MON":
+        return etiket + pd.Timedelta(days=7)
+    if kural == "MS":
+        return etiket + pd.offsets.MonthBegin(1)
+    if kural is None:
+        return None
+    bitis = etiket + pd.Timedelta(kural)
+    seans_sonu = etiket.normalize() + pd.Timedelta(hours=SUREKLI_KAPANIS.hour, minutes=SUREKLI_KAPANIS.minute + 10)
+    # Son kova kapanış seansını da kapsar
+    return seans_sonu if bitis >= etiket.normalize() + pd.Timedelta(hours=SUREKLI_KAPANIS.hour) else bitis
+
+
+def ornekle(data, interval, an=None):
+    # Taban seriden istenen zaman dilimi. Son kova henüz kapanmadıysa
+    # data.attrs["son_bar_kesin"] False olur (gün içinde haftalık bar gibi).
+    _, kural = ARALIKLAR[interval]
+    if kural is None or data.empty:
+        sonuc = data.copy()
+    elif kural in ("W-MON", "MS"):
+        gun = data.index.normalize()
+        etiketler = (gun - pd.to_timedelta(gun.dayofweek, unit="D")) if kural == "W-MON" else gun.to_period("M").to_timestamp()
+        sonuc = _topla(data, pd.DatetimeIndex(etiketler))
+    else:
+        sonuc = _topla(data, _gun_ici_etiketler(data.index, int(pd.Timedelta(kural).total_seconds() // 60)))
+    sonuc.index.name = data.index.name
+
+    an = pd.Timestamp(an or datetime.datetime.now(ISTANBUL).replace(tzinfo=None))
+    kesin = True
+    if not sonuc.empty and kural is not None:
+        kesin = _kova_sonu(sonuc.index[-1], kural) <= an
+    sonuc.attrs["son_bar_kesin"] = kesin
+    return sonuc
+
+
+def gunluk_ornekle(gun_ici):
+    # Gün içi seriden günlük barlar (etiket: gün başı)
+    if gun_ici.empty:
+        return gun_ici.copy()
+    return _topla(gun_ici, pd.DatetimeIndex(gun_ici.index.normalize()))
+
+
+def gun_ici_ile_tamamla(gunluk, gun_ici):
+    # Günlük serinin sonuna, günlük seride henüz olmayan (ya da eksik kalan)
+    # günleri gün içi seriden türeterek ekler; seans içinde bugünün barı
+    # canlı izlenebilir
+    ek = gunluk_ornekle(gun_ici)
+    if ek.empty:
+        return gunluk
+    if not gunluk.empty:
+        ek = ek[ek.index >= gunluk.index[-1]]
+        gunluk = gunluk[gunluk.index < ek.index[0]] if not ek.empty else gunluk
+    return pd.concat([gunluk, ek[[c for c in gunluk.columns if c in ek.columns] or ek.columns]]).sort_index()
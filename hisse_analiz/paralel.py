@@ -0,0 +1,115 @@
+import os
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from hisse_analiz.motor import GOSTERGE_SUTUNLARI, gosterge_dizileri, gosterge_tablosu, panel_dizileri
+
+# --- Çok süreçli tarama ---
+# Gösterge motoru tek iş parçacığında çalışır; ~500 sembollük evrende tek
+# çekirdek kullanılır. Burada hisse sütunları parçalara (shard) bölünür ve her
+# parça ayrı bir süreçte hesaplanır. Close/Volume panelleri ile sonuç dizisi
+# paylaşılan bellekte durur: işçilere DataFrame gönderilmez, yalnızca bellek
+# bloklarının adı, boyutu ve sütun aralığı gider. Her hisse sütunu bağımsız
+# hesaplandığından sonuç tek süreçli toplu_gostergeler ile aynıdır.
+VARSAYILAN_ISCI = os.cpu_count() or 1
+EN_AZ_PARCA = 32  # bundan küçük parçalarda süreç maliyeti hesaptan büyük
+
+
+def _bagla(ad, sekil):
+    blok = shared_memory.SharedMemory(name=ad)
+    return blok, np.ndarray(sekil, dtype="float64", buffer=blok.buf)
+
+
+def _parca_hesapla(c_adi, v_adi, s_adi, sekil, bas, son):
+    # İşçi süreç: paylaşılan panellerin [bas:son) sütunlarını okur, sonucu
+    # paylaşılan sonuç dizisinin aynı sütunlarına yazar
+    T, N = sekil
+    bloklar = []
+    try:
+        blok, C = _bagla(c_adi, (T, N))
+        bloklar.append(blok)
+        blok, V = _bagla(v_adi, (T, N))
+        bloklar.append(blok)
+        blok, S = _bagla(s_adi, (len(GOSTERGE_SUTUNLARI), N))
+        bloklar.append(blok)
+        diziler = gosterge_dizileri(C[:, bas:son], V[:, bas:son])
+        for i, d in enumerate(diziler):
+            S[i, bas:son] = d
+        del C, V, S
+    finally:
+        for blok in bloklar:
+            blok.close()
+    return son - bas
+
+
+_havuzlar = {}
+_havuz_kilidi = threading.Lock()
+
+
+def _havuz(isci_sayisi):
+    # Süreç başlatma pahalı; aynı işçi sayısı için havuz bir kez kurulur.
+    # spawn: Streamlit ve yenileme servisi iş parçacıklarıyla fork güvenli değil
+    with _havuz_kilidi:
+        if isci_sayisi not in _havuzlar:
+            baglam = multiprocessing.get_context("spawn")
+            _havuzlar[isci_sayisi] = ProcessPoolExecutor(max_workers=isci_sayisi, mp_context=baglam)
+        return _havuzlar[isci_sayisi]
+
+
+@atexit.register
+def havuzlari_kapat():
+    with _havuz_kilidi:
+        for havuz in _havuzlar.values():
+            havuz.shutdown(wait=False, cancel_futures=True)
+        _havuzlar.clear()
+
+
+def _paylasilan(dizi):
+    blok = shared_memory.SharedMemory(create=True, size=max(dizi.nbytes, 1))
+    hedef = np.ndarray(dizi.shape, dtype="float64", buffer=blok.buf)
+    hedef[:] = dizi
+    return blok
+
+
+def sutun_parcalari(N, isci_sayisi):
+    # Sütunları işçi sayısı kadar yakın boyutlu aralığa böler
+    parca = max(EN_AZ_PARCA, -(-N // isci_sayisi))
+    return [(bas, min(bas + parca, N)) for bas in range(0, N, parca)]
+
+
+def paralel_gostergeler(close, volume, isci_sayisi=None):
+    # toplu_gostergeler ile aynı tabloyu isci_sayisi süreçte hesaplar
+    isci_sayisi = isci_sayisi or VARSAYILAN_ISCI
+    C, V = panel_dizileri(close, volume)
+    T, N = C.shape
+    parcalar = sutun_parcalari(N, isci_sayisi)
+    if isci_sayisi <= 1 or len(parcalar) <= 1 or T == 0:
+        return gosterge_tablosu(gosterge_dizileri(C, V), close.columns)
+
+    bloklar = []
+    try:
+        c_blok = _paylasilan(C)
+        bloklar.append(c_blok)
+        v_blok = _paylasilan(V)
+        bloklar.append(v_blok)
+        s_blok = _paylasilan(np.full((len(GOSTERGE_SUTUNLARI), N), np.nan))
+        bloklar.append(s_blok)
+
+        havuz = _havuz(isci_sayisi)
+        gorevler = [havuz.submit(_parca_hesapla, c_blok.name, v_blok.name, s_blok.name, (T, N), bas, son)
+                    for bas, son in parcalar]
+        for gorev in gorevler:
+            gorev.result()
+
+        S = np.ndarray((len(GOSTERGE_SUTUNLARI), N), dtype="float64", buffer=s_blok.buf)
+        sonuc = gosterge_tablosu(list(S.copy()), close.columns)
+        del S
+        return sonuc
+    finally:
+        for blok in bloklar:
+            blok.close()
+            blok.unlink()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+# --- Sunucu tarafı sıralama, süzme ve sayfalama ---
+# Sonuç tabloları sayısal sütunlarla gelir. Sıralama ve süzme burada, tablo
+# üzerinde yapılır; tarayıcıya yalnızca görünen sayfa gönderilir. Vurgular
+# satır satır Python fonksiyonu yerine tek bir maske ile üretilir.
+SAYFA_BOYUTU = 50
+
+
+def suz(df, metin=None, sutun="Hisse", maske=None):
+    # metin: sütunda geçen parça (büyük/küçük harf duyarsız); maske: ek satır süzgeci
+    if metin:
+        df = df[df[sutun].astype(str).str.contains(metin.strip().upper(), case=False, regex=False, na=False)]
+    if maske is not None:
+        df = df[maske.reindex(df.index, fill_value=False)]
+    return df
+
+
+def sayfa_sayisi(toplam, boyut=SAYFA_BOYUTU):
+    return max(1, -(-toplam // boyut))
+
+
+def sayfala(df, sirala=None, artan=True, sayfa=1, boyut=SAYFA_BOYUTU):
+    # (sayfa tablosu, toplam satır, sayfa sayısı). NaN değerler sona gider.
+    toplam = len(df)
+    sayfa = min(max(1, sayfa), sayfa_sayisi(toplam, boyut))
+    if sirala is not None:
+        df = df.sort_values(by=sirala, ascending=artan, kind="stable", na_position="last")
+    bas = (sayfa - 1) * boyut
+    return df.iloc[bas:bas + boyut], toplam, sayfa_sayisi(toplam, boyut)
+
+
+def vurgu_stilleri(df, maske, stil="background-color: lightgreen", diger=""):
+    # Styler.apply(..., axis=None) için hücre stilleri; satır başına fonksiyon çağrısı yok
+    satir = np.where(np.asarray(maske, dtype=bool), stil, diger)
+    return pd.DataFrame(np.repeat(satir[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
@@ -0,0 +1,119 @@
+import datetime
+import threading
+
+from hisse_analiz.metrikler import asama
+
+# --- Arka plan yenileme servisi ---
+# Toplu taramalar sayfa her yeniden çalıştığında değil, bu servisin iş
+# parçacığında belirli aralıklarla çalışır. Her turda önce yeni barlar
+# indirilir (guncelle), veri sürümü değişmediyse hesap tekrarlanmaz.
+# Hazır sonuçlar değiştirilemez bir AnlikGoruntu olarak yayınlanır; sayfa
+# etkileşimleri yalnızca bu görüntüyü okur. Henüz tam bir görüntü yokken
+# her görev bittiğinde eksik bir görüntü yayınlanır; sayfa tabloları hazır
+# oldukça doldurur. Sonraki turlar görüntüyü tek seferde değiştirir.
+# Servis önceki bir görüntüyle (ör. arsiv.Arsiv'den) başlatılabilir: sayfa
+# ilk turu beklemeden onu gösterir, veri sürümü aynıysa hesap hiç yapılmaz.
+
+
+class AnlikGoruntu:
+    def __init__(self, zaman, surum, tablolar, durumlar, eksik=()):
+        self.zaman = zaman          # datetime, hesabın bittiği an
+        self.surum = surum          # veri sürümü (veri.veri_surumu); eksik görüntüde None
+        self.tablolar = tablolar    # görev adı -> DataFrame
+        self.durumlar = durumlar    # ticker -> (durum, açıklama), son indirmeden
+        self.eksik = eksik          # henüz hesaplanmamış görevler
+
+
+class YenilemeServisi:
+    def __init__(self, gorevler, guncelle=None, surum=None, aralik=300, ilk=None, kaydet=None):
+        # gorevler: ad -> fonksiyon() -> DataFrame (depodan okur, indirmez)
+        # guncelle: fonksiyon(ilerleme) -> durumlar; yeni barları depoya indirir,
+        #           indirilen her parçada ilerleme(parca, durumlar) çağrılır
+        # surum:    fonksiyon() -> str; veri değişmediyse hesap atlanır
+        # ilk:      başlangıçta yayınlanan AnlikGoruntu (eksik görevleri ilk turda hesaplanır)
+        # kaydet:   fonksiyon(anlik); yeni hesaplanan her tam görüntüyle çağrılır
+        self.gorevler = gorevler
+        self.guncelle = guncelle
+        self.surum = surum
+        self.aralik = aralik
+        self.kaydet = kaydet
+        self._anlik = None
+        self._hazir = threading.Event()
+        self._tetik = threading.Event()
+        self._dur = threading.Event()
+        self._kilit = threading.Lock()  # aynı anda tek yenileme
+        self._is_parcacigi = None
+        self.son_hata = None
+        self.ilerleme = None  # çalışan tur: (aşama metni, indirilen hisse sayısı)
+        if ilk is not None:
+            eksik = tuple(ad for ad in gorevler if ad not in ilk.tablolar)
+            self._yayinla(AnlikGoruntu(ilk.zaman, None if eksik else ilk.surum,
+                                       {ad: t for ad, t in ilk.tablolar.items() if ad in gorevler},
+                                       ilk.durumlar, eksik))
+
+    def baslat(self):
+        if self._is_parcacigi is None:
+            self._is_parcacigi = threading.Thread(target=self._dongu, name="yenileme-servisi", daemon=True)
+            self._is_parcacigi.start()
+        return self
+
+    def durdur(self):
+        self._dur.set()
+        self._tetik.set()
+
+    def tetikle(self):
+        # Bir sonraki turu beklemeden yenile
+        self._tetik.set()
+
+    def _dongu(self):
+        while not self._dur.is_set():
+            try:
+                self.yenile()
+                self.son_hata = None
+            except Exception as e:
+                self.son_hata = e
+            self._tetik.wait(self.aralik)
+            self._tetik.clear()
+
+    def _indirildi(self, parca, durumlar):
+        self.ilerleme = ("indirme", self.ilerleme[1] + len(parca))
+
+    def _yayinla(self, anlik):
+        self._anlik = anlik
+        self._hazir.set()
+        return anlik
+
+    def yenile(self, zorla=False):
+        with self._kilit:
+            try:
+                self.ilerleme = ("indirme", 0)
+                durumlar = (self.guncelle(self._indirildi) if self.guncelle else {}) or {}
+                surum = self.surum() if self.surum else None
+                onceki = self._anlik
+                if not zorla and onceki is not None and surum is not None and surum == onceki.surum:
+                    return onceki
+                tablolar = {}
+                kalan = list(self.gorevler)
+                for ad, gorev in self.gorevler.items():
+                    self.ilerleme = (ad, self.ilerleme[1])
+                    with asama("servis_gorevi", gorev=ad):
+                        tablolar[ad] = gorev()
+                    kalan.remove(ad)
+                    if (onceki is None or onceki.eksik) and kalan:
+                        # Eksik görüntüde henüz hesaplanmayanlar için başlangıç görüntüsü kalır
+                        ara = {**(onceki.tablolar if onceki else {}), **tablolar}
+                        self._yayinla(AnlikGoruntu(datetime.datetime.now(), None, ara, durumlar,
+                                                   tuple(ad for ad in kalan if ad not in ara)))
+                anlik = self._yayinla(AnlikGoruntu(datetime.datetime.now(), surum, tablolar, durumlar))
+                if self.kaydet is not None:
+                    self.kaydet(anlik)
+                return anlik
+            finally:
+                self.ilerleme = None
+
+    def anlik(self, bekle=None):
+        # Son yayınlanan (ilk turda eksik olabilen) görüntü; henüz yoksa en
+        # fazla 'bekle' saniye beklenir
+        if self._anlik is None and bekle:
+            self._hazir.wait(bekle)
+        return self._anlik
@@ -0,0 +1,268 @@
+import ast
+import warnings
+import functools
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.metrikler import asama
+
+# --- Tarama sorguları ---
+# Evrenin son gösterge tablosu (hisse başına bir satır) bir kez hesaplanır;
+# kullanıcı süzgeçleri ve sıralamaları göstergeleri yeniden hesaplamadan bu
+# tablo üzerinde çalışır. Süzgeç, Python sözdiziminde küçük bir ifadedir:
+#   RSI14 < 35 and Hacim_Orani > 1.5
+#   (MA20_R > MA50_R or RSI14 < 30) and Borsa in ("BIST30", "BIST50")
+# İfade ast ile ayrıştırılır ve yalnızca izin verilen düğümler (karşılaştırma,
+# and/or/not, dört işlem, sayı/metin sabiti, sütun adı, abs/min/max) tek
+# seferde NumPy maskesi üreten bir fonksiyona derlenir; eval kullanılmaz.
+# Sıralama için her sayısal sütunun sıra dizini tablo kurulurken hazırlanır,
+# ilk K sonuç maskeyi bu dizin üzerinde süzmekle bulunur.
+YIL_BARI = 252          # 52 hafta
+IFADE_UZUNLUGU = 500    # karakter
+
+# Taramaların kuralları; sayfadaki hazır sorgular da bunlardır
+ALIM_KURALI = "RSI14 < 30 or MA20_R > MA50_R"        # otomatik tarama (MA'lar RSI temizliğinden sonra)
+TOPLU_ALIM_KURALI = "RSI14 < 30 or MA20 > MA50"       # toplu alım ve hedef
+TAVAN_KURALI = "Tavan_Skoru >= 70"
+
+HAZIR_SORGULAR = {
+    "Alım bölgesi": ALIM_KURALI,
+    "Tavan adayı": TAVAN_KURALI,
+    "Aşırı satım + yüksek hacim": "RSI14 < 35 and Hacim_Orani > 1.5",
+    "Yükseliş beklentisi": "Tahmini_Yuzde > 70",
+    "52 hafta zirvesine %5 yakın": "Zirve_Uzaklik > -5",
+}
+
+# Kısa adlar; diğer sütunlar büyük/küçük harf duyarsız yazılabilir
+TAKMA_ADLAR = {"rsi": "RSI14", "ema": "EMA10", "ort_hacim": "Hacim10", "tahmin": "Tahmini_Yuzde",
+               "skor": "Tavan_Skoru"}
+
+# Tavan skoru bileşenleri: sütun -> puan (motor.gosterge_dizileri ile aynı)
+TAVAN_BILESENLERI = {"T_Degisim": 30, "T_Hacim": 25, "T_RSI": 15, "T_MA20": 15, "T_MA50": 15}
+
+INDEKS_SUTUNLARI = ["Hisse", "Borsa", "Fiyat", "Degisim", "RSI14", "MA20", "MA50", "MA20_R", "MA50_R", "EMA10",
+                    "Hacim", "Hacim5", "Hacim10", "Hacim_Orani", "Yukselis60", "Tahmini_Yuzde", "Tavan_Skoru",
+                    *TAVAN_BILESENLERI, "Zirve52", "Dip52", "Zirve_Uzaklik", "Dip_Uzaklik", "Gun1", "Gun2"]
+
+
+def indeks_tablosu(hisseler, gostergeler, close):
+    # hisseler: (Hisse, Borsa, Ticker) satırları; gostergeler: toplu_gostergeler
+    # çıktısı; close: 52 haftalık zirve/dip için (tarih x hisse) kapanış paneli
+    C = close.to_numpy(dtype="float64")[-YIL_BARI:]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # hiç barı olmayan sütunlar
+        uc = pd.DataFrame({"Zirve52": np.nanmax(C, axis=0), "Dip52": np.nanmin(C, axis=0)}, index=close.columns)
+    df = hisseler.drop_duplicates("Ticker").join(gostergeler, on="Ticker", how="inner").join(uc, on="Ticker")
+    df = df[df["Gun2"] > 0]
+
+    # Degisim yalnızca tavan skoru hesaplanabildiğinde doludur
+    gecerli = df["Degisim"].notna()
+    kosullar = {
+        "T_Degisim": df["Degisim"] > 7,
+        "T_Hacim": df["Hacim"] > df["Hacim10"] * 1.5,
+        "T_RSI": df["RSI14"] > 50,
+        "T_MA20": df["Fiyat"] > df["MA20_R"],
+        "T_MA50": df["Fiyat"] > df["MA50_R"],
+    }
+    with np.errstate(invalid="ignore", divide="ignore"):
+        df = df.assign(
+            Hacim_Orani=df["Hacim"] / df["Hacim10"],
+            Zirve_Uzaklik=(df["Fiyat"] / df["Zirve52"] - 1) * 100,
+            Dip_Uzaklik=(df["Fiyat"] / df["Dip52"] - 1) * 100,
+            **{ad: np.where(gecerli & kosullar[ad], puan, 0).astype("int32") for ad, puan in TAVAN_BILESENLERI.items()},
+        )
+    return df[INDEKS_SUTUNLARI].reset_index(drop=True)
+
+
+# --- İfade derleyici ---
+_KARSILASTIRMALAR = {ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater, ast.GtE: np.greater_equal,
+                     ast.Eq: np.equal, ast.NotEq: np.not_equal}
+_ISLEMLER = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide}
+_FONKSIYONLAR = {"abs": np.abs, "min": np.minimum, "max": np.maximum}
+
+
+def _karsilastir(islem, sol, sag):
+    # Metin sütunları (Hisse, Borsa) nesne dizisidir; ufunc yerine Python
+    # karşılaştırması öğe öğe uygulanır
+    if isinstance(islem, (ast.Eq, ast.NotEq)) and (getattr(sol, "dtype", None) == object or isinstance(sag, str)):
+        esit = np.asarray(sol == sag, dtype=bool)
+        return esit if isinstance(islem, ast.Eq) else ~esit
+    return _KARSILASTIRMALAR[type(islem)](sol, sag)
+
+
+def _derle(dugum):
+    # Düğümden fonksiyon(sutun) -> dizi üretir; sutun(ad) sütunun NumPy dizisini verir
+    if isinstance(dugum, ast.BoolOp):
+        parcalar = [_derle(d) for d in dugum.values]
+        birlestir = np.logical_and if isinstance(dugum.op, ast.And) else np.logical_or
+        return lambda sutun: functools.reduce(birlestir, [p(sutun) for p in parcalar])
+    if isinstance(dugum, ast.UnaryOp) and isinstance(dugum.op, (ast.Not, ast.USub, ast.UAdd)):
+        ic = _derle(dugum.operand)
+        if isinstance(dugum.op, ast.Not):
+            return lambda sutun: np.logical_not(ic(sutun))
+        if isinstance(dugum.op, ast.USub):
+            return lambda sutun: np.negative(ic(sutun))
+        return ic
+    if isinstance(dugum, ast.BinOp) and type(dugum.op) in _ISLEMLER:
+        sol, sag, islem = _derle(dugum.left), _derle(dugum.right), _ISLEMLER[type(dugum.op)]
+        return lambda sutun: islem(sol(sutun), sag(sutun))
+    if isinstance(dugum, ast.Compare):
+        # 30 < RSI14 < 70 zincirleri ikili karşılaştırmaların "ve"sidir
+        terimler = [_derle(dugum.left)]
+        ciftler = []
+        for islem, sag in zip(dugum.ops, dugum.comparators):
+            if isinstance(islem, (ast.In, ast.NotIn)):
+                if not isinstance(sag, (ast.Tuple, ast.List, ast.Set)) or not all(isinstance(e, ast.Constant) for e in sag.elts):
+                    raise ValueError("'in' sağında sabitlerden oluşan bir liste olmalı: Borsa in (\"BIST30\", \"BIST50\")")
+                kume = [e.value for e in sag.elts]
+                terimler.append(lambda sutun, kume=kume: kume)
+            elif type(islem) in _KARSILASTIRMALAR:
+                terimler.append(_derle(sag))
+            else:
+                raise ValueError(f"Desteklenmeyen karşılaştırma: {type(islem).__name__}")
+            ciftler.append((islem, len(terimler) - 2))
+
+        def karsilastirma(sutun):
+            degerler = [t(sutun) for t in terimler]
+            maskeler = []
+            for islem, i in ciftler:
+                if isinstance(islem, (ast.In, ast.NotIn)):
+                    m = np.isin(degerler[i], degerler[i + 1])
+                    maskeler.append(m if isinstance(islem, ast.In) else ~m)
+                else:
+                    maskeler.append(_karsilastir(islem, degerler[i], degerler[i + 1]))
+            return functools.reduce(np.logical_and, maskeler)
+        return karsilastirma
+    if isinstance(dugum, ast.Call):
+        if not isinstance(dugum.func, ast.Name) or dugum.func.id not in _FONKSIYONLAR or dugum.keywords:
+            raise ValueError(f"İzin verilen fonksiyonlar: {', '.join(_FONKSIYONLAR)}")
+        fonksiyon = _FONKSIYONLAR[dugum.func.id]
+        argumanlar = [_derle(a) for a in dugum.args]
+        if len(argumanlar) != (1 if dugum.func.id == "abs" else 2):
+            raise ValueError(f"{dugum.func.id} için argüman sayısı hatalı")
+        return lambda sutun: fonksiyon(*[a(sutun) for a in argumanlar])
+    if isinstance(dugum, ast.Constant) and isinstance(dugum.value, (int, float, str)):
+        deger = dugum.value
+        return lambda sutun: deger
+    if isinstance(dugum, ast.Name):
+        ad = dugum.id
+        return lambda sutun: sutun(ad)
+    raise ValueError(f"İfadede izin verilmeyen öğe: {type(dugum).__name__}")
+
+
+@functools.lru_cache(maxsize=256)
+def derle(ifade):
+    # Aynı ifade tekrar ayrıştırılmaz; hatalı ifadede ValueError
+    if len(ifade) > IFADE_UZUNLUGU:
+        raise ValueError(f"İfade en fazla {IFADE_UZUNLUGU} karakter olabilir")
+    try:
+        agac = ast.parse(ifade.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"İfade ayrıştırılamadı: {e.msg}") from None
+    return _derle(agac.body)
+
+
+@functools.lru_cache(maxsize=256)
+def ifade_sutunlari(ifade):
+    # İfadenin kullandığı sütun adları, yazıldığı sırayla (fonksiyon adları hariç)
+    derle(ifade)
+    agac = ast.parse(ifade.strip(), mode="eval")
+    fonksiyonlar = {id(d.func) for d in ast.walk(agac) if isinstance(d, ast.Call)}
+    adlar = sorted((d for d in ast.walk(agac) if isinstance(d, ast.Name) and id(d) not in fonksiyonlar),
+                   key=lambda d: d.col_offset)
+    adlar = [d.id for d in adlar]
+    return tuple(dict.fromkeys(adlar))
+
+
+def eksik_sutunlar(ifade, sutunlar):
+    # İfadede geçip tabloda (takma adlar ve büyük/küçük harf dahil) bulunmayan sütunlar
+    eksik = []
+    for ad in ifade_sutunlari(ifade):
+        try:
+            _ad_coz(ad, sutunlar)
+        except ValueError:
+            eksik.append(ad)
+    return eksik
+
+
+def _ad_coz(ad, sutunlar):
+    if ad in sutunlar:
+        return ad
+    kucuk = ad.lower()
+    if kucuk in TAKMA_ADLAR and TAKMA_ADLAR[kucuk] in sutunlar:
+        return TAKMA_ADLAR[kucuk]
+    for s in sutunlar:
+        if s.lower() == kucuk:
+            return s
+    raise ValueError(f"Bilinmeyen sütun: {ad}")
+
+
+def _maske(ifade, sutun, n):
+    fonksiyon = derle(ifade)
+    # Metin sütununda sayısal işlem ya da sıralama (Hisse < 3, abs(Hisse)) NumPy'de
+    # TypeError verir; sayfa ve komut satırı ifade hatası olarak ValueError bekler
+    try:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sonuc = fonksiyon(sutun)
+    except TypeError as e:
+        raise ValueError(f"Sütun türleriyle uyumsuz ifade: {e}") from None
+    sonuc = np.broadcast_to(np.asarray(sonuc), (n,))
+    if sonuc.dtype != bool:
+        raise ValueError("İfade bir koşul olmalı (ör. RSI14 < 30)")
+    return sonuc
+
+
+def kosul(df, ifade):
+    # Herhangi bir tablo üzerinde ifade -> satır maskesi (pd.Series)
+    return pd.Series(_maske(ifade, lambda ad: df[_ad_coz(ad, df.columns)].to_numpy(), len(df)), index=df.index)
+
+
+class TaramaIndeksi:
+    def __init__(self, tablo, zaman=None):
+        self.tablo = tablo.reset_index(drop=True)
+        self.zaman = zaman
+        self._diziler = {s: self.tablo[s].to_numpy() for s in self.tablo.columns}
+        # Sayısal sütunların sıra dizinleri (NaN sonda); metin sütunlarınınki ilk istekte
+        self._siralar = {}
+        for s, d in self._diziler.items():
+            if d.dtype.kind in "if":
+                self._siralar[(s, True)] = np.argsort(d, kind="stable")
+                self._siralar[(s, False)] = np.argsort(-d, kind="stable")
+
+    def __len__(self):
+        return len(self.tablo)
+
+    def sutunlar(self):
+        return list(self.tablo.columns)
+
+    def sutun(self, ad):
+        return self._diziler[_ad_coz(ad, self._diziler)]
+
+    def sira(self, sutun, artan=True):
+        sutun = _ad_coz(sutun, self._diziler)
+        if (sutun, artan) not in self._siralar:
+            sira = np.argsort(self._diziler[sutun].astype(str), kind="stable")
+            self._siralar[(sutun, artan)] = sira if artan else sira[::-1]
+        return self._siralar[(sutun, artan)]
+
+    def maske(self, ifade=None):
+        if not ifade or not ifade.strip():
+            return np.ones(len(self.tablo), dtype=bool)
+        return _maske(ifade, self.sutun, len(self.tablo))
+
+    def sorgula(self, ifade=None, sirala=None, artan=False, k=None, sutunlar=None):
+        # Süzgeçten geçen satırlar; sirala verilirse o sütuna göre ilk k satır
+        with asama("sorgu") as bilgi:
+            m = self.maske(ifade)
+            if sirala:
+                secilen = self.sira(sirala, artan)
+                secilen = secilen[m[secilen]]
+            else:
+                secilen = np.flatnonzero(m)
+            if k:
+                secilen = secilen[:k]
+            bilgi["satir"] = len(secilen)
+            sonuc = self.tablo.take(secilen)
+            if sutunlar:
+                sonuc = sonuc[[_ad_coz(s, self._diziler) for s in sutunlar]]
+            return sonuc.reset_index(drop=True)
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.veri import toplu_veri, veri_surumu, TARAMA_ALANLARI, TARAMA_TIPLERI
+from hisse_analiz.motor import toplu_gostergeler, hisse_borsa_tablosu
+from hisse_analiz.onbellek import onbellekle
+from hisse_analiz.gostergeler import toplu_hedef_analizi
+from hisse_analiz.metrikler import asama, olculen, atla
+from hisse_analiz.sorgu import kosul, indeks_tablosu, ALIM_KURALI, TOPLU_ALIM_KURALI, TAVAN_KURALI
+
+# --- Toplu taramalar ---
+# Streamlit'ten bağımsız çalışır; arka plan yenileme servisi ve sayfa aynı
+# fonksiyonları kullanır. Sonuç tablolarının sayı sütunları sayısal kalır
+# (yalnızca yuvarlanır); biçimlendirme gösterim katmanında yapılır.
+
+
+def _gostergeler(df_all, isci_sayisi, tarama):
+    # isci_sayisi 1: tek süreç; None: tüm çekirdekler; n: n süreç (paralel.py)
+    with asama("gosterge", tarama=tarama) as bilgi:
+        bilgi["hisse"] = df_all["Close"].shape[1]
+        if isci_sayisi == 1:
+            return toplu_gostergeler(df_all["Close"], df_all["Volume"])
+        from hisse_analiz.paralel import paralel_gostergeler
+        return paralel_gostergeler(df_all["Close"], df_all["Volume"], isci_sayisi)
+
+
+def _atlananlari_kaydet(tickers, gostergeler, gecerli, tarama):
+    # Panelde hiç barı olmayan ve hesap için yeterli geçmişi olmayan hisseler
+    mevcut = set(gostergeler.index)
+    gecerli = set(gecerli)
+    for t in tickers:
+        if t not in mevcut:
+            atla(t, "veri_yok", tarama)
+        elif t not in gecerli:
+            atla(t, "yetersiz_veri", tarama)
+
+
+def _tarama_surumu(hisseler_dict, *args, **kwargs):
+    return veri_surumu([h + ".IS" for b in hisseler_dict for h in hisseler_dict[b]])
+
+
+def _evren_anahtari(hisseler_dict, *args, **kwargs):
+    # Sonucu yalnızca evren (liste adı -> semboller) belirler; işçi sayısı,
+    # ilerleme ve guncelle bayrağı aynı taramanın ayrı kayıtları olmamalı
+    return tuple((b, tuple(hisseler_dict[b])) for b in hisseler_dict)
+
+
+def _tavan_anahtari(hisseler, guncelle=True, ilerleme=None, isci_sayisi=1, gun_ici=False):
+    return tuple(sorted(set(hisseler))), gun_ici
+
+
+def _tavan_surumu(hisseler, guncelle=True, ilerleme=None, isci_sayisi=1, gun_ici=False):
+    tickers = [h + ".IS" for h in hisseler]
+    return veri_surumu(tickers), veri_surumu(tickers, "5m") if gun_ici else None
+
+
+# Anahtar evreni ve veri sürümünü içerir; depoya yeni bar girince eski sonuç
+# kullanılmaz. Aynı taramayı isteyen oturumlar (ve HISSE_ONBELLEK_DIZINI'ni
+# paylaşan uygulama kopyaları) tek hesabı bekler, sonucu paylaşır.
+@onbellekle(max_kayit=8, surum=_tarama_surumu, anahtar=_evren_anahtari)
+@olculen("tarama", tarama="otomatik")
+def otomatik_toplu_tarama(hisseler_dict, guncelle=True, ilerleme=None, isci_sayisi=1):
+    tum_hisseler = [h for b in hisseler_dict for h in hisseler_dict[b]]
+    tickers_is = list(dict.fromkeys(h + ".IS" for h in tum_hisseler))
+
+    # Close ve Volume verilerini çekiyoruz (yerel depo + eksik kuyruk)
+    df_all = toplu_veri(tickers_is, period="3mo", guncelle=guncelle, ilerleme=ilerleme,
+                        alanlar=TARAMA_ALANLARI, tipler=TARAMA_TIPLERI)
+
+    gostergeler = _gostergeler(df_all, isci_sayisi, "otomatik")
+    df = hisse_borsa_tablosu(hisseler_dict).join(gostergeler, on="Ticker", how="inner")
+    df = df[(df["Gun1"] >= 50) & (df["Gun2"] > 0)] # Yeterli veri kontrolü
+    _atlananlari_kaydet(tickers_is, gostergeler, df["Ticker"], "otomatik")
+    if df.empty:
+        return pd.DataFrame()
+
+    # Bu taramada MA'lar RSI temizliğinden sonraki veriyle hesaplanır
+    alim = kosul(df, ALIM_KURALI)
+    df_sonuc = pd.DataFrame({
+        "Hisse": df["Hisse"],
+        "Borsa": df["Borsa"],
+        "Fiyat": df["Fiyat"].round(2),
+        "MA20": df["MA20_R"].round(2),
+        "MA50": df["MA50_R"].round(2),
+        "RSI14": df["RSI14"].round(1),
+        "Tahmini_Yuzde": df["Tahmini_Yuzde"].round(1),
+        "Durum": np.where(alim, "Alım Bölgesi ✅", "Normal")
+    })
+    df_sonuc = df_sonuc.sort_values(by="Tahmini_Yuzde", ascending=False)
+    return df_sonuc.reset_index(drop=True)
+
+
+@onbellekle(max_kayit=8, surum=_tavan_surumu, anahtar=_tavan_anahtari)
+@olculen("tarama", tarama="tavan")
+def tavan_taramasi(hisseler, guncelle=True, ilerleme=None, isci_sayisi=1, gun_ici=False):
+    # Ertesi gün tavan skoru; hisseler düz bir sembol listesidir.
+    # gun_ici=True: bugünün barı 5 dakikalık seriden tamamlanır (seans içi izleme)
+    hisseler = list(dict.fromkeys(hisseler))
+    tickers = [h + ".IS" for h in hisseler]
+    df_all = toplu_veri(tickers, period="6mo", guncelle=guncelle, ilerleme=ilerleme, gun_ici=gun_ici,
+                        alanlar=TARAMA_ALANLARI, tipler=TARAMA_TIPLERI)
+
+    # Tavan skoru tüm hisseler için tek geçişte (ya da süreçlere bölünerek) hesaplanır
+    gostergeler = _gostergeler(df_all, isci_sayisi, "tavan")
+    df = hisse_borsa_tablosu({"": hisseler}).join(gostergeler, on="Ticker", how="inner")
+    # Skoru hesaplanamayan (yetersiz veri) hisseleri atla
+    df = df[df["Degisim"].notna() & df["RSI14"].notna()]
+    _atlananlari_kaydet(tickers, gostergeler, df["Ticker"], "tavan")
+
+    return pd.DataFrame({
+        "Hisse": df["Hisse"],
+        "Günlük % Değişim": df["Degisim"].round(2),
+        "RSI14": df["RSI14"].round(1),
+        "Hacim (M)": (df["Hacim"] / 1e6).round(2),
+        "Ort Hacim (M)": (df["Hacim10"] / 1e6).round(2),
+        "Tavan Skoru": df["Tavan_Skoru"],
+        "Tahmin": np.where(kosul(df, TAVAN_KURALI), "🚀 Tavan ihtimali yüksek", "⚠️ Normal")
+    }).sort_values(by="Tavan Skoru", ascending=False).reset_index(drop=True)
+
+
+@onbellekle(max_kayit=8, surum=_tarama_surumu, anahtar=_evren_anahtari)
+@olculen("tarama", tarama="indeks")
+def tarama_indeksi(hisseler_dict, guncelle=True, ilerleme=None, isci_sayisi=1):
+    # Sorgu motorunun (sorgu.TaramaIndeksi) tablosu: evrenin her hissesi için
+    # son göstergeler, tavan skoru bileşenleri ve 52 haftalık zirve/dip
+    tickers = list(dict.fromkeys(h + ".IS" for b in hisseler_dict for h in hisseler_dict[b]))
+    df_all = toplu_veri(tickers, period="1y", guncelle=guncelle, ilerleme=ilerleme,
+                        alanlar=TARAMA_ALANLARI, tipler=TARAMA_TIPLERI)
+    gostergeler = _gostergeler(df_all, isci_sayisi, "indeks")
+    df = indeks_tablosu(hisse_borsa_tablosu(hisseler_dict), gostergeler, df_all["Close"])
+    _atlananlari_kaydet(tickers, gostergeler, set(df["Hisse"] + ".IS"), "indeks")
+    return df
+
+
+@onbellekle(max_kayit=8)
+def fetch_data_all(tickers):
+    tickers_is = [t + ".IS" for t in tickers]
+    # Depoda olmayan kuyruk indirilir, panel yerel depodan kurulur
+    data = toplu_veri(tickers_is, period="3mo", alanlar=TARAMA_ALANLARI, tipler=TARAMA_TIPLERI)
+    return data
+
+
+@olculen("tarama", tarama="alim")
+def toplu_alim_ve_hedef(hisseler_dict, hedef_yuzdeleri=[8,15,20], secilen_borsa=None, isci_sayisi=1):
+    # secilen_borsa boşsa tüm borsalar taranır; yalnızca seçilenlerin
+    # tekrarsız birleşimi tek istekte indirilir
+    hisseler_dict = {b: l for b, l in hisseler_dict.items() if not secilen_borsa or b in secilen_borsa}
+    tum_hisseler = list(dict.fromkeys(h for b in hisseler_dict for h in hisseler_dict[b]))
+    df_all = fetch_data_all(tum_hisseler)
+
+    # Tüm hisselerin göstergeleri tek geçişte hesaplanır
+    gostergeler = _gostergeler(df_all, isci_sayisi, "alim")
+    df = hisse_borsa_tablosu(hisseler_dict).join(gostergeler, on="Ticker", how="inner")
+
+    # MA ve RSI için yeterli veri + alım bölgesi kontrolü
+    df = df[(df["Gun1"] >= 50) & (df["Gun2"] > 0)]
+    _atlananlari_kaydet([h + ".IS" for h in tum_hisseler], gostergeler, df["Ticker"], "alim")
+    df = df[kosul(df, TOPLU_ALIM_KURALI)]
+
+    # Hedefler tüm adaylar için tek seferde (hisse başına ağ isteği yok)
+    adaylar = df["Ticker"].unique().tolist()
+    with asama("hedef_analizi", tarama="alim") as bilgi:
+        bilgi["hisse"] = len(adaylar)
+        hedefler = toplu_hedef_analizi(adaylar, hedef_yuzdeleri)
+    for t in set(adaylar) - set(hedefler.index):
+        atla(t, "kotasyon_yok", "hedef_analizi")
+    df = df.join(hedefler[["hedef1", "hedef2", "hedef3"]], on="Ticker", how="inner")
+    if df.empty:
+        return pd.DataFrame()
+
+    P_tahmin = df["Tahmini_Yuzde"]
+    yuzde = P_tahmin.map(" ({:.1f}%)".format)
+    tahmin = np.select([P_tahmin > 70, P_tahmin > 55], ["🚀 Yüksek Yükseliş", "📈 Hafif Yükseliş"], "⚠️ Nötr") + yuzde
+
+    sonuc_df = pd.DataFrame({
+        "Hisse": df["Hisse"],
+        "Borsa": df["Borsa"],
+        "Fiyat": df["Fiyat"].round(2),
+        "MA20": df["MA20"].round(2),
+        "MA50": df["MA50"].round(2),
+        "RSI14": df["RSI14"].round(1),
+        "Hedef1": df["hedef1"].round(2),
+        "Hedef2": df["hedef2"].round(2),
+        "Hedef3": df["hedef3"].round(2),
+        "Durum": "Alım Bölgesi ✅",
+        "Tahmini_Yon": tahmin
+    })
+    return sonuc_df.sort_values(by="RSI14", kind="stable").reset_index(drop=True)
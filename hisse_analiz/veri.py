@@ -0,0 +1,220 @@
+import datetime
+import hashlib
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.depo import BarDeposu, ALANLAR
+from hisse_analiz.zamanlayici import IndirmeZamanlayici, TAMAM
+from hisse_analiz.metrikler import asama, say, atla
+from hisse_analiz.ornekleme import taban_aralik, taban_baslangic, ornekle, gun_ici_ile_tamamla
+
+# --- Veri sağlayıcı ---
+# Sağlayıcı, yf.download ile aynı biçimde (Price, Ticker) MultiIndex sütunlu
+# bir tablo döndüren herhangi bir fonksiyon olabilir. Testlerde ve ölçümlerde
+# yfinance yerine sahte bir sağlayıcı verilebilir.
+def yf_saglayici(tickers, start, end, interval):
+    import yfinance as yf
+    return yf.download(tickers, start=start, end=end, interval=interval,
+                       auto_adjust=True, progress=False, group_by="column")
+
+
+# Taramalar yalnızca kapanış ve hacmi kullanır. Fiyatlar float32 tutulur
+# (gösterge hesabı float64'e yükseltir); hacim float64 kalır: eksik bar NaN
+# olmalı ve float32 16 milyonun üstündeki hacimleri tam tutamaz.
+TARAMA_ALANLARI = ["Close", "Volume"]
+TARAMA_TIPLERI = {"Close": "float32"}
+
+_varsayilan_depo = None
+_varsayilan_zamanlayici = None
+
+
+def varsayilan_depo():
+    global _varsayilan_depo
+    if _varsayilan_depo is None:
+        _varsayilan_depo = BarDeposu()
+    return _varsayilan_depo
+
+
+def varsayilan_depoyu_ayarla(dizin):
+    global _varsayilan_depo
+    _varsayilan_depo = BarDeposu(dizin)
+    return _varsayilan_depo
+
+
+def varsayilan_saglayiciyi_ayarla(saglayici, **ayarlar):
+    # Ölçüm ve denemelerde yfinance yerine başka bir sağlayıcı; ayarlar
+    # IndirmeZamanlayici'ya gider (ör. sunucu="sentetik", saniyede=None).
+    # None verilirse yfinance'e dönülür.
+    global _varsayilan_zamanlayici
+    _varsayilan_zamanlayici = IndirmeZamanlayici(saglayici, **ayarlar) if saglayici else None
+
+
+def periyot_baslangic(period, bugun=None):
+    # yfinance "period" ifadesini ("5d", "3mo", "1y" ...) başlangıç tarihine çevirir
+    bugun = pd.Timestamp(bugun or datetime.date.today()).normalize()
+    for ek, birim in (("mo", "months"), ("wk", "weeks"), ("d", "days"), ("y", "years")):
+        if period.endswith(ek):
+            return bugun - pd.DateOffset(**{birim: int(period[:-len(ek)])})
+    raise ValueError(f"Tanınmayan periyot: {period}")
+
+
+def _hisse_tablosu(data, ticker):
+    # Sağlayıcı çıktısından tek bir hissenin OHLCV tablosunu ayır
+    if data is None or data.empty:
+        return None
+    if isinstance(data.columns, pd.MultiIndex):
+        if ticker not in data.columns.get_level_values(1):
+            return None
+        tablo = data.xs(ticker, axis=1, level=1)
+    else:
+        tablo = data
+    tablo = tablo[[c for c in ALANLAR if c in tablo.columns]].dropna(how="all")
+    if tablo.empty:
+        return None
+    if tablo.index.tz is not None:
+        tablo.index = tablo.index.tz_convert("Europe/Istanbul").tz_localize(None)
+    return tablo
+
+
+def _indirme_olcumleri(data, durumlar, interval):
+    say("indirilen_hisse", len(durumlar), aralik=interval)
+    if data is not None:
+        say("indirilen_bayt", int(data.memory_usage(index=True).sum()), aralik=interval)
+    for t, (durum, _) in durumlar.items():
+        say("indirme_durumu", durum=durum)
+        if durum != TAMAM:
+            atla(t, durum, "indirme")
+
+
+def depoyu_guncelle(tickers, interval="1d", baslangic=None, bitis=None, depo=None, saglayici=None,
+                    ilerleme=None, zamanlayici=None, oncelikli=False):
+    # Depoda olmayan hisseler için baslangic'tan itibaren tüm geçmiş, olanlar
+    # için yalnızca son kayıtlı bardan sonraki kuyruk indirilir. Son bar da
+    # yeniden istenir; gün içinde henüz kapanmamış bar böylece güncellenir.
+    # İndirme parçalar halinde zamanlayıcıdan geçer; her parça bittiğinde
+    # ilerleme(parca, durumlar) çağrılır. Hisse başına durumlar döner.
+    # oncelikli=True: istekler toplu indirmelerin sırasını beklemez (sayfadaki tek hisse)
+    depo = depo or varsayilan_depo()
+    if zamanlayici is None:
+        if saglayici is not None:
+            zamanlayici = IndirmeZamanlayici(saglayici)
+        else:
+            zamanlayici = _varsayilan_zamanlayici or IndirmeZamanlayici(yf_saglayici)
+    baslangic = pd.Timestamp(baslangic) if baslangic is not None else None
+    bitis = pd.Timestamp(bitis) if bitis is not None else pd.Timestamp(datetime.date.today()) + pd.Timedelta(days=1)
+
+    gruplar = {}
+    for t in tickers:
+        aralik = depo.aralik(t, interval)
+        kapsam = depo.kapsam(t, interval)
+        if aralik is None or (baslangic is not None and (kapsam is None or baslangic < kapsam)):
+            if depo.bos_isaretli(t, interval):
+                continue
+            gruplar.setdefault(baslangic, []).append(t)
+        elif (depo.guncelleme(t, interval) or aralik[1]) >= bitis:
+            continue  # Aralık kapandıktan sonra zaten güncellenmiş
+        else:
+            gruplar.setdefault(aralik[1].normalize(), []).append(t)
+
+    say("guncel_atlanan_hisse", len(tickers) - sum(len(g) for g in gruplar.values()), aralik=interval)
+    tum_durumlar = {}
+    with asama("indirme", aralik=interval) as bilgi:
+        bilgi["hisse"] = sum(len(g) for g in gruplar.values())
+        for grup_baslangic, grup in gruplar.items():
+            for parca, data, durumlar in zamanlayici.akis(grup, grup_baslangic, bitis, interval, oncelikli):
+                tum_durumlar.update(durumlar)
+                _indirme_olcumleri(data, durumlar, interval)
+                if data is not None:  # Başarısız parça (ağ hatası) boş diye işaretlenmez
+                    for t in parca:
+                        tablo = _hisse_tablosu(data, t)
+                        if grup_baslangic == baslangic and baslangic is not None:
+                            depo.kapsami_genislet(t, interval, baslangic)
+                        depo.guncellendi(t, interval)
+                        if tablo is None:
+                            if depo.aralik(t, interval) is None:
+                                depo.bos_isaretle(t, interval)
+                            continue
+                        depo.birlestir(t, interval, tablo)
+                if ilerleme is not None:
+                    ilerleme(parca, durumlar)
+    if gruplar:
+        depo.indeksi_kaydet(interval)
+    return tum_durumlar
+
+
+def tekli_veri(ticker, start, end, interval="1d", depo=None, saglayici=None):
+    # get_data karşılığı: tek hissenin [start, end) aralığındaki OHLCV'si.
+    # Depoya yalnızca taban seri (5m ya da 1d) yazılır; 15m, 1h, 1wk, 1mo
+    # barları ondan yerel olarak türetilir.
+    depo = depo or varsayilan_depo()
+    data = taban_veri(ticker, start, end, interval, depo, saglayici)
+    return ornekle(data, interval)
+
+
+def taban_veri(ticker, start, end, interval="1d", depo=None, saglayici=None):
+    # interval'ın türetildiği taban serinin [start, end) aralığı
+    depo = depo or varsayilan_depo()
+    taban = taban_aralik(interval)
+    start = taban_baslangic(interval, start)
+    depoyu_guncelle([ticker], taban, start, end, depo, saglayici, oncelikli=True)
+    data = depo.oku(ticker, taban)
+    return data[(data.index >= pd.Timestamp(start)) & (data.index < pd.Timestamp(end))]
+
+
+def veri_surumu(tickers, interval="1d", depo=None):
+    # Hisselerden herhangi birinin barları değiştiğinde değişen kısa özet;
+    # hesap sonuçlarını yeni bar gelmeden yeniden üretmemek için kullanılır
+    depo = depo or varsayilan_depo()
+    ozet = ",".join(f"{t}:{depo.surum(t, interval)}" for t in sorted(set(tickers)))
+    return hashlib.sha1(ozet.encode()).hexdigest()[:16]
+
+
+def toplu_veri(tickers, period="3mo", interval="1d", depo=None, saglayici=None, ilerleme=None, guncelle=True,
+               gun_ici=False, alanlar=None, tipler=None):
+    # fetch_data_all / tavan taraması karşılığı: yf.download(tickers, period=...)
+    # ile aynı (Price, Ticker) MultiIndex biçiminde panel döndürür.
+    # guncelle=False ise sağlayıcıya gidilmez, yalnızca depodaki veri okunur.
+    # gun_ici=True ise günlük serinin son günü depodaki 5 dakikalık barlardan
+    # tamamlanır (seans içi tavan izleme); yalnızca bugünün barları istenir.
+    # alanlar: yalnızca bu OHLCV alanları okunur (ör. TARAMA_ALANLARI);
+    # tipler: alan -> dtype (ör. {"Close": "float32"}), varsayılan float64.
+    depo = depo or varsayilan_depo()
+    alanlar = sorted(alanlar or ALANLAR)
+    tipler = tipler or {}
+    baslangic = periyot_baslangic(period)
+    bugun = pd.Timestamp(datetime.date.today())
+    if guncelle:
+        depoyu_guncelle(tickers, interval, baslangic, None, depo, saglayici, ilerleme)
+        if gun_ici:
+            depoyu_guncelle(tickers, "5m", bugun, None, depo, saglayici)
+
+    # Hisse başına yalnızca tarih ve alan dizileri tutulur; panel tek geçişte
+    # önceden ayrılmış bitişik dizilere yazılır (hisse başına DataFrame
+    # birleştirme yok)
+    mevcut, tarihler, degerler = [], [], []
+    with asama("panel_okuma", aralik=interval) as bilgi:
+        bilgi["hisse"] = len(tickers)
+        for t in tickers:
+            data = depo.oku(t, interval, alanlar)
+            data = data[data.index >= baslangic]
+            if gun_ici:
+                bes_dk = depo.oku(t, "5m", alanlar)
+                data = gun_ici_ile_tamamla(data, bes_dk[bes_dk.index >= bugun])
+            if not data.empty:
+                mevcut.append(t)
+                # Kopyalar: parquet okuyucusunun tamponları hisse başına serbest kalır
+                tarihler.append(data.index.to_numpy(copy=True))
+                degerler.append([data[a].to_numpy(dtype=tipler.get(a, "float64"), copy=True) for a in alanlar])
+        if not mevcut:
+            return pd.DataFrame(columns=pd.MultiIndex.from_product([alanlar, tickers], names=["Price", "Ticker"]))
+
+        sira = sorted(range(len(mevcut)), key=mevcut.__getitem__)
+        index = pd.DatetimeIndex(np.unique(np.concatenate(tarihler)))
+        diziler = {a: np.full((len(index), len(mevcut)), np.nan, dtype=tipler.get(a, "float64")) for a in alanlar}
+        for j, k in enumerate(sira):
+            satir = index.searchsorted(tarihler[k])
+            for a, dizi in zip(alanlar, degerler[k]):
+                diziler[a][satir, j] = dizi
+        sutunlar = [mevcut[k] for k in sira]
+        return pd.concat({a: pd.DataFrame(diziler[a], index=index, columns=sutunlar) for a in alanlar},
+                         axis=1, names=["Price", "Ticker"])
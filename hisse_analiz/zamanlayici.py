@@ -0,0 +1,113 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+
+# --- Toplu indirme zamanlayıcısı ---
+# Büyük evrenler (MENKUL_HISSELER ~500 sembol) tek bir istek yerine parçalara
+# bölünür; parçalar sınırlı bir iş parçacığı havuzunda, sunucu başına hız
+# sınırıyla indirilir. Başarısız parça üstel bekleme ile yeniden denenir,
+# her hissenin sonucu (tamam / veri_yok / hata) raporlanır ve parçalar
+# bittikçe sonuçlar çağırana akıtılır.
+TAMAM = "tamam"
+VERI_YOK = "veri_yok"
+HATA = "hata"
+
+
+class HizSinirlayici:
+    # Ardışık iki istek arasında en az 1/saniyede saniye bırakır. Öncelikli
+    # istekler (sayfadaki tek hisse) toplu indirmenin önceden ayırdığı
+    # yuvaları beklemez: sıradaki ilk boş yuvayı alır, toplu istekler bir
+    # yuva kayar. Ortalama hız aynı kalır.
+    def __init__(self, saniyede=2.0):
+        self.aralik = 1.0 / saniyede if saniyede else 0.0
+        self._sonraki = 0.0
+        self._sonraki_oncelikli = 0.0
+        self._kilit = threading.Lock()
+
+    def bekle(self, oncelikli=False):
+        with self._kilit:
+            simdi = time.monotonic()
+            if oncelikli:
+                baslangic = max(simdi, self._sonraki_oncelikli)
+                self._sonraki_oncelikli = baslangic + self.aralik
+                self._sonraki = max(self._sonraki, baslangic) + self.aralik
+            else:
+                baslangic = max(simdi, self._sonraki)
+                self._sonraki = baslangic + self.aralik
+        if baslangic > simdi:
+            time.sleep(baslangic - simdi)
+
+
+_sinirlayicilar = {}
+_sinirlayici_kilidi = threading.Lock()
+
+
+def sunucu_sinirlayici(sunucu, saniyede=2.0):
+    # Aynı sunucuya giden tüm zamanlayıcılar tek sınırlayıcıyı paylaşır
+    with _sinirlayici_kilidi:
+        if sunucu not in _sinirlayicilar:
+            _sinirlayicilar[sunucu] = HizSinirlayici(saniyede)
+        return _sinirlayicilar[sunucu]
+
+
+def parcala(liste, boyut):
+    return [liste[i:i + boyut] for i in range(0, len(liste), boyut)]
+
+
+class IndirmeZamanlayici:
+    # indirici(tickers, start, end, interval) -> (Price, Ticker) MultiIndex tablo;
+    # veri.yf_saglayici ya da testlerde gecikme/hata enjekte eden sahte bir fonksiyon
+    def __init__(self, indirici, parca_boyutu=50, isci_sayisi=4, sunucu="yahoo",
+                 saniyede=2.0, deneme=3, bekleme=1.0):
+        if deneme < 1:
+            raise ValueError(f"deneme en az 1 olmalı: {deneme}")
+        self.indirici = indirici
+        self.parca_boyutu = parca_boyutu
+        self.isci_sayisi = isci_sayisi
+        self.sinirlayici = sunucu_sinirlayici(sunucu, saniyede)
+        self.deneme = deneme
+        self.bekleme = bekleme
+
+    def _parca_indir(self, parca, start, end, interval, oncelikli=False):
+        # Boş tablo hata değildir (tatil, kuyruk zaten güncel): yeniden denenmez,
+        # hisseler veri_yok olarak raporlanır. Yalnızca istisnalar yeniden denenir.
+        for i in range(self.deneme):
+            self.sinirlayici.bekle(oncelikli)
+            try:
+                data = self.indirici(parca, start, end, interval)
+                return pd.DataFrame() if data is None else data
+            except Exception as e:
+                hata = e
+                if i + 1 < self.deneme:
+                    time.sleep(self.bekleme * 2 ** i * (1 + random.random() / 2))
+        raise hata
+
+    def akis(self, tickers, start, end, interval, oncelikli=False):
+        # Parçalar bittikçe (parca, data, durumlar) üretir; data başarısız
+        # parçada None'dır. durumlar: ticker -> (durum, açıklama)
+        parcalar = parcala(list(tickers), self.parca_boyutu)
+        with ThreadPoolExecutor(max_workers=self.isci_sayisi) as havuz:
+            gorevler = {havuz.submit(self._parca_indir, p, start, end, interval, oncelikli): p for p in parcalar}
+            for gorev in as_completed(gorevler):
+                parca = gorevler[gorev]
+                try:
+                    data = gorev.result()
+                except Exception as e:
+                    yield parca, None, {t: (HATA, str(e)) for t in parca}
+                    continue
+                if data.empty:
+                    yield parca, data, {t: (VERI_YOK, "Sağlayıcı bar döndürmedi") for t in parca}
+                    continue
+                if not isinstance(data.columns, pd.MultiIndex):
+                    yield parca, data, {t: (TAMAM, "") for t in parca}
+                    continue
+                mevcut = set(data.columns.get_level_values(-1))
+                durumlar = {}
+                for t in parca:
+                    if t in mevcut and data.xs(t, axis=1, level=-1).notna().any().any():
+                        durumlar[t] = (TAMAM, "")
+                    else:
+                        durumlar[t] = (VERI_YOK, "Sağlayıcı bar döndürmedi")
+                yield parca, data, durumlar
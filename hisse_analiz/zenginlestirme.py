@@ -0,0 +1,286 @@
+import os
+import re
+import json
+import time
+import hashlib
+import datetime
+import email.utils
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+
+from hisse_analiz.veri import varsayilan_depo
+from hisse_analiz.zamanlayici import sunucu_sinirlayici
+from hisse_analiz.metrikler import asama, say, atla
+
+# --- Temel veri ve haber zenginleştirmesi ---
+# Hisse başına temel oranlar (F/K, PD/DD, piyasa değeri ...) ve KAP/haber
+# başlıkları web sayfalarından toplanır. İstekler tek bir requests.Session
+# (bağlantı havuzu) üzerinden, sınırlı sayıda iş parçacığıyla ve sunucu
+# başına hız sınırıyla (zamanlayici.sunucu_sinirlayici) yapılır.
+# Her adresin ayrıştırılmış sonucu ETag / Last-Modified değerleriyle diske
+# yazılır: tazelik süresi içinde ağa gidilmez, süre geçince koşullu istek
+# atılır ve 304 yanıtında diskteki sonuç kullanılır. Sayfa yalnızca arka
+# plan servisinin hazırladığı tabloyu okur; açılışa istek gecikmesi eklenmez.
+# Kaynak adresleri ortam değişkenleriyle değiştirilebilir ({hisse} yer tutucusu).
+# Uygulamada kapalıdır, HISSE_ZENGINLESTIRME=1 ile açılır; komut satırında
+# yalnızca `zengin` alt komutu çalıştırıldığında istek atılır.
+# Önbellek dizini verilmezse HISSE_ZENGIN_DIZINI ya da varsayılan bar deposunun altındaki zengin klasörü
+ZENGIN_DIZINI = os.environ.get("HISSE_ZENGIN_DIZINI")
+TEMEL_URL = os.environ.get(
+    "HISSE_TEMEL_URL", "https://www.isyatirim.com.tr/tr-tr/analiz/hisse/Sayfalar/sirket-karti.aspx?hisse={hisse}")
+HABER_URL = os.environ.get(
+    "HISSE_HABER_URL", "https://news.google.com/rss/search?q={hisse}+KAP&hl=tr&gl=TR&ceid=TR:tr")
+TEMEL_TAZELIK = 6 * 3600   # saniye; oranlar gün içinde nadiren değişir
+HABER_TAZELIK = 15 * 60
+HABER_SAYISI = 10          # hisse başına saklanan son başlık
+ZAMAN_ASIMI = 10           # saniye, tek istek
+ZENGIN_HIZI = float(os.environ.get("HISSE_ZENGIN_HIZI", "2"))  # sunucu başına istek/saniye (0: sınırsız)
+
+# lxml hızlıdır; kurulu değilse Python'un ayrıştırıcısına düşülür
+try:
+    import lxml  # noqa: F401
+    HTML_AYRISTIRICI, XML_AYRISTIRICI = "lxml", "xml"
+except ImportError:
+    HTML_AYRISTIRICI = XML_AYRISTIRICI = "html.parser"
+
+# Sayfadaki etiket (küçük harf) -> sütun
+TEMEL_ALANLAR = {
+    "f/k": "FK",
+    "pd/dd": "PD_DD",
+    "fd/favök": "FD_FAVOK",
+    "piyasa değeri": "Piyasa_Degeri",
+    "temettü verimi": "Temettu_Verimi",
+    "halka açıklık oranı": "Halka_Aciklik",
+}
+ZENGIN_SUTUNLARI = ["Hisse", *TEMEL_ALANLAR.values(), "Son_Haber", "Haber_Zamani", "Haber_24s"]
+
+
+# --- Ayrıştırıcılar ---
+def sayi(metin):
+    # "1.234,56", "%3,2", "12,5 mn TL" -> float; sayı yoksa None. Virgül
+    # yoksa üçlü nokta grupları binlik ayracıdır: "1.234" -> 1234, "12.5" -> 12.5
+    bulunan = re.search(r"-?[\d.]*\d(?:,\d+)?", metin.replace("\xa0", " "))
+    if not bulunan:
+        return None
+    parca = bulunan.group()
+    if "," in parca or parca.count(".") > 1 or re.fullmatch(r"-?\d{1,3}(?:\.\d{3})+", parca):
+        parca = parca.replace(".", "").replace(",", ".")
+    try:
+        return float(parca)
+    except ValueError:
+        return None
+
+
+def temel_ayristir(icerik, icerik_turu=""):
+    # Etiket / değer çiftleri: tablo satırları (ilk hücre etiket, son hücre
+    # değer) ve dt/dd listeleri. Yalnızca bu öğeler ayrıştırılır.
+    corba = BeautifulSoup(icerik, HTML_AYRISTIRICI, parse_only=SoupStrainer(["tr", "dl"]))
+    ciftler = []
+    for satir in corba.find_all("tr"):
+        hucreler = satir.find_all(["th", "td"])
+        if len(hucreler) >= 2:
+            ciftler.append((hucreler[0].get_text(" ", strip=True), hucreler[-1].get_text(" ", strip=True)))
+    for dt in corba.find_all("dt"):
+        dd = dt.find_next_sibling("dd")
+        if dd is not None:
+            ciftler.append((dt.get_text(" ", strip=True), dd.get_text(" ", strip=True)))
+
+    sonuc = {}
+    for etiket, deger in ciftler:
+        alan = TEMEL_ALANLAR.get(etiket.rstrip(":").strip().lower())
+        if alan and alan not in sonuc:
+            sonuc[alan] = sayi(deger)
+    return sonuc
+
+
+def _zaman(metin):
+    # RSS (RFC 822) ya da ISO tarih -> ISO metin (yerel saat, saat dilimsiz)
+    if not metin:
+        return None
+    try:
+        zaman = email.utils.parsedate_to_datetime(metin)
+    except (TypeError, ValueError):
+        try:
+            zaman = datetime.datetime.fromisoformat(metin.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if zaman.tzinfo is not None:
+        zaman = zaman.astimezone().replace(tzinfo=None)
+    return zaman.isoformat(timespec="seconds")
+
+
+def haber_ayristir(icerik, icerik_turu=""):
+    # RSS / Atom akışı ya da <article> öğeli HTML sayfası -> en yeni başlıklar
+    xml = "xml" in icerik_turu or icerik.lstrip()[:5] in (b"<?xml", b"<rss ", b"<feed")
+    haberler = []
+    if xml:
+        corba = BeautifulSoup(icerik, XML_AYRISTIRICI)
+        for oge in corba.find_all(["item", "entry"]):
+            baslik = oge.find("title")
+            link = oge.find("link")
+            zaman = oge.find(["pubDate", "updated", "published"])
+            haberler.append({
+                "baslik": baslik.get_text(strip=True) if baslik else "",
+                "link": (link.get("href") or link.get_text(strip=True)) if link else "",
+                "zaman": _zaman(zaman.get_text(strip=True) if zaman else None),
+            })
+    else:
+        corba = BeautifulSoup(icerik, HTML_AYRISTIRICI, parse_only=SoupStrainer("article"))
+        for oge in corba.find_all("article"):
+            a = oge.find("a")
+            zaman = oge.find("time")
+            haberler.append({
+                "baslik": (a or oge).get_text(" ", strip=True),
+                "link": a.get("href", "") if a else "",
+                "zaman": _zaman(zaman.get("datetime") or zaman.get_text(strip=True)) if zaman else None,
+            })
+    haberler = [h for h in haberler if h["baslik"]]
+    haberler.sort(key=lambda h: h["zaman"] or "", reverse=True)
+    return haberler[:HABER_SAYISI]
+
+
+class Kaynak:
+    def __init__(self, ad, url, ayristir, tazelik):
+        self.ad = ad                # sonuç sözlüğündeki anahtar
+        self.url = url              # {hisse} yer tutucusu olan adres
+        self.ayristir = ayristir    # ayristir(icerik baytları, Content-Type) -> JSON'a yazılabilir sonuç
+        self.tazelik = tazelik      # saniye; bu süre dolmadan ağa gidilmez
+
+
+def varsayilan_kaynaklar():
+    return [Kaynak("temel", TEMEL_URL, temel_ayristir, TEMEL_TAZELIK),
+            Kaynak("haber", HABER_URL, haber_ayristir, HABER_TAZELIK)]
+
+
+def yeni_oturum(havuz=8, deneme=2):
+    # Bağlantıları yeniden kullanan oturum; 429/5xx yanıtlarında üstel bekleme ile yeniden dener
+    oturum = requests.Session()
+    yeniden = Retry(total=deneme, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=["GET"], respect_retry_after_header=True)
+    uyarlayici = HTTPAdapter(pool_connections=havuz, pool_maxsize=havuz, max_retries=yeniden)
+    oturum.mount("http://", uyarlayici)
+    oturum.mount("https://", uyarlayici)
+    oturum.headers["User-Agent"] = "Mozilla/5.0 (hisse_analiz)"
+    return oturum
+
+
+class Zenginlestirici:
+    def __init__(self, kaynaklar=None, dizin=None, isci_sayisi=4, saniyede=ZENGIN_HIZI, oturum=None):
+        self.kaynaklar = kaynaklar or varsayilan_kaynaklar()
+        self.dizin = dizin = dizin or ZENGIN_DIZINI or os.path.join(varsayilan_depo().dizin, "zengin")
+        self.isci_sayisi = isci_sayisi
+        self.saniyede = saniyede
+        self.oturum = oturum or yeni_oturum(isci_sayisi)
+        os.makedirs(dizin, exist_ok=True)
+
+    # --- Disk önbelleği: adres başına bir JSON dosyası ---
+    def _yol(self, url):
+        return os.path.join(self.dizin, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _oku(self, url):
+        try:
+            with open(self._yol(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _yaz(self, url, kayit):
+        gecici = f"{self._yol(url)}.{os.getpid()}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(kayit, f, ensure_ascii=False)
+        os.replace(gecici, self._yol(url))
+
+    def getir(self, url, ayristir, tazelik):
+        kayit = self._oku(url)
+        simdi = time.time()
+        if kayit is not None and simdi - kayit["zaman"] < tazelik:
+            say("zengin_istek", sonuc="taze")
+            return kayit["sonuc"]
+
+        basliklar = {}
+        if kayit is not None and kayit.get("etag"):
+            basliklar["If-None-Match"] = kayit["etag"]
+        if kayit is not None and kayit.get("son_degisiklik"):
+            basliklar["If-Modified-Since"] = kayit["son_degisiklik"]
+        sunucu_sinirlayici(urlsplit(url).netloc, self.saniyede).bekle()
+        try:
+            yanit = self.oturum.get(url, headers=basliklar, timeout=ZAMAN_ASIMI)
+            if yanit.status_code == 304 and kayit is not None:
+                say("zengin_istek", sonuc="degismedi")
+                kayit["zaman"] = simdi
+                self._yaz(url, kayit)
+                return kayit["sonuc"]
+            yanit.raise_for_status()
+        except requests.RequestException:
+            say("zengin_istek", sonuc="hata")
+            if kayit is not None:
+                return kayit["sonuc"]  # eski sonuç hiç sonuçtan iyidir
+            raise
+
+        say("zengin_istek", sonuc="indirildi")
+        say("zengin_bayt", len(yanit.content))
+        sonuc = ayristir(yanit.content, yanit.headers.get("Content-Type", ""))
+        self._yaz(url, {"url": url, "zaman": simdi, "etag": yanit.headers.get("ETag"),
+                        "son_degisiklik": yanit.headers.get("Last-Modified"), "sonuc": sonuc})
+        return sonuc
+
+    def onbellekten(self, hisse, kaynak_adi):
+        # Ağa gitmeden son kayıtlı sonuç (sayfadaki tekli analiz için); yoksa None
+        for k in self.kaynaklar:
+            if k.ad == kaynak_adi:
+                kayit = self._oku(k.url.format(hisse=hisse))
+                return kayit["sonuc"] if kayit is not None else None
+        return None
+
+    def topla(self, hisseler, ilerleme=None):
+        # Hisse x kaynak işleri havuzda; biten her işte ilerleme(tamam, toplam).
+        # Hisse başına bir satırlık tablo döner (zengin_tablosu).
+        hisseler = list(dict.fromkeys(hisseler))
+        sonuclar = {h: {} for h in hisseler}
+        with asama("zenginlestirme") as bilgi, ThreadPoolExecutor(max_workers=self.isci_sayisi) as havuz:
+            bilgi["hisse"] = len(hisseler)
+            gorevler = {havuz.submit(self.getir, k.url.format(hisse=h), k.ayristir, k.tazelik): (h, k)
+                        for h in hisseler for k in self.kaynaklar}
+            for i, gorev in enumerate(as_completed(gorevler), 1):
+                h, k = gorevler[gorev]
+                try:
+                    sonuclar[h][k.ad] = gorev.result()
+                except Exception as e:
+                    atla(h + ".IS", f"hata: {type(e).__name__}", f"zengin_{k.ad}")
+                if ilerleme:
+                    ilerleme(i, len(gorevler))
+        return zengin_tablosu(sonuclar)
+
+
+def zengin_tablosu(sonuclar, simdi=None):
+    # {hisse: {"temel": {...}, "haber": [...]}} -> ZENGIN_SUTUNLARI tablosu
+    simdi = pd.Timestamp(simdi or datetime.datetime.now())
+    satirlar = []
+    for hisse, s in sonuclar.items():
+        temel = s.get("temel") or {}
+        haberler = s.get("haber") or []
+        zamanlar = pd.to_datetime([h["zaman"] for h in haberler if h["zaman"]])
+        satirlar.append({
+            "Hisse": hisse,
+            **{alan: temel.get(alan) for alan in TEMEL_ALANLAR.values()},
+            "Son_Haber": haberler[0]["baslik"] if haberler else None,
+            "Haber_Zamani": zamanlar.max() if len(zamanlar) else pd.NaT,
+            "Haber_24s": int((zamanlar > simdi - pd.Timedelta(hours=24)).sum()),
+        })
+    tablo = pd.DataFrame(satirlar, columns=ZENGIN_SUTUNLARI)
+    tablo[list(TEMEL_ALANLAR.values())] = tablo[list(TEMEL_ALANLAR.values())].astype("float64")
+    return tablo
+
+
+def zenginlestir(df, zengin, sutunlar=None):
+    # Tarama tablosuna (Hisse sütunu) zenginleştirme sütunlarını ekler; satır sırası korunur
+    if zengin is None or zengin.empty or df.empty:
+        return df
+    sutunlar = [s for s in (sutunlar or ZENGIN_SUTUNLARI) if s != "Hisse" and s not in df.columns]
+    return df.join(zengin.set_index("Hisse")[sutunlar], on="Hisse")
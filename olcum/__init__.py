@@ -0,0 +1 @@
+# Tarama yollarının çevrimdışı ölçümleri: python -m olcum
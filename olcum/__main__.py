@@ -0,0 +1,234 @@
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import platform
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from hisse_analiz import veri, kotasyon
+from hisse_analiz.motor import toplu_gostergeler
+from hisse_analiz.gostergeler import compute_RSI
+from hisse_analiz.geritest import geriye_test
+from hisse_analiz.tarama import otomatik_toplu_tarama, tavan_taramasi, toplu_alim_ve_hedef, fetch_data_all, tarama_indeksi
+from hisse_analiz.sorgu import TaramaIndeksi
+from hisse_analiz.servis import AnlikGoruntu
+from hisse_analiz.arsiv import Arsiv
+from olcum.sentetik import sentetik_panel, panel_saglayici
+
+# --- Tarama ölçümleri ---
+# Ağa çıkmadan çalışır: sentetik panel geçici bir bar deposuna yazılır ve
+# varsayılan sağlayıcı panelden okuyan sahte sağlayıcıyla değiştirilir.
+# Her aşama için en iyi süre (tekrar sayısı kadar) ve tracemalloc ile tepe
+# bellek ölçülür (alt süreçlerin belleği sayılmaz). Sonuçlar temel.json'daki
+# kayıtlı değerlerle karşılaştırılır; tolerans aşılırsa çıkış kodu 1'dir.
+# temel.json ölçümün alındığı makineyi ve parametreleri de tutar; farklı
+# makinede ya da parametrelerle karşılaştırırken uyarı yazılır. Makine ya da
+# parametreler değişince --kaydet eski sonuçları birleştirmez, temeli baştan yazar.
+# arsiv_yaz / arsiv_oku otomatik, tavan ve indeks aşamalarının tablolarını
+# tarama arşivine yazar ve açılıştaki gibi geri yükler (yeniden hesapla karşılaştırma).
+#   python -m olcum                       # varsayılan evrenler, temel ile karşılaştır
+#   python -m olcum --boyutlar 30 500 --tekrar 5
+#   python -m olcum --kaydet              # temel değerleri güncelle
+TEMEL_DOSYASI = os.path.join(os.path.dirname(__file__), "temel.json")
+VARSAYILAN_BOYUTLAR = [30, 500, 2000]  # binlerce sembol için: --boyutlar 5000
+EN_AZ_SURE_FARKI = 0.005   # saniye; daha küçük farklar gürültü sayılır
+EN_AZ_BELLEK_FARKI = 1.0   # MB
+
+
+def olc(fonksiyon, tekrar):
+    sureler = []
+    for _ in range(tekrar):
+        gc.collect()
+        baslangic = time.perf_counter()
+        fonksiyon()
+        sureler.append(time.perf_counter() - baslangic)
+    # Bellek ayrı bir çalıştırmada: tracemalloc süreleri şişirir
+    gc.collect()
+    tracemalloc.start()
+    fonksiyon()
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"sure": min(sureler), "bellek_mb": tepe / 1e6}
+
+
+def asamalar(panel, dizin, isci):
+    tickers = list(panel["Close"].columns)
+    hisseler = [t[:-3] for t in tickers]
+    hisseler_dict = {"SENTETIK": hisseler}
+    yil = veri.periyot_baslangic("1y")
+    tekli = [panel.xs(t, axis=1, level=1) for t in tickers]
+    hazir = {}
+
+    def depo_doldur():
+        # Her tekrar boş bir depoyla başlar; sonraki aşamalar sonuncusunu okur
+        veri.varsayilan_depoyu_ayarla(tempfile.mkdtemp(dir=dizin))
+        veri.depoyu_guncelle(tickers, "1d", min(panel.index[0], yil))
+
+    def panel_oku():
+        hazir["panel"] = veri.toplu_veri(tickers, period="6mo", guncelle=False)
+
+    def gostergeler():
+        toplu_gostergeler(hazir["panel"]["Close"], hazir["panel"]["Volume"])
+
+    def gostergeler_paralel():
+        from hisse_analiz.paralel import paralel_gostergeler
+        paralel_gostergeler(hazir["panel"]["Close"], hazir["panel"]["Volume"], isci)
+
+    def compute_rsi_tekli():
+        # Eski hisse başına yol: her hisse için ayrı tablo ve compute_RSI
+        for data in tekli:
+            compute_RSI(data)
+
+    def geritest():
+        geriye_test(panel["Close"], panel["Volume"])
+
+    def otomatik():
+        hazir["otomatik"] = otomatik_toplu_tarama.__wrapped__(hisseler_dict, guncelle=False)
+
+    def tavan():
+        hazir["tavan"] = tavan_taramasi.__wrapped__(hisseler, guncelle=False)
+
+    def indeks():
+        hazir["indeks"] = TaramaIndeksi(tarama_indeksi.__wrapped__(hisseler_dict, guncelle=False))
+
+    arsiv = Arsiv(os.path.join(dizin, "arsiv"))
+
+    def arsiv_yaz():
+        tablolar = {ad: hazir[ad] for ad in ("otomatik", "tavan", "indeks")}
+        arsiv.kaydet(AnlikGoruntu(datetime.datetime.now(), "olcum", tablolar, {}))
+
+    def arsiv_oku():
+        arsiv.yukle()
+
+    def alim():
+        # Önbellekler boşaltılır; kuyruk güncellemesi sahte sağlayıcıya gider
+        fetch_data_all.onbellek.temizle()
+        kotasyon._onbellek.clear()
+        toplu_alim_ve_hedef(hisseler_dict)
+
+    liste = [("depo_doldur", depo_doldur), ("panel_oku", panel_oku), ("gostergeler", gostergeler)]
+    if isci != 1:
+        liste.append(("gostergeler_paralel", gostergeler_paralel))
+    liste += [("compute_RSI_tekli", compute_rsi_tekli), ("geritest", geritest), ("otomatik", otomatik),
+              ("tavan", tavan), ("indeks", indeks), ("arsiv_yaz", arsiv_yaz), ("arsiv_oku", arsiv_oku),
+              ("alim", alim)]
+    return liste
+
+
+def makine():
+    return {
+        "platform": platform.platform(),
+        "islemci": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def parametreler(args):
+    # Evren anahtarı (boyut x gün) dışında sonuçları etkileyen ayarlar
+    return {"nan": args.nan, "gec_arz": args.gec_arz, "tekrar": args.tekrar, "isci": args.isci}
+
+
+def farklar(kayitli, simdiki):
+    return [f"{k}: {kayitli.get(k)} -> {v}" for k, v in simdiki.items() if kayitli.get(k) != v]
+
+
+def karsilastir(sonuclar, temel, tolerans):
+    satirlar = []
+    for evren, olcumler in sonuclar.items():
+        for asama, o in olcumler.items():
+            t = temel.get(evren, {}).get(asama)
+            durum = "yeni"
+            if t:
+                sure_gerileme = (o["sure"] > t["sure"] * (1 + tolerans)
+                                 and o["sure"] - t["sure"] > EN_AZ_SURE_FARKI)
+                bellek_gerileme = (o["bellek_mb"] > t["bellek_mb"] * (1 + tolerans)
+                                   and o["bellek_mb"] - t["bellek_mb"] > EN_AZ_BELLEK_FARKI)
+                durum = "GERILEME" if sure_gerileme or bellek_gerileme else "tamam"
+            satirlar.append({
+                "evren": evren,
+                "asama": asama,
+                "sure_ms": round(o["sure"] * 1000, 1),
+                "temel_ms": round(t["sure"] * 1000, 1) if t else None,
+                "fark_%": round((o["sure"] / t["sure"] - 1) * 100, 1) if t and t["sure"] else None,
+                "bellek_mb": round(o["bellek_mb"], 1),
+                "temel_mb": round(t["bellek_mb"], 1) if t else None,
+                "durum": durum,
+            })
+    return pd.DataFrame(satirlar)
+
+
+def ana(argv=None):
+    ayristirici = argparse.ArgumentParser(prog="olcum", description="Tarama yollarının çevrimdışı ölçümü")
+    ayristirici.add_argument("--boyutlar", nargs="+", type=int, default=VARSAYILAN_BOYUTLAR, help="Hisse sayıları")
+    ayristirici.add_argument("--gun", type=int, default=260, help="Geçmiş uzunluğu (iş günü)")
+    ayristirici.add_argument("--nan", type=float, default=0.01, help="İşlem görmeyen gün oranı")
+    ayristirici.add_argument("--gec-arz", type=float, default=0.05, help="Geç halka arz edilen hisse oranı")
+    ayristirici.add_argument("--tekrar", type=int, default=3)
+    ayristirici.add_argument("--isci", type=int, default=1, help="1'den farklıysa paralel motor da ölçülür (0: tüm çekirdekler)")
+    ayristirici.add_argument("--asamalar", nargs="+",
+                             help="Yalnızca bu aşamalar (depo_doldur ve panel_oku her zaman, arsiv_* için tablo aşamaları da çalışır)")
+    ayristirici.add_argument("--temel", default=TEMEL_DOSYASI)
+    ayristirici.add_argument("--tolerans", type=float, default=0.30, help="İzin verilen göreli artış")
+    ayristirici.add_argument("--kaydet", action="store_true", help="Sonuçları temel olarak kaydet")
+    args = ayristirici.parse_args(argv)
+
+    kayit = {"makine": {}, "parametreler": {}, "sonuclar": {}}
+    if os.path.exists(args.temel):
+        with open(args.temel, encoding="utf-8") as f:
+            kayit.update(json.load(f))
+    if kayit["sonuclar"]:
+        for ne, fark in (("makinede", farklar(kayit["makine"], makine())),
+                         ("parametrelerle", farklar(kayit["parametreler"], parametreler(args)))):
+            if fark:
+                print(f"Uyarı: temel farklı {ne} alınmış ({'; '.join(fark)})", file=sys.stderr)
+
+    her_zaman = {"depo_doldur", "panel_oku"}
+    if args.asamalar and any(a.startswith("arsiv_") for a in args.asamalar):
+        her_zaman |= {"otomatik", "tavan", "indeks"}
+    sonuclar = {}
+    dizin = tempfile.mkdtemp(prefix="hisse_olcum_")
+    try:
+        for boyut in args.boyutlar:
+            evren = f"{boyut}x{args.gun}"
+            panel = sentetik_panel(boyut, args.gun, args.nan, args.gec_arz)
+            veri.varsayilan_saglayiciyi_ayarla(panel_saglayici(panel), sunucu="sentetik", saniyede=None)
+            sonuclar[evren] = {}
+            for ad, fonksiyon in asamalar(panel, dizin, args.isci or None):
+                if args.asamalar and ad not in her_zaman and ad not in args.asamalar:
+                    continue
+                sonuclar[evren][ad] = olc(fonksiyon, 1 if ad == "depo_doldur" else args.tekrar)
+                print(f"{evren:>10} {ad:<20} {sonuclar[evren][ad]['sure'] * 1000:10.1f} ms", file=sys.stderr)
+    finally:
+        veri.varsayilan_saglayiciyi_ayarla(None)
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    tablo = karsilastir(sonuclar, kayit["sonuclar"], args.tolerans)
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(tablo.to_string(index=False))
+
+    if args.kaydet:
+        if farklar(kayit["parametreler"], parametreler(args)) or farklar(kayit["makine"], makine()):
+            kayit["sonuclar"] = {}
+        kayit["makine"] = makine()
+        kayit["parametreler"] = parametreler(args)
+        for evren, olcumler in sonuclar.items():
+            kayit["sonuclar"].setdefault(evren, {}).update(olcumler)
+        with open(args.temel, "w", encoding="utf-8") as f:
+            json.dump(kayit, f, indent=2, ensure_ascii=False)
+        print(f"Temel değerler kaydedildi: {args.temel}")
+        return 0
+    return 1 if (tablo["durum"] == "GERILEME").any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(ana())
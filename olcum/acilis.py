@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+
+# --- Sayfa açılış süresi ölçümü ---
+# Soğuk açılışta (boş depo, boş önbellekler) sayfanın ilk çizimi, ardından
+# tekli analiz ("Analiz Et") ve toplu bölümlerin tamamen dolması ölçülür.
+# Uygulama streamlit AppTest ile alt süreçte çalışır; sağlayıcı sentetik
+# panelden okur ve her isteğe ağ süresi yerine sabit + hisse başına gecikme
+# ekler. Hız sınırı gerçek sağlayıcınınkiyle aynıdır (saniyede 2 istek).
+# Tekli analizin kotasyon sorgusu (hedef_analizi) gerçek sağlayıcıya gider;
+# ağ yoksa hemen hata döner ve ölçülen süre yalnızca bar indirmesidir.
+#   python -m olcum.acilis
+#   python -m olcum.acilis --gecikme 1 --tekrar 3
+#   python -m olcum.acilis --uygulama /baska/agac/app.py   # eski sürümle karşılaştırma
+UYGULAMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+ZAMAN_ASIMI = 1800  # saniye, tek bir sayfa çalıştırması için
+
+
+def _gecikmeli(saglayici, gecikme, hisse_basina):
+    def sarmalayici(tickers, start, end, interval):
+        time.sleep(gecikme + hisse_basina * len(tickers))
+        return saglayici(tickers, start, end, interval)
+    return sarmalayici
+
+
+def _toplu_hazir(at):
+    # Otomatik tarama ve sorgu indeksi çizildi, bekleme mesajı kalmadı
+    yazilar = [c.value for c in at.caption]
+    bekleyen = [i.value for i in at.info if "indiriliyor" in i.value or "çalışıyor" in i.value]
+    return (any(y.startswith("Son güncelleme") for y in yazilar) and any("eşleşti" in y for y in yazilar)
+            and not bekleyen)
+
+
+def alt_surec(args):
+    from streamlit.testing.v1 import AppTest
+    from hisse_analiz import veri
+    from hisse_analiz.listeler import evren
+    from olcum.sentetik import sentetik_panel, panel_saglayici
+
+    panel = sentetik_panel(len(evren.birlesim()), args.gun)
+    veri.varsayilan_depoyu_ayarla(os.path.join(args.dizin, "veri"))
+    veri.varsayilan_saglayiciyi_ayarla(_gecikmeli(panel_saglayici(panel), args.gecikme, args.hisse_basina),
+                                       sunucu="sentetik", saniyede=args.saniyede)
+
+    baslangic = time.perf_counter()
+    at = AppTest.from_file(args.uygulama, default_timeout=ZAMAN_ASIMI)
+    at.run()
+    ilk_cizim = time.perf_counter() - baslangic
+
+    [h for h in at.text_input if h.label == "Hisse Kodu"][0].set_value(args.hisse)
+    [b for b in at.button if b.label == "Analiz Et"][0].click()
+    t = time.perf_counter()
+    at.run()
+    tekli = time.perf_counter() - t
+    hatalar = [e.value for e in at.error]
+
+    while not _toplu_hazir(at):
+        if time.perf_counter() - baslangic > ZAMAN_ASIMI:
+            raise SystemExit("Toplu bölümler zaman aşımına kadar dolmadı")
+        time.sleep(0.5)
+        at.run()
+    print(json.dumps({"ilk_cizim_sn": ilk_cizim, "tekli_analiz_sn": tekli,
+                      "toplu_hazir_sn": time.perf_counter() - baslangic,
+                      "tekli_hata": hatalar[0] if hatalar else "",
+                      "hata": [e.value for e in at.exception]}, ensure_ascii=False))
+
+
+def ana(argv=None):
+    ayristirici = argparse.ArgumentParser(prog="olcum.acilis", description="Sayfanın soğuk açılış süreleri")
+    ayristirici.add_argument("--uygulama", default=UYGULAMA, help="Ölçülecek app.py")
+    ayristirici.add_argument("--hisse", default="EREGL", help="Tekli analizde kullanılan hisse")
+    ayristirici.add_argument("--gun", type=int, default=260, help="Sentetik geçmiş uzunluğu (iş günü)")
+    ayristirici.add_argument("--gecikme", type=float, default=0.5, help="İstek başına gecikme (saniye)")
+    ayristirici.add_argument("--hisse-basina", type=float, default=0.01, help="İstekteki hisse başına ek gecikme")
+    ayristirici.add_argument("--saniyede", type=float, default=2.0, help="Sağlayıcı hız sınırı (istek/saniye)")
+    ayristirici.add_argument("--tekrar", type=int, default=1)
+    ayristirici.add_argument("--alt", action="store_true", help=argparse.SUPPRESS)
+    ayristirici.add_argument("--dizin", help=argparse.SUPPRESS)
+    args = ayristirici.parse_args(argv)
+    if args.alt:
+        return alt_surec(args)
+
+    # hisse_analiz ölçülen uygulamanın ağacından gelir (eski sürüm karşılaştırması)
+    yol = os.pathsep.join([os.path.dirname(os.path.abspath(args.uygulama)),
+                           os.path.dirname(os.path.dirname(os.path.abspath(__file__)))])
+    satirlar = []
+    for i in range(args.tekrar):
+        # Her tekrar boş depo ve yeni süreçle (soğuk açılış); favori dosyası da geçici dizine yazılır
+        dizin = tempfile.mkdtemp(prefix="hisse_acilis_")
+        try:
+            komut = [sys.executable, "-m", "olcum.acilis", "--alt", "--dizin", dizin,
+                     "--uygulama", os.path.abspath(args.uygulama), "--hisse", args.hisse, "--gun", str(args.gun),
+                     "--gecikme", str(args.gecikme), "--hisse-basina", str(args.hisse_basina),
+                     "--saniyede", str(args.saniyede)]
+            cikti = subprocess.run(komut, cwd=dizin, capture_output=True, text=True, check=True,
+                                   env={**os.environ, "PYTHONPATH": yol})
+            o = json.loads(cikti.stdout.strip().splitlines()[-1])
+        finally:
+            shutil.rmtree(dizin, ignore_errors=True)
+        satirlar.append({"tekrar": i + 1, **{k: round(v, 2) for k, v in o.items() if k.endswith("_sn")},
+                         "tekli_hata": o["tekli_hata"][:60], "hata": len(o["hata"])})
+    print(pd.DataFrame(satirlar).to_string(index=False))
+
+
+if __name__ == "__main__":
+    sys.exit(ana())
@@ -0,0 +1,110 @@
+import gc
+import sys
+import json
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+
+import pandas as pd
+
+from hisse_analiz import veri
+from olcum.sentetik import sentetik_panel, sentetik_hisseler, panel_saglayici
+
+# --- Bellek (tepe RSS) ölçümü ---
+# tracemalloc NumPy/pandas tamponlarının hepsini görmez; burada her aşama
+# temiz bir alt süreçte çalıştırılır ve işletim sisteminin bildirdiği tepe
+# RSS okunur. Sentetik panel önce geçici bir depoya yazılır;
+# alt süreçler yalnızca depodan okur.
+#   python -m olcum.bellek                     # 500 hisse, tüm aşamalar
+#   python -m olcum.bellek --boyut 2000 --asamalar panel_tam panel_yalin
+ASAMALAR = ["panel_tam", "panel_yalin", "otomatik", "tavan"]
+
+
+def _durum_mb(alan):
+    # /proc/self/status: VmRSS (şimdiki), VmHWM (tepe); Linux dışında ru_maxrss
+    try:
+        with open("/proc/self/status") as f:
+            for satir in f:
+                if satir.startswith(alan + ":"):
+                    return int(satir.split()[1]) / 1e3
+    except OSError:
+        pass
+    tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return tepe / (1e6 if sys.platform == "darwin" else 1e3)
+
+
+def _tepeyi_sifirla():
+    # İçe aktarmaların tepe değeri aşamaya sayılmasın (Linux: clear_refs 5)
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def alt_surec(asama, dizin, boyut):
+    from hisse_analiz.motor import toplu_gostergeler
+    from hisse_analiz.tarama import otomatik_toplu_tarama, tavan_taramasi
+
+    veri.varsayilan_depoyu_ayarla(dizin)
+    hisseler = sentetik_hisseler(boyut)
+    tickers = [h + ".IS" for h in hisseler]
+
+    def panel_tam():
+        # Tüm OHLCV alanları float64 panelde, göstergeler
+        panel = veri.toplu_veri(tickers, period="6mo", guncelle=False)
+        return toplu_gostergeler(panel["Close"], panel["Volume"])
+
+    def panel_yalin():
+        # Taramaların yolu: yalnızca Close (float32) ve Volume
+        panel = veri.toplu_veri(tickers, period="6mo", guncelle=False,
+                                alanlar=veri.TARAMA_ALANLARI, tipler=veri.TARAMA_TIPLERI)
+        return toplu_gostergeler(panel["Close"], panel["Volume"])
+
+    islemler = {
+        "panel_tam": panel_tam,
+        "panel_yalin": panel_yalin,
+        "otomatik": lambda: otomatik_toplu_tarama.__wrapped__({"SENTETIK": hisseler}, guncelle=False),
+        "tavan": lambda: tavan_taramasi.__wrapped__(hisseler, guncelle=False),
+    }
+    gc.collect()
+    _tepeyi_sifirla()
+    once = _durum_mb("VmRSS")
+    sonuc = islemler[asama]()
+    print(json.dumps({"once_mb": once, "tepe_mb": _durum_mb("VmHWM"), "satir": len(sonuc)}))
+
+
+def ana(argv=None):
+    ayristirici = argparse.ArgumentParser(prog="olcum.bellek", description="Tarama aşamalarının tepe RSS ölçümü")
+    ayristirici.add_argument("--boyut", type=int, default=500, help="Hisse sayısı")
+    ayristirici.add_argument("--gun", type=int, default=260, help="Geçmiş uzunluğu (iş günü)")
+    ayristirici.add_argument("--asamalar", nargs="+", default=ASAMALAR, choices=ASAMALAR)
+    ayristirici.add_argument("--alt", help=argparse.SUPPRESS)
+    ayristirici.add_argument("--dizin", help=argparse.SUPPRESS)
+    args = ayristirici.parse_args(argv)
+    if args.alt:
+        return alt_surec(args.alt, args.dizin, args.boyut)
+
+    dizin = tempfile.mkdtemp(prefix="hisse_bellek_")
+    try:
+        panel = sentetik_panel(args.boyut, args.gun)
+        veri.depoyu_guncelle(list(panel["Close"].columns), "1d", panel.index[0], saglayici=panel_saglayici(panel),
+                             depo=veri.BarDeposu(dizin))
+        del panel
+        satirlar = []
+        for asama in args.asamalar:
+            cikti = subprocess.run([sys.executable, "-m", "olcum.bellek", "--alt", asama, "--dizin", dizin,
+                                    "--boyut", str(args.boyut)], capture_output=True, text=True, check=True)
+            o = json.loads(cikti.stdout.strip().splitlines()[-1])
+            satirlar.append({"evren": f"{args.boyut}x{args.gun}", "asama": asama,
+                             "once_mb": round(o["once_mb"], 1), "tepe_mb": round(o["tepe_mb"], 1),
+                             "artis_mb": round(o["tepe_mb"] - o["once_mb"], 1)})
+        print(pd.DataFrame(satirlar).to_string(index=False))
+    finally:
+        shutil.rmtree(dizin, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(ana())
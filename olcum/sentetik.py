@@ -0,0 +1,57 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+from hisse_analiz.depo import ALANLAR
+from hisse_analiz.listeler import evren
+
+# --- Sentetik piyasa verisi ---
+# yf.download ile aynı (Price, Ticker) MultiIndex biçiminde OHLCV paneli.
+# İlk semboller gerçek BIST adlarıdır (30 hisselik evren BIST30'a karşılık
+# gelir), gerisi S0001, S0002 ... diye uydurulur. Günlük getiriler ±%10
+# taban/tavan sınırıyla kırpılır; seyrek NaN hücreleri ve geç halka arz
+# (ilk barları boş sütunlar) eklenebilir.
+
+
+def sentetik_hisseler(hisse_sayisi):
+    gercek = evren.birlesim()[:hisse_sayisi]
+    return gercek + [f"S{i:04d}" for i in range(1, hisse_sayisi - len(gercek) + 1)]
+
+
+def sentetik_panel(hisse_sayisi=500, gun=260, nan_orani=0.01, gec_arz_orani=0.05, bitis=None, tohum=0):
+    rng = np.random.default_rng(tohum)
+    bitis = pd.Timestamp(bitis or datetime.date.today()).normalize()
+    tarihler = pd.bdate_range(end=bitis, periods=gun)
+    tickers = [h + ".IS" for h in sentetik_hisseler(hisse_sayisi)]
+    T, N = gun, hisse_sayisi
+
+    getiri = np.clip(rng.normal(0.0005, 0.025, (T, N)), -0.10, 0.10)
+    close = rng.uniform(5, 300, N) * np.cumprod(1 + getiri, axis=0)
+    onceki = np.vstack([close[:1], close[:-1]])
+    acilis = onceki * (1 + rng.normal(0, 0.005, (T, N)))
+    high = np.maximum(acilis, close) * (1 + np.abs(rng.normal(0, 0.01, (T, N))))
+    low = np.minimum(acilis, close) * (1 - np.abs(rng.normal(0, 0.01, (T, N))))
+    hacim = np.round(rng.lognormal(13, 1, (T, N)))
+
+    # İşlem görmeyen günler (tüm alanlar NaN) ve geç halka arzlar
+    bos = rng.random((T, N)) < nan_orani
+    gec = rng.random(N) < gec_arz_orani
+    bos[:, gec] |= np.arange(T)[:, None] < rng.integers(1, T, gec.sum())
+    alanlar = {"Open": acilis, "High": high, "Low": low, "Close": close, "Volume": hacim}
+    for dizi in alanlar.values():
+        dizi[bos] = np.nan
+
+    sutunlar = pd.MultiIndex.from_product([ALANLAR, tickers], names=["Price", "Ticker"])
+    return pd.DataFrame(np.hstack([alanlar[a] for a in ALANLAR]), index=tarihler, columns=sutunlar)
+
+
+def panel_saglayici(panel):
+    # veri.yf_saglayici yerine: istenen hisse ve tarihleri panelden keser
+    def saglayici(tickers, start, end, interval):
+        mevcut = [t for t in tickers if t in panel.columns.get_level_values(1)]
+        satirlar = panel.index >= pd.Timestamp(start) if start is not None else slice(None)
+        data = panel.loc[satirlar, (slice(None), mevcut)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        return data
+    return saglayici
@@ -0,0 +1,51 @@
+import pytest
+
+from hisse_analiz import veri
+from hisse_analiz.depo import BarDeposu
+from hisse_analiz.zamanlayici import IndirmeZamanlayici
+from olcum.sentetik import sentetik_panel, panel_saglayici
+
+# --- Ortak fikstürler ---
+# Testler ağa çıkmaz: sağlayıcı sentetik panelden okur ve her çağrıyı
+# (hisseler, başlangıç, bitiş, aralık) olarak kaydeder. Hız sınırı yoktur.
+
+
+class KayitliSaglayici:
+    def __init__(self, panel):
+        self.panel = panel
+        self._saglayici = panel_saglayici(panel)
+        self.cagrilar = []
+
+    def __call__(self, tickers, start, end, interval):
+        self.cagrilar.append((list(tickers), start, end, interval))
+        return self._saglayici(tickers, start, end, interval)
+
+
+@pytest.fixture
+def panel():
+    return sentetik_panel(12, 120, nan_orani=0.02, gec_arz_orani=0.2)
+
+
+@pytest.fixture
+def saglayici(panel):
+    return KayitliSaglayici(panel)
+
+
+@pytest.fixture
+def zamanlayici(saglayici):
+    return IndirmeZamanlayici(saglayici, parca_boyutu=5, sunucu="test", saniyede=None, bekleme=0)
+
+
+@pytest.fixture
+def depo(tmp_path):
+    return BarDeposu(str(tmp_path / "veri"))
+
+
+@pytest.fixture
+def varsayilanlar(depo, saglayici):
+    # toplu_veri gibi zamanlayıcı almayan yollar için varsayılan depo ve sağlayıcı
+    veri.varsayilan_depoyu_ayarla(depo.dizin)
+    veri.varsayilan_saglayiciyi_ayarla(saglayici, sunucu="test", saniyede=None, bekleme=0)
+    yield veri.varsayilan_depo()
+    veri.varsayilan_saglayiciyi_ayarla(None)
+    veri._varsayilan_depo = None
@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisse_analiz.akis import GostergeDurumu, KayanToplam, ESITLEME_ARALIGI, panelden_durumlar
+from hisse_analiz.motor import toplu_gostergeler, GOSTERGE_SUTUNLARI
+
+BAR = 700
+
+
+def _seriler(tohum=0):
+    # Üç hisse: boşluklu, düz dönemli (kayıpsız / değişimsiz pencereler) ve
+    # büyük fiyatlı (kayan toplam artığı) seriler
+    rng = np.random.default_rng(tohum)
+    tarihler = pd.bdate_range("2022-01-03", periods=BAR)
+    close = pd.DataFrame({
+        "BOSLUK.IS": 50 * np.cumprod(1 + rng.normal(0, 0.02, BAR)),
+        "DUZ.IS": 20 * np.cumprod(1 + rng.normal(0, 0.02, BAR)),
+        "BUYUK.IS": 1e6 + np.cumsum(rng.normal(0, 0.5, BAR)),
+    }, index=tarihler)
+    volume = pd.DataFrame(np.round(rng.lognormal(12, 1, (BAR, 3))), index=tarihler, columns=close.columns)
+
+    bosluk = rng.random(BAR) < 0.05
+    close.loc[bosluk, "BOSLUK.IS"] = np.nan
+    volume.loc[rng.random(BAR) < 0.03, "BOSLUK.IS"] = np.nan   # yalnızca hacmi eksik barlar
+    close.iloc[100:130, 1] = close.iloc[99, 1]                  # değişimsiz: RSI NaN, 2. seviye atlanır
+    close.iloc[300:330, 1] = close.iloc[299, 1] + np.arange(1, 31) * 0.1  # kayıpsız: RSI 100
+    close.iloc[500:510, 1] = np.nan                              # uzun boşluk
+    return close, volume
+
+
+def _karsilastir(durum_degerleri, motor_satiri):
+    for ad in GOSTERGE_SUTUNLARI:
+        a, b = durum_degerleri[ad], float(motor_satiri[ad])
+        if math.isnan(b):
+            assert math.isnan(a), ad
+        else:
+            assert a == pytest.approx(b, rel=1e-7, abs=1e-7), ad
+
+
+def test_artimli_durum_toplu_motorla_ayni():
+    close, volume = _seriler()
+    durumlar = {t: GostergeDurumu() for t in close.columns}
+    kontrol = set(range(0, BAR, 5)) | set(range(BAR - 20, BAR))
+    for i in range(BAR):
+        degerler = {t: d.ekle(close[t].iloc[i], volume[t].iloc[i]) for t, d in durumlar.items()}
+        if i in kontrol:
+            motor = toplu_gostergeler(close.iloc[:i + 1], volume.iloc[:i + 1])
+            for t in close.columns:
+                _karsilastir(degerler[t], motor.loc[t])
+
+
+def test_panelden_isitilan_durum_toplu_motorla_ayni():
+    close, volume = _seriler(1)
+    motor = toplu_gostergeler(close, volume)
+    for t, durum in panelden_durumlar(close, volume).items():
+        _karsilastir(durum.degerler(), motor.loc[t])
+
+
+def test_kapanmamis_bar_kalici_durumu_degistirmez():
+    close, volume = _seriler(2)
+    t = "BOSLUK.IS"
+    durum = GostergeDurumu.gecmisten(pd.DataFrame({"Close": close[t].iloc[:-1], "Volume": volume[t].iloc[:-1]}))
+    once = durum.degerler()
+
+    # Aynı gün içi bar birkaç kez revize edilir; her sonuç yalnızca son revizyonu içerir
+    son_close, son_hacim = close[t].iloc[-1], volume[t].iloc[-1]
+    durum.ekle(son_close * 1.05, son_hacim / 2, kesin=False)
+    gecici = durum.ekle(son_close, son_hacim, kesin=False)
+    motor = toplu_gostergeler(close[[t]], volume[[t]]).loc[t]
+    _karsilastir(gecici, motor)
+
+    # Bar kapanınca (kesin) aynı sonuç kalıcı olur; öncesinde kalıcı durum değişmemişti
+    assert durum.kopya().degerler() == once
+    _karsilastir(durum.ekle(son_close, son_hacim), motor)
+    _karsilastir(durum.degerler(), motor)
+
+
+def test_kayan_toplam_periyodik_esitleme():
+    # Her ESITLEME_ARALIGI güncellemede toplam pencerenin tam (fsum) toplamına eşitlenir
+    rng = np.random.default_rng(3)
+    pencere = KayanToplam(50)
+    for i, x in enumerate(1e8 + rng.normal(0, 1e-3, 3 * ESITLEME_ARALIGI), start=1):
+        pencere.ekle(float(x))
+        if i % ESITLEME_ARALIGI == 0:
+            assert pencere.toplam == math.fsum(pencere.degerler)
+    assert pencere.toplam == pytest.approx(math.fsum(pencere.degerler), rel=1e-12)
+
+
+def test_kayipsiz_pencerede_sifir_sayaci():
+    # Kayıp penceresi kayan nokta artığı bıraksa da tamamen sıfırsa RSI tam 100'dür
+    durum = GostergeDurumu()
+    for close in [10.1, 10.3, 9.7, 10.05] + [10.05 + 0.01 * i for i in range(1, 20)]:
+        durum.ekle(close, 1000.0)
+    assert durum.degerler()["RSI14"] == 100.0
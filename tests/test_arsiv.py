@@ -0,0 +1,99 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from hisse_analiz import arsiv, zenginlestirme
+from hisse_analiz.arsiv import Arsiv
+from hisse_analiz.servis import AnlikGoruntu
+from hisse_analiz.sorgu import TaramaIndeksi
+from hisse_analiz.zenginlestirme import Zenginlestirici
+
+
+def test_dizinler_varsayilan_depoyla_tasinir(varsayilanlar, monkeypatch, tmp_path):
+    # --depo yalnızca bar deposunu değil arşiv ve zenginleştirme önbelleğini de taşır
+    monkeypatch.setattr(arsiv, "ARSIV_DIZINI", None)
+    monkeypatch.setattr(zenginlestirme, "ZENGIN_DIZINI", None)
+    assert Arsiv().dizin.startswith(varsayilanlar.dizin)
+    assert Zenginlestirici(kaynaklar=[]).dizin.startswith(varsayilanlar.dizin)
+
+    # Açık dizin ve ortam değişkeni önceliklidir
+    assert Arsiv(str(tmp_path / "a")).dizin == str(tmp_path / "a")
+    monkeypatch.setattr(arsiv, "ARSIV_DIZINI", str(tmp_path / "ortam"))
+    assert Arsiv().dizin == str(tmp_path / "ortam")
+
+
+def _tablo(rsi, hisseler=("AAA", "BBB", "CCC")):
+    return pd.DataFrame({"Hisse": list(hisseler), "RSI14": rsi,
+                         "MA20_R": [1.0] * len(hisseler), "MA50_R": [2.0] * len(hisseler)})
+
+
+def _anlik(zaman, surum, rsi):
+    return AnlikGoruntu(zaman, surum, {"indeks": TaramaIndeksi(_tablo(rsi)), "otomatik": _tablo(rsi)},
+                        {"AAA.IS": ("tamam", "")})
+
+
+def test_her_goruntu_ayri_saklanir_son_isaretcisi_ilerler(tmp_path):
+    a = Arsiv(str(tmp_path))
+    sabah = datetime.datetime(2024, 6, 14, 10, 0)
+    ilk = a.kaydet(_anlik(sabah, "s1", [20.0, 50.0, 60.0]))
+    ikinci = a.kaydet(_anlik(sabah.replace(hour=15), "s2", [50.0, 25.0, 60.0]))
+    assert a.goruntuler() == [ilk, ikinci] and ilk.startswith("2024-06-14/")
+    assert a.gunler() == ["2024-06-14"]
+    assert a.son() == ikinci
+
+    # Aynı gündeki önceki görüntü üzerine yazılmaz
+    eski = a.yukle(ilk)
+    assert eski.surum == "s1" and eski.zaman == sabah
+    assert list(eski.tablolar["otomatik"]["RSI14"]) == [20.0, 50.0, 60.0]
+    son = a.yukle()
+    assert son.surum == "s2" and isinstance(son.tablolar["indeks"], TaramaIndeksi)
+    assert son.durumlar == {"AAA.IS": ("tamam", "")}
+
+    # Tek tablolu görüntü SON'u değiştirmez; gün görünümü her tablonun en yenisidir
+    alim = a.tablo_kaydet("alim", _tablo([1.0, 2.0, 3.0]), sabah.replace(hour=16))
+    assert a.son() == ikinci and "alim" not in a.yukle().tablolar
+    gun = a.yukle("2024-06-14")
+    assert sorted(gun.tablolar) == ["alim", "indeks", "otomatik"]
+    assert gun.surum == "s2"   # sürümsüz alim tablosu ortak sürümü bozmaz
+    assert list(gun.tablolar["otomatik"]["RSI14"]) == [50.0, 25.0, 60.0]
+    assert a.goruntuler("2024-06-14")[-1] == alim
+
+
+def test_yarim_goruntu_ve_isaretcisiz_arsiv(tmp_path):
+    a = Arsiv(str(tmp_path))
+    assert a.yukle() is None and a.son() is None
+    kimlik = a.tablo_kaydet("alim", _tablo([1.0, 2.0, 3.0]), datetime.datetime(2024, 6, 14, 9))
+    (tmp_path / "2024-06-14" / "235959-000000_x.1.tmp").mkdir()
+    assert a.goruntuler() == [kimlik]
+    # SON yoksa en yeni görüntü okunur
+    assert "alim" in a.yukle().tablolar
+
+
+def test_gun_farki(tmp_path):
+    a = Arsiv(str(tmp_path))
+    a.kaydet(_anlik(datetime.datetime(2024, 6, 13, 18), "s1", [20.0, 50.0, 60.0]))
+    a.kaydet(_anlik(datetime.datetime(2024, 6, 14, 10), "s2", [50.0, 50.0, 25.0]))
+    a.kaydet(_anlik(datetime.datetime(2024, 6, 14, 18), "s3", [50.0, 25.0, 60.0]))
+    gun, onceki, girenler, cikanlar = a.gun_farki("RSI14 < 30")
+    assert (gun, onceki) == ("2024-06-14", "2024-06-13")
+    assert list(girenler["Hisse"]) == ["BBB"] and list(cikanlar["Hisse"]) == ["AAA"]
+
+    # Gün içindeki bir görüntü de önceki günle karşılaştırılabilir
+    sabah = a.goruntuler("2024-06-14")[0]
+    _, onceki, girenler, _ = a.gun_farki("RSI14 < 30", sabah)
+    assert onceki == "2024-06-13" and list(girenler["Hisse"]) == ["CCC"]
+
+
+def test_gun_farki_eksik_sutunu_tablo_adiyla_bildirir(tmp_path):
+    a = Arsiv(str(tmp_path))
+    for gun in (13, 14):
+        otomatik = _tablo([20.0, 50.0, 60.0]).rename(columns={"MA20_R": "MA20", "MA50_R": "MA50"})
+        a.kaydet(AnlikGoruntu(datetime.datetime(2024, 6, gun, 18), "s", {"otomatik": otomatik}, {}))
+    with pytest.raises(ValueError, match=r"'otomatik' tablosunda .*MA20_R, MA50_R"):
+        a.gun_farki(tablo="otomatik")
+    # Takma adlar ve büyük/küçük harf çözülür; boş tabloda da doğrulanır
+    _, _, girenler, cikanlar = a.gun_farki("rsi < 30 or ma20 > ma50", tablo="otomatik")
+    assert girenler.empty and cikanlar.empty
+    with pytest.raises(ValueError, match="Yok"):
+        arsiv.fark(_tablo([1.0, 2.0, 3.0])[:0], _tablo([1.0, 2.0, 3.0])[:0], "Yok > 1")
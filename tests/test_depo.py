@@ -0,0 +1,113 @@
+import pandas as pd
+import pytest
+
+from hisse_analiz import veri
+from hisse_analiz.veri import depoyu_guncelle, toplu_veri, veri_surumu, TARAMA_ALANLARI, TARAMA_TIPLERI
+from hisse_analiz.zamanlayici import IndirmeZamanlayici, TAMAM
+from tests.conftest import KayitliSaglayici
+
+
+def _zamanlayici(saglayici):
+    return IndirmeZamanlayici(saglayici, parca_boyutu=5, sunucu="test", saniyede=None, bekleme=0)
+
+
+def _eski_panel(depo, tickers, baslangic):
+    # toplu_veri'nin hisse başına DataFrame birleştiren önceki hali
+    tablolar = {}
+    for t in tickers:
+        data = depo.oku(t, "1d")
+        data = data[data.index >= baslangic]
+        if not data.empty:
+            tablolar[t] = data
+    panel = pd.concat(tablolar, axis=1, names=["Ticker", "Price"]).swaplevel(axis=1)
+    return panel.sort_index(axis=1)
+
+
+def test_ikinci_calisma_yalnizca_son_bardan_sonrasini_ister(panel, depo):
+    tickers = list(panel["Close"].columns)
+    baslangic = panel.index[0]
+    dun = KayitliSaglayici(panel.iloc[:-5])
+    depoyu_guncelle(tickers, "1d", baslangic, depo=depo, zamanlayici=_zamanlayici(dun))
+    assert all(c[1] == baslangic for c in dun.cagrilar)
+    son_barlar = {t: depo.aralik(t, "1d")[1] for t in tickers if depo.aralik(t, "1d")}
+
+    bugun = KayitliSaglayici(panel)
+    durumlar = depoyu_guncelle(tickers, "1d", baslangic, depo=depo, zamanlayici=_zamanlayici(bugun))
+    assert bugun.cagrilar
+    for istenen, start, _, _ in bugun.cagrilar:
+        # Her istek, içindeki hisselerin depodaki son barından başlar (son bar da yeniden istenir)
+        assert {son_barlar[t].normalize() for t in istenen} == {pd.Timestamp(start)}
+    assert sorted(t for c in bugun.cagrilar for t in c[0]) == sorted(son_barlar)
+    assert all(d == TAMAM for d, _ in durumlar.values())
+
+    for t in son_barlar:
+        beklenen = panel.xs(t, axis=1, level=1).dropna(how="all")
+        pd.testing.assert_frame_equal(depo.oku(t, "1d"), beklenen, check_freq=False, check_names=False)
+
+
+def test_guncel_depo_yeniden_istenmez_surum_degismez(panel, depo):
+    tickers = list(panel["Close"].columns)
+    z = _zamanlayici(KayitliSaglayici(panel))
+    depoyu_guncelle(tickers, "1d", panel.index[0], depo=depo, zamanlayici=z)
+    surum = veri_surumu(tickers, depo=depo)
+
+    # Sağlayıcı aynı son barı döndürür: dosyalar yeniden yazılmaz, sürüm aynı kalır
+    tekrar = KayitliSaglayici(panel)
+    depoyu_guncelle(tickers, "1d", panel.index[0], depo=depo, zamanlayici=_zamanlayici(tekrar))
+    assert tekrar.cagrilar
+    assert veri_surumu(tickers, depo=depo) == surum
+
+
+def test_birlestir_yalnizca_degisiklikte_surum_artirir(panel, depo):
+    t = panel["Close"].columns[0]
+    tablo = panel.xs(t, axis=1, level=1).dropna(how="all")
+
+    assert depo.birlestir(t, "1d", tablo)
+    assert depo.surum(t, "1d") == 1
+    surum = veri_surumu([t], depo=depo)
+
+    assert not depo.birlestir(t, "1d", tablo)
+    assert not depo.birlestir(t, "1d", tablo.tail(3))
+    assert depo.surum(t, "1d") == 1
+    assert veri_surumu([t], depo=depo) == surum
+
+    # Gün içinde güncellenen son bar yeni sürümdür
+    son = tablo.tail(1).copy()
+    son["Close"] *= 1.01
+    assert depo.birlestir(t, "1d", son)
+    assert depo.surum(t, "1d") == 2
+    assert veri_surumu([t], depo=depo) != surum
+    assert depo.oku(t, "1d")["Close"].iloc[-1] == pytest.approx(son["Close"].iloc[0])
+    assert len(depo.oku(t, "1d")) == len(tablo)
+
+
+def test_birlestir_bos_tabloyu_yazmaz(depo):
+    bos = pd.DataFrame(columns=["Close", "Volume"], index=pd.DatetimeIndex([]), dtype="float64")
+    assert not depo.birlestir("YOK.IS", "1d", bos)
+    assert depo.aralik("YOK.IS", "1d") is None
+
+
+def test_panel_eski_birlestirme_yoluyla_ayni(panel, depo):
+    tickers = list(panel["Close"].columns)
+    depoyu_guncelle(tickers, "1d", panel.index[0], depo=depo, zamanlayici=_zamanlayici(KayitliSaglayici(panel)))
+    baslangic = veri.periyot_baslangic("3mo")
+    eski = _eski_panel(depo, tickers, baslangic)
+
+    tam = toplu_veri(tickers, period="3mo", depo=depo, guncelle=False)
+    pd.testing.assert_frame_equal(tam, eski, check_freq=False)
+
+    # float32 Close / float64 Volume paneli: aynı değerler, yalnızca Close tipi farklı
+    yalin = toplu_veri(tickers, period="3mo", depo=depo, guncelle=False,
+                       alanlar=TARAMA_ALANLARI, tipler=TARAMA_TIPLERI)
+    assert yalin["Close"].dtypes.eq("float32").all()
+    assert yalin["Volume"].dtypes.eq("float64").all()
+    beklenen = eski[TARAMA_ALANLARI].astype({c: "float32" for c in eski[["Close"]].columns})
+    pd.testing.assert_frame_equal(yalin, beklenen, check_freq=False)
+
+
+def test_toplu_veri_bos_depoyu_saglayicidan_doldurur(panel, saglayici, varsayilanlar):
+    tickers = list(panel["Close"].columns)
+    data = toplu_veri(tickers, period="1y", alanlar=TARAMA_ALANLARI, tipler=TARAMA_TIPLERI)
+    assert saglayici.cagrilar
+    assert sorted(data["Close"].columns) == sorted(tickers)
+    assert data.index[-1] == panel.index[-1]
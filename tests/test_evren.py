@@ -0,0 +1,18 @@
+from hisse_analiz.evren import EvrenKaydi, HISSE, ENDEKS, FON
+from hisse_analiz.listeler import evren, ENDEKSLER, FONLAR
+
+
+def test_tur_adindan_tahmin_edilmez():
+    # X ile başlayan ama endeks listesinde olmayan kod hissedir
+    kayit = EvrenKaydi().turle(["XU100"], ENDEKS).turle(["GLDTR"], FON)
+    kayit.ekle("liste", ["xu100", "XYZAB", "GLDTR", "AKBNK", "AKBNK "])
+    assert kayit.liste("liste", None) == ["XU100", "XYZAB", "GLDTR", "AKBNK"]
+    assert kayit.liste("liste") == ["XYZAB", "AKBNK"]
+    assert [kayit.tur(s) for s in ("XU100", "XYZAB", "GLDTR")] == [ENDEKS, HISSE, FON]
+
+
+def test_listelerde_endeks_ve_fon_hisse_sayilmaz():
+    hisseler = set(evren.birlesim())
+    assert not hisseler & (set(ENDEKSLER) | set(FONLAR))
+    assert all(evren.tur(s) == ENDEKS for s in ENDEKSLER)
+    assert all(evren.tur(s) == FON for s in FONLAR)
@@ -0,0 +1,219 @@
+import datetime
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisse_analiz.akis import GostergeDurumu
+from hisse_analiz.izleme import IzlemeServisi, AkisKaynagi, SimuleKaynak, alarmlar
+
+# --- Canlı izleme ---
+# Servis, geçmişi elle kurulmuş durumlarla ısıtılır ve tikler AkisKaynagi /
+# SimuleKaynak üzerinden tur() ile işlenir; ağa çıkılmaz.
+GUN1 = datetime.datetime(2024, 1, 2, 10, 30)
+GUN2 = datetime.datetime(2024, 1, 3, 10, 30)
+
+
+def _durum(kapanislar, hacim=1000.0, sinif=GostergeDurumu):
+    return sinif.gecmisten(pd.DataFrame({"Close": np.asarray(kapanislar, dtype=float), "Volume": hacim}))
+
+
+def _servis(durumlar, kaynak=None):
+    kaynak = kaynak or AkisKaynagi()
+    servis = IzlemeServisi(kaynak, gecmis=lambda tickers: {t: durumlar[t] for t in tickers})
+    servis.izle(list(durumlar))
+    return servis, kaynak
+
+
+def _alarm_turleri(anlik):
+    return [a["tur"] for a in anlik.alarmlar]
+
+
+def _deger(rsi=50.0, ma20=10.0, ma50=10.0, tavan=0):
+    return {"RSI14": rsi, "MA20": ma20, "MA50": ma50, "Tavan_Skoru": tavan}
+
+
+class SayanDurum(GostergeDurumu):
+    # ekle() çağrılarını sayar (yeniden hesaplama olup olmadığını görmek için)
+    cagri = 0
+
+    def ekle(self, close, volume, kesin=True):
+        SayanDurum.cagri += 1
+        return super().ekle(close, volume, kesin)
+
+
+class BozukGecmis:
+    # İlk çağrıda hata verir, sonra her hisse için boş durum döndürür
+    def __init__(self):
+        self.cagrilar = []
+
+    def __call__(self, tickers):
+        self.cagrilar.append(list(tickers))
+        if len(self.cagrilar) == 1:
+            raise ConnectionError("geçmiş alınamadı")
+        return {t: GostergeDurumu() for t in tickers}
+
+
+def test_isitma_hatasinda_bekleyenler_korunur():
+    gecmis = BozukGecmis()
+    kaynak = AkisKaynagi()
+    servis = IzlemeServisi(kaynak, gecmis=gecmis)
+    servis.izle(["AAA.IS", "BBB.IS"])
+
+    with pytest.raises(ConnectionError):
+        servis.tur()
+    assert servis.anlik() is None
+
+    # Hata sırasında eklenen hisse de bir sonraki turda ısıtılır
+    servis.izle(["CCC.IS"])
+    kaynak.gonder("AAA.IS", 10.0, 1000.0, datetime.datetime(2024, 1, 2, 10))
+    anlik = servis.tur()
+    assert gecmis.cagrilar[-1] == ["AAA.IS", "BBB.IS", "CCC.IS"]
+    assert sorted(anlik.tablo["Hisse"]) == ["AAA", "BBB", "CCC"]
+
+    # Isınan hisseler yeniden istenmez
+    servis.tur()
+    assert len(gecmis.cagrilar) == 2
+
+
+def test_alarmlar_esik_gecisleri():
+    assert alarmlar(_deger(rsi=35), _deger(rsi=25)) == [("rsi", "RSI 30 altına indi (25.0)")]
+    assert alarmlar(_deger(rsi=25), _deger(rsi=30)) == [("rsi", "RSI 30 üstüne çıktı (30.0)")]
+    assert alarmlar(_deger(rsi=25), _deger(rsi=28)) == []
+    assert [t for t, _ in alarmlar(_deger(ma20=9), _deger(ma20=11))] == ["kesisim"]
+    assert "altın" in alarmlar(_deger(ma20=10), _deger(ma20=11))[0][1]
+    assert "ölüm" in alarmlar(_deger(ma20=11), _deger(ma20=9))[0][1]
+    assert alarmlar(_deger(tavan=45), _deger(tavan=70)) == [("tavan", "Tavan skoru 70 (≥70)")]
+    assert alarmlar(_deger(tavan=70), _deger(tavan=100)) == []
+
+
+def test_alarmlar_nan_degerlerde_sessiz():
+    nan = float("nan")
+    bos = _deger(rsi=nan, ma20=nan, ma50=nan, tavan=nan)
+    assert alarmlar(bos, _deger(rsi=20, ma20=11, tavan=75)) == []
+    assert alarmlar(_deger(rsi=40, ma20=11), bos) == []
+
+
+def test_rsi_alarmi_iki_yonde():
+    # 100..160 yükselen seri: RSI 100. 120'ye düşen tik RSI'yı 30 altına
+    # indirir, aynı gün 160'a dönen tik yeniden üstüne çıkarır.
+    servis, kaynak = _servis({"AAA.IS": _durum(np.arange(100, 161))})
+    kaynak.gonder("AAA.IS", 120.0, 1000.0, GUN1)
+    anlik = servis.tur()
+    assert _alarm_turleri(anlik) == ["rsi"]
+    assert "altına" in anlik.alarmlar[-1]["mesaj"]
+    assert anlik.alarmlar[-1]["Hisse"] == "AAA"
+
+    kaynak.gonder("AAA.IS", 160.0, 2000.0, GUN1.replace(minute=45))
+    anlik = servis.tur()
+    assert _alarm_turleri(anlik) == ["rsi", "rsi"]
+    assert "üstüne" in anlik.alarmlar[-1]["mesaj"]
+    assert anlik.alarmlar[-1]["surum"] == anlik.surum
+
+
+def test_kesisim_alarmlari():
+    # Düz seride MA20 == MA50; yukarı tik altın, aşağı revizyon ölüm kesişimi
+    servis, kaynak = _servis({"AAA.IS": _durum([100.0] * 60)})
+    kaynak.gonder("AAA.IS", 101.0, 1000.0, GUN1)
+    anlik = servis.tur()
+    kesisim = [a["mesaj"] for a in anlik.alarmlar if a["tur"] == "kesisim"]
+    assert len(kesisim) == 1 and "altın" in kesisim[0]
+
+    kaynak.gonder("AAA.IS", 99.0, 1000.0, GUN1.replace(minute=45))
+    anlik = servis.tur()
+    kesisim = [a["mesaj"] for a in anlik.alarmlar if a["tur"] == "kesisim"]
+    assert len(kesisim) == 2 and "ölüm" in kesisim[1]
+    # Önceki RSI NaN'dı (düz seri): ilk tikte RSI alarmı yok
+    assert anlik.alarmlar[0]["tur"] == "kesisim"
+
+
+def test_tavan_alarmi():
+    # Yükselen seride skor 45; %7'yi aşan günlük artış 30 puan ekler
+    servis, kaynak = _servis({"AAA.IS": _durum(np.arange(100, 181))})
+    kaynak.gonder("AAA.IS", 181.0, 1000.0, GUN1)
+    anlik = servis.tur()
+    assert anlik.tablo["Tavan Skoru"].iloc[0] == 45
+    assert anlik.alarmlar == []
+
+    kaynak.gonder("AAA.IS", 195.0, 1000.0, GUN1.replace(minute=45))
+    anlik = servis.tur()
+    assert _alarm_turleri(anlik) == ["tavan"]
+    assert anlik.tablo["Tavan Skoru"].iloc[0] >= 70
+
+
+def test_isinmamis_gostergeler_alarm_uretmez():
+    servis, kaynak = _servis({"AAA.IS": GostergeDurumu(), "BBB.IS": _durum([50.0, 40.0, 60.0])})
+    fiyatlar = [10.0, 30.0, 5.0, 40.0, 2.0, 45.0]
+    for i, fiyat in enumerate(fiyatlar):
+        zaman = GUN1 + datetime.timedelta(days=i)
+        kaynak.gonder("AAA.IS", fiyat, 1000.0, zaman)
+        kaynak.gonder("BBB.IS", fiyat * 3, 1000.0, zaman)
+        anlik = servis.tur()
+    assert anlik.alarmlar == []
+    assert math.isnan(anlik.tablo["RSI14"].iloc[0])
+
+
+def test_degismemis_tik_yeniden_hesaplanmaz():
+    servis, kaynak = _servis({"AAA.IS": _durum(np.arange(100, 161), sinif=SayanDurum)})
+    kaynak.gonder("AAA.IS", 161.0, 1000.0, GUN1)
+    anlik = servis.tur()
+    surum, cagri = anlik.surum, SayanDurum.cagri
+
+    # Aynı tik (farklı zamanla da olsa) ve boş tur yayın yapmaz
+    kaynak.gonder("AAA.IS", 161.0, 1000.0, GUN1.replace(minute=40))
+    assert servis.tur().surum == surum
+    assert servis.tur().surum == surum
+    assert SayanDurum.cagri == cagri
+
+    # Eski günden gelen gecikmiş tik de atlanır
+    kaynak.gonder("AAA.IS", 150.0, 900.0, GUN1 - datetime.timedelta(days=1))
+    assert servis.tur().surum == surum
+
+    kaynak.gonder("AAA.IS", 162.0, 1500.0, GUN1.replace(minute=50))
+    assert servis.tur().surum == surum + 1
+    assert SayanDurum.cagri == cagri + 1
+
+
+def test_gun_degisince_acik_bar_kesinlesir():
+    kapanislar = np.arange(100, 161)
+    servis, kaynak = _servis({"AAA.IS": _durum(kapanislar)})
+    kaynak.gonder("AAA.IS", 158.0, 1000.0, GUN1)
+    servis.tur()
+    kaynak.gonder("AAA.IS", 163.0, 3000.0, GUN1.replace(hour=17))
+    servis.tur()
+    kaynak.gonder("AAA.IS", 170.0, 500.0, GUN2)
+    anlik = servis.tur()
+
+    # Beklenen: dünün son tiki kesin bar, bugünün tiki geçici bar
+    beklenen = _durum(kapanislar)
+    beklenen.ekle(163.0, 3000.0, kesin=True)
+    degerler = beklenen.ekle(170.0, 500.0, kesin=False)
+    satir = anlik.tablo.iloc[0]
+    assert satir["Fiyat"] == round(degerler["Fiyat"], 2)
+    assert satir["RSI14"] == round(degerler["RSI14"], 1)
+    assert satir["MA20"] == round(degerler["MA20"], 2)
+    assert satir["Günlük % Değişim"] == round(degerler["Degisim"], 2)
+    assert satir["Son Tik"] == GUN2
+
+
+def test_simule_kaynak_ile_gun_gecisi():
+    durumlar = {t: _durum(np.linspace(90, 110, 60)) for t in ["AAA.IS", "BBB.IS", "CCC.IS"]}
+    an = [GUN1]
+    kaynak = SimuleKaynak(referans=lambda t: 100.0, oynaklik=0.02, hareket_orani=1.0, tohum=3,
+                          saat=lambda: an[0])
+    servis, _ = _servis(durumlar, kaynak)
+
+    for i in range(30):
+        an[0] = GUN1 + datetime.timedelta(minutes=i)
+        anlik = servis.tur()
+    assert anlik.surum == 30
+    assert anlik.tablo["Fiyat"].between(90, 110).all()
+    kapanis = dict(zip(anlik.tablo["Hisse"], anlik.tablo["Fiyat"]))
+    assert all(d.gun1 == 60 for d in durumlar.values())
+
+    an[0] = GUN2
+    anlik = servis.tur()
+    assert all(d.gun1 == 61 for d in durumlar.values())
+    for hisse, fiyat in zip(anlik.tablo["Hisse"], anlik.tablo["Fiyat"]):
+        assert abs(fiyat / kapanis[hisse] - 1) <= 0.1 + 1e-9
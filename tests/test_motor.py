@@ -0,0 +1,86 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisse_analiz.gostergeler import compute_RSI, tahmini_olasilik, tavan_skoru
+from hisse_analiz.motor import toplu_gostergeler
+from olcum.sentetik import sentetik_panel
+
+# --- Toplu motor / tekli fonksiyonlar eşdeğerliği ---
+# Diğer testler motoru referans alır; burada motorun kendisi taramaların
+# hisse başına kullandığı compute_RSI, rolling ortalamalar, tahmini_olasilik
+# ve tavan_skoru ile sütun sütun karşılaştırılır.
+
+
+def _panel(gun, tohum):
+    panel = sentetik_panel(40, gun, nan_orani=0.05, gec_arz_orani=0.3, tohum=tohum)
+    close, volume = panel["Close"].copy(), panel["Volume"].copy()
+    t = list(close.columns)
+    close.iloc[:-45, 0] = np.nan                  # 50'den az bar
+    close.iloc[:-55, 1] = np.nan                  # 50-60 arası bar
+    close.iloc[:-12, 2] = np.nan                  # RSI için bile yetersiz
+    volume[t[3]] = np.nan                         # hacmi hiç olmayan hisse
+    close.iloc[-30:, 4] = close.iloc[-31, 4]      # düz seyir: kayıpsız/değişimsiz RSI
+    close.iloc[-25:-15, 5] = np.nan               # son barlara yakın uzun boşluk
+    volume.iloc[::7, 6] = np.nan                  # yalnızca hacmi eksik barlar
+    return close, volume
+
+
+def _tekli(close, volume):
+    # Taramaların eski hisse başına yolu
+    d1 = pd.DataFrame({"Close": close, "Volume": volume}).dropna()
+    beklenen = {"Gun1": len(d1)}
+    if len(d1):
+        beklenen["MA20"] = d1["Close"].rolling(20).mean().iloc[-1]
+        beklenen["MA50"] = d1["Close"].rolling(50).mean().iloc[-1]
+    d1["RSI14"] = compute_RSI(d1)
+    d2 = d1.dropna(subset=["RSI14"])
+    beklenen["Gun2"] = len(d2)
+    if len(d2):
+        beklenen.update({
+            "Fiyat": d2["Close"].iloc[-1],
+            "RSI14": d2["RSI14"].iloc[-1],
+            "MA20_R": d2["Close"].rolling(20).mean().iloc[-1],
+            "MA50_R": d2["Close"].rolling(50).mean().iloc[-1],
+            "EMA10": d2["Close"].ewm(span=10, adjust=False).mean().iloc[-1],
+            "Hacim": d2["Volume"].iloc[-1],
+            "Hacim5": d2["Volume"].tail(5).mean(),
+            "Hacim10": d2["Volume"].tail(10).mean(),
+        })
+        p_tahmin, yukselis, _, _, _ = tahmini_olasilik(d2)
+        beklenen.update({"Tahmini_Yuzde": p_tahmin, "Yukselis60": yukselis})
+    skor, degisim, rsi, hacim, ort_hacim = tavan_skoru(pd.DataFrame({"Close": close, "Volume": volume}))
+    beklenen.update({"Tavan_Skoru": skor, "Degisim": degisim})
+    if not np.isnan(degisim):
+        beklenen.update({"RSI14": rsi, "Hacim": hacim, "Hacim10": ort_hacim})
+    return beklenen
+
+
+def _esit(a, b):
+    if pd.isna(b):
+        return pd.isna(a)
+    return a == pytest.approx(b, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("gun, tohum", [(40, 0), (55, 1), (65, 2), (120, 3), (200, 4)])
+def test_toplu_motor_tekli_fonksiyonlarla_ayni(gun, tohum):
+    close, volume = _panel(gun, tohum)
+    motor = toplu_gostergeler(close, volume)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")   # tekli kodun kopya uyarıları
+        for t in close.columns:
+            for sutun, deger in _tekli(close[t], volume[t]).items():
+                assert _esit(motor.at[t, sutun], deger), (t, sutun, motor.at[t, sutun], deger)
+    assert motor.at[close.columns[3], "Gun1"] == 0   # hacimsiz hisse
+
+
+def test_kisa_seriler_varsayilan_degerleri():
+    close, volume = _panel(120, 5)
+    motor = toplu_gostergeler(close, volume)
+    az, orta, cok_az = close.columns[:3]
+    # 50'den az bar: tavan skoru 0, değişim NaN; 60'tan az: tahmin 50
+    assert motor.at[az, "Tavan_Skoru"] == 0 and np.isnan(motor.at[az, "Degisim"])
+    assert motor.at[orta, "Tahmini_Yuzde"] == 50 and not np.isnan(motor.at[orta, "Degisim"])
+    assert motor.at[cok_az, "Gun2"] == 0 and np.isnan(motor.at[cok_az, "RSI14"])
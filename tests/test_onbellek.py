@@ -0,0 +1,232 @@
+import datetime
+import os
+import threading
+import time
+
+import pytest
+
+from hisse_analiz import onbellek
+from hisse_analiz.onbellek import (ISTANBUL, KILIT_ZAMAN_ASIMI, Onbellek, piyasa_acik_mi, sonraki_acilis,
+                                   piyasa_ttl, kapanis_payinda_mi, _boyut)
+
+# --- Önbellek ---
+# Süre testleri modüldeki time'ı elle ilerletilen bir saatle değiştirir.
+CUMA = datetime.date(2024, 1, 5)
+PAZARTESI_ACILIS = datetime.datetime(2024, 1, 8, 10, 0, tzinfo=ISTANBUL)
+
+
+class SahteSaat:
+    def __init__(self, simdi=1_000_000.0):
+        self.simdi = simdi
+
+    def time(self):
+        return self.simdi
+
+    def sleep(self, saniye):
+        self.simdi += saniye
+
+
+@pytest.fixture
+def saat(monkeypatch):
+    s = SahteSaat()
+    monkeypatch.setattr(onbellek, "time", s)
+    return s
+
+
+def _an(gun, saat, dakika=0):
+    return datetime.datetime.combine(gun, datetime.time(saat, dakika), tzinfo=ISTANBUL)
+
+
+def test_ttl_dolunca_kayit_dusulur(saat):
+    o = Onbellek("ttl", ttl=60)
+    o.koy("a", 1)
+    saat.simdi += 59
+    assert o.getir("a") == (True, 1)
+    saat.simdi += 2
+    assert o.getir("a") == (False, None)
+    assert o.istatistik()["kayit"] == 0
+
+
+def test_lru_kayit_siniri():
+    o = Onbellek("lru", max_kayit=2)
+    o.koy("a", 1)
+    o.koy("b", 2)
+    o.getir("a")  # a yeni kullanıldı: ilk çıkan b olur
+    o.koy("c", 3)
+    assert o.getir("b") == (False, None)
+    assert o.getir("a") == (True, 1)
+    assert o.getir("c") == (True, 3)
+    assert o.istatistik()["tahliye"] == 1
+
+
+def test_lru_bayt_siniri():
+    deger = b"x" * 1000
+    o = Onbellek("bayt", max_bayt=2 * _boyut(deger) + 10)
+    for anahtar in "abc":
+        o.koy(anahtar, deger)
+    ist = o.istatistik()
+    assert ist["kayit"] == 2 and ist["tahliye"] == 1
+    assert ist["bayt"] == 2 * _boyut(deger)
+    assert not o.getir("a")[0]
+
+    # Tek başına sınırı aşan değer tutulmaz
+    o.koy("buyuk", b"x" * 5000)
+    assert o.istatistik()["kayit"] == 0 and o.istatistik()["bayt"] == 0
+
+
+def test_sayaclar():
+    o = Onbellek("sayac")
+    assert o.hesapla("a", lambda: 1) == 1
+    assert o.hesapla("a", lambda: 2) == 1
+    o.getir("yok")
+    ist = o.istatistik()
+    assert (ist["isabet"], ist["iska"], ist["disk_isabet"]) == (1, 2, 0)
+
+
+def test_disk_gidis_donus(tmp_path, saat):
+    yazan = Onbellek("disk", ttl=60, disk_dizini=str(tmp_path))
+    yazan.koy("a", {"x": [1, 2]})
+    okuyan = Onbellek("disk", ttl=60, disk_dizini=str(tmp_path))
+    assert okuyan.getir("a") == (True, {"x": [1, 2]})
+    assert okuyan.getir("a") == (True, {"x": [1, 2]})  # artık bellekte
+    ist = okuyan.istatistik()
+    assert (ist["disk_isabet"], ist["isabet"], ist["iska"]) == (1, 1, 0)
+
+    # Süresi dolmuş disk kaydı okunmaz; temizle() diske dokunmaz
+    saat.simdi += 61
+    assert Onbellek("disk", disk_dizini=str(tmp_path)).getir("a") == (False, None)
+    saat.simdi -= 61
+    yazan.temizle()
+    assert yazan.getir("a") == (True, {"x": [1, 2]})
+    assert yazan.istatistik()["disk_isabet"] == 1
+
+
+def test_piyasa_acik_mi():
+    assert piyasa_acik_mi(_an(CUMA, 10))
+    assert piyasa_acik_mi(_an(CUMA, 18, 9))
+    assert not piyasa_acik_mi(_an(CUMA, 9, 59))
+    assert not piyasa_acik_mi(_an(CUMA, 18, 10))
+    assert not piyasa_acik_mi(_an(CUMA + datetime.timedelta(days=1), 12))
+
+
+def test_sonraki_acilis():
+    # Cuma kapanıştan sonra ve cumartesi: pazartesi 10:00
+    assert sonraki_acilis(_an(CUMA, 18, 30)) == PAZARTESI_ACILIS
+    assert sonraki_acilis(_an(CUMA + datetime.timedelta(days=1), 9)) == PAZARTESI_ACILIS
+    assert sonraki_acilis(_an(CUMA + datetime.timedelta(days=2), 23)) == PAZARTESI_ACILIS
+    # Açılıştan önce: aynı gün
+    assert sonraki_acilis(_an(CUMA, 9, 30)) == _an(CUMA, 10)
+    assert sonraki_acilis(_an(CUMA - datetime.timedelta(days=1), 11)) == _an(CUMA, 10)
+
+
+def test_piyasa_ttl_kapanis_payi():
+    ttl = piyasa_ttl(seans_ici=60)
+    assert ttl(_an(CUMA, 12)) == 60
+    # Gecikmeli kapanış barı gelene kadar kısa süre korunur
+    assert kapanis_payinda_mi(_an(CUMA, 18, 20))
+    assert ttl(_an(CUMA, 18, 10)) == 60
+    assert ttl(_an(CUMA, 18, 39)) == 60
+    assert not kapanis_payinda_mi(_an(CUMA + datetime.timedelta(days=1), 18, 20))
+    # Pay bitince bir sonraki açılışa kadar
+    an = _an(CUMA, 18, 40)
+    assert ttl(an) == (PAZARTESI_ACILIS - an).total_seconds()
+    assert ttl(_an(CUMA, 9)) == 3600
+    assert piyasa_ttl(seans_ici=60, seans_disi_en_fazla=600)(an) == 600
+
+
+# --- Tek uçuş (single-flight) ---
+def _bekle(kosul, zaman_asimi=5):
+    bitis = time.monotonic() + zaman_asimi
+    while not kosul():
+        assert time.monotonic() < bitis, "zaman aşımı"
+        time.sleep(0.005)
+
+
+def _is_parcaciklari(sayi, hedef):
+    sonuclar, hatalar = [None] * sayi, [None] * sayi
+
+    def calistir(i):
+        try:
+            sonuclar[i] = hedef(i)
+        except Exception as e:
+            hatalar[i] = e
+
+    parcaciklar = [threading.Thread(target=calistir, args=(i,), daemon=True) for i in range(sayi)]
+    for p in parcaciklar:
+        p.start()
+    return parcaciklar, sonuclar, hatalar
+
+
+def test_eszamanli_istekler_tek_hesapta_birlesir():
+    o = Onbellek("tek")
+    sayi, cagrilar, birak = 8, [], threading.Event()
+
+    def fonksiyon():
+        cagrilar.append(1)
+        birak.wait(5)
+        return "deger"
+
+    parcaciklar, sonuclar, hatalar = _is_parcaciklari(sayi, lambda i: o.hesapla("k", fonksiyon))
+    _bekle(lambda: o.istatistik()["iska"] == sayi)
+    time.sleep(0.05)  # bekleyenler uçuşa bağlansın
+    birak.set()
+    for p in parcaciklar:
+        p.join()
+    assert sonuclar == ["deger"] * sayi and hatalar == [None] * sayi
+    assert len(cagrilar) == 1
+    assert o.istatistik()["birlesen"] == sayi - 1
+
+
+def test_hesaplayan_hata_verirse_bekleyen_dener():
+    o = Onbellek("hata")
+    birak = threading.Event()
+
+    def hatali():
+        birak.wait(5)
+        raise ConnectionError("ağ yok")
+
+    lider, sonuc, hata = _is_parcaciklari(1, lambda i: o.hesapla("k", hatali))
+    _bekle(lambda: o.istatistik()["iska"] == 1)
+    bekleyen, sonuc2, hata2 = _is_parcaciklari(1, lambda i: o.hesapla("k", lambda: "yeniden"))
+    _bekle(lambda: o.istatistik()["iska"] == 2)
+    time.sleep(0.05)
+    birak.set()
+    for p in lider + bekleyen:
+        p.join()
+    assert isinstance(hata[0], ConnectionError)
+    assert sonuc2 == ["yeniden"] and hata2 == [None]
+    assert o.getir("k") == (True, "yeniden")
+    assert o.istatistik()["birlesen"] == 0
+
+
+def test_eski_kilit_dosyasi_kirilir(tmp_path):
+    o = Onbellek("kilit", disk_dizini=str(tmp_path))
+    os.makedirs(o.disk_dizini)
+    kilit = o._disk_yolu("k") + ".kilit"
+    open(kilit, "w").close()
+    eski = time.time() - KILIT_ZAMAN_ASIMI - 10
+    os.utime(kilit, (eski, eski))
+
+    assert o.hesapla("k", lambda: 42) == 42
+    assert not os.path.exists(kilit)
+    assert o.istatistik()["birlesen"] == 0
+
+
+def test_diski_paylasan_surec_sonucu_okur(tmp_path, monkeypatch):
+    monkeypatch.setattr(onbellek, "KILIT_YOKLAMA", 0.01)
+    birinci = Onbellek("paylasim", disk_dizini=str(tmp_path))
+    assert birinci.hesapla("a", lambda: [1, 2, 3]) == [1, 2, 3]
+    ikinci = Onbellek("paylasim", disk_dizini=str(tmp_path))
+    assert ikinci.hesapla("a", lambda: pytest.fail("yeniden hesaplandı")) == [1, 2, 3]
+    assert ikinci.istatistik()["disk_isabet"] == 1
+
+    # Birinci süreç "b" için kilidi tutarken ikinci bekler, sonucu diskten alır
+    birinci._disk_kilidi_al("b")
+    parcaciklar, sonuclar, hatalar = _is_parcaciklari(
+        1, lambda i: ikinci.hesapla("b", lambda: pytest.fail("yeniden hesaplandı")))
+    _bekle(lambda: ikinci.istatistik()["iska"] == 1)
+    birinci.koy("b", "diskten")
+    birinci._disk_kilidi_birak("b")
+    parcaciklar[0].join(5)
+    assert sonuclar == ["diskten"] and hatalar == [None]
+    assert ikinci.istatistik()["birlesen"] == 1
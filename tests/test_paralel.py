@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from hisse_analiz.motor import toplu_gostergeler
+from hisse_analiz.paralel import paralel_gostergeler, sutun_parcalari, havuzlari_kapat, EN_AZ_PARCA
+from olcum.sentetik import sentetik_panel
+
+
+@pytest.fixture(scope="module")
+def buyuk_panel():
+    yield sentetik_panel(150, 260, nan_orani=0.02, gec_arz_orani=0.1, tohum=5)
+    havuzlari_kapat()
+
+
+@pytest.mark.parametrize("isci_sayisi", [2, 3])
+def test_paralel_tek_surecle_birebir_ayni(buyuk_panel, isci_sayisi):
+    close, volume = buyuk_panel["Close"], buyuk_panel["Volume"]
+    assert len(sutun_parcalari(close.shape[1], isci_sayisi)) > 1  # gerçekten süreçlere bölünür
+    pd.testing.assert_frame_equal(paralel_gostergeler(close, volume, isci_sayisi), toplu_gostergeler(close, volume))
+
+
+def test_kucuk_panel_tek_surecte_hesaplanir(buyuk_panel):
+    close, volume = buyuk_panel["Close"].iloc[:, :EN_AZ_PARCA], buyuk_panel["Volume"].iloc[:, :EN_AZ_PARCA]
+    assert len(sutun_parcalari(close.shape[1], 4)) == 1
+    pd.testing.assert_frame_equal(paralel_gostergeler(close, volume, 4), toplu_gostergeler(close, volume))
+
+
+@pytest.mark.parametrize("N,isci_sayisi", [(1, 4), (31, 2), (100, 3), (500, 8), (513, 16)])
+def test_sutun_parcalari_tum_sutunlari_bir_kez_kapsar(N, isci_sayisi):
+    parcalar = sutun_parcalari(N, isci_sayisi)
+    assert [s for bas, son in parcalar for s in range(bas, son)] == list(range(N))
+    assert len(parcalar) <= isci_sayisi
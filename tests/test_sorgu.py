@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisse_analiz.sorgu import TaramaIndeksi, kosul, derle, eksik_sutunlar, ifade_sutunlari, _ad_coz
+
+
+def _tablo():
+    return pd.DataFrame({
+        "Hisse": ["AAA", "BBB", "CCC", "DDD", "EEE"],
+        "Borsa": ["BIST30", "BIST50", "BIST30", "BIST100", "BIST50"],
+        "RSI14": [25.0, 45.0, np.nan, 75.0, 55.0],
+        "MA20_R": [10.0, 12.0, 9.0, 8.0, np.nan],
+        "MA50_R": [11.0, 10.0, 9.5, 7.0, 5.0],
+        "Tahmini_Yuzde": [60.0, np.nan, 80.0, 40.0, 70.0],
+    })
+
+
+def _hisseler(df, ifade):
+    return list(df.loc[kosul(df, ifade), "Hisse"])
+
+
+@pytest.mark.parametrize("ifade", [
+    "RSI14.real > 1",              # öznitelik
+    "RSI14[0] > 1",                # indis
+    "(lambda x: x)(RSI14) > 1",    # lambda
+    "len(Hisse) > 1",              # izinsiz fonksiyon
+    "__import__('os') == 1",
+    "RSI14 ** 2 > 1",              # izinsiz işlem
+    "RSI14 < 30 if True else 1",
+    "RSI14 is None",
+])
+def test_izin_verilmeyen_dugumler_reddedilir(ifade):
+    with pytest.raises(ValueError):
+        derle(ifade)
+
+
+def test_zincirli_karsilastirma():
+    df = _tablo()
+    assert _hisseler(df, "30 < RSI14 < 70") == ["BBB", "EEE"]
+    assert _hisseler(df, "30 < RSI14 < 70") == _hisseler(df, "RSI14 > 30 and RSI14 < 70")
+
+
+def test_in_yalnizca_sabit_listeyle():
+    df = _tablo()
+    assert _hisseler(df, 'Borsa in ("BIST30", "BIST100")') == ["AAA", "CCC", "DDD"]
+    assert _hisseler(df, 'Borsa not in ["BIST30"]') == ["BBB", "DDD", "EEE"]
+    with pytest.raises(ValueError, match="sabit"):
+        derle("Borsa in (Hisse, 'BIST30')")
+    with pytest.raises(ValueError, match="sabit"):
+        derle("Borsa in Hisse")
+
+
+def test_takma_ad_ve_harf_cozumu():
+    sutunlar = list(_tablo().columns)
+    assert _ad_coz("rsi", sutunlar) == "RSI14"
+    assert _ad_coz("TAHMIN", sutunlar) == "Tahmini_Yuzde"
+    assert _ad_coz("ma20_r", sutunlar) == "MA20_R"
+    with pytest.raises(ValueError, match="Bilinmeyen sütun"):
+        _ad_coz("ema", sutunlar)   # takma adın hedefi tabloda yok
+    df = _tablo()
+    assert _hisseler(df, "rsi < 30") == _hisseler(df, "RSI14 < 30") == ["AAA"]
+
+
+def test_eksik_sutunlar():
+    sutunlar = list(_tablo().columns)
+    assert ifade_sutunlari("abs(rsi - 50) < max(MA20_R, 3)") == ("rsi", "MA20_R")
+    assert eksik_sutunlar("rsi < 30 or ma20_r > MA50_R", sutunlar) == []
+    assert eksik_sutunlar("RSI14 < 30 or MA20 > MA50 or Hacim_Orani > 1", sutunlar) == ["MA20", "MA50", "Hacim_Orani"]
+
+
+@pytest.mark.parametrize("ifade", ['RSI14 < "x"', "Hisse < 3", "Hisse + 1 > 2", "abs(Hisse) > 1", 'Hisse == "a" * 3'])
+def test_tur_uyumsuz_ifade_valueerror(ifade):
+    with pytest.raises(ValueError, match="uyumsuz"):
+        kosul(_tablo(), ifade)
+    with pytest.raises(ValueError, match="uyumsuz"):
+        TaramaIndeksi(_tablo()).sorgula(ifade)
+
+
+def test_kosul_olmayan_ifade_reddedilir():
+    with pytest.raises(ValueError, match="koşul"):
+        kosul(_tablo(), "RSI14 + 1")
+
+
+def test_ilk_k_iki_yonde_nan_sonda():
+    indeks = TaramaIndeksi(_tablo())
+    azalan = indeks.sorgula(sirala="Tahmini_Yuzde")
+    assert list(azalan["Hisse"]) == ["CCC", "EEE", "AAA", "DDD", "BBB"]
+    artan = indeks.sorgula(sirala="tahmin", artan=True)
+    assert list(artan["Hisse"]) == ["DDD", "AAA", "EEE", "CCC", "BBB"]
+
+    # Süzgeç sıralamadan sonra uygulanır; k ilk satırları alır
+    assert list(indeks.sorgula("Borsa != 'BIST100'", "RSI14", k=2)["Hisse"]) == ["EEE", "BBB"]
+    assert list(indeks.sorgula(None, "RSI14", artan=True, k=10)["Hisse"]) == ["AAA", "BBB", "EEE", "DDD", "CCC"]
+    assert list(indeks.sorgula("RSI14 > 100", "RSI14", k=3)["Hisse"]) == []
+    assert list(indeks.sorgula(sirala="Hisse", artan=False, k=2, sutunlar=["hisse", "rsi"]).columns) == ["Hisse", "RSI14"]
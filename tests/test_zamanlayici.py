@@ -0,0 +1,138 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisse_analiz import zamanlayici
+from hisse_analiz.zamanlayici import IndirmeZamanlayici, HizSinirlayici, TAMAM, VERI_YOK, HATA
+
+
+class SahteSaat:
+    # time.monotonic / time.sleep yerine: uyunan süreler kaydedilir, saat ilerlemez
+    # (eşzamanlı iş parçacıklarının ayırdığı yuvalar gibi)
+    def __init__(self, simdi=100.0):
+        self.simdi = simdi
+        self.uykular = []
+
+    def monotonic(self):
+        return self.simdi
+
+    def sleep(self, sure):
+        self.uykular.append(sure)
+
+
+class SifirRastgele:
+    @staticmethod
+    def random():
+        return 0.0
+
+
+@pytest.fixture
+def saat(monkeypatch):
+    saat = SahteSaat()
+    monkeypatch.setattr(zamanlayici, "time", saat)
+    monkeypatch.setattr(zamanlayici, "random", SifirRastgele)
+    return saat
+
+
+def _tablo(tickers, bos=()):
+    index = pd.bdate_range("2024-06-10", periods=3)
+    sutunlar = pd.MultiIndex.from_product([["Close", "Volume"], tickers], names=["Price", "Ticker"])
+    data = pd.DataFrame(np.ones((3, 2 * len(tickers))), index=index, columns=sutunlar)
+    for t in bos:
+        data.loc[:, (slice(None), t)] = np.nan
+    return data
+
+
+def _zamanlayici(indirici, **ayarlar):
+    z = IndirmeZamanlayici(indirici, **{"parca_boyutu": 2, "isci_sayisi": 1, **ayarlar})
+    z.sinirlayici = HizSinirlayici(None)  # sunucu başına paylaşılan sınırlayıcı yerine (sahte saatle)
+    return z
+
+
+def test_basarisiz_parca_ustel_beklemeyle_yeniden_denenir(saat):
+    cagri = []
+
+    def indirici(tickers, start, end, interval):
+        cagri.append(tickers)
+        if len(cagri) < 3:
+            raise ConnectionError("bağlantı koptu")
+        return _tablo(tickers)
+
+    sonuc = list(_zamanlayici(indirici, deneme=3, bekleme=1.0).akis(["A", "B"], None, None, "1d"))
+    assert len(cagri) == 3
+    assert saat.uykular == [1.0, 2.0]
+    assert sonuc[0][2] == {"A": (TAMAM, ""), "B": (TAMAM, "")}
+
+
+def test_denemeler_bitince_parca_hata_olarak_raporlanir(saat):
+    cagri = []
+
+    def indirici(tickers, start, end, interval):
+        cagri.append(tickers)
+        raise TimeoutError("zaman aşımı")
+
+    (parca, data, durumlar), = _zamanlayici(indirici, deneme=4, bekleme=0.5).akis(["A", "B"], None, None, "1d")
+    assert data is None
+    assert len(cagri) == 4
+    assert saat.uykular == [0.5, 1.0, 2.0]
+    assert {t: d for t, (d, _) in durumlar.items()} == {"A": HATA, "B": HATA}
+    assert "zaman aşımı" in durumlar["A"][1]
+
+
+def test_bos_tablo_yeniden_denenmez_veri_yok_sayilir(saat):
+    cagri = []
+
+    def indirici(tickers, start, end, interval):
+        cagri.append(tickers)
+        return pd.DataFrame() if len(cagri) == 1 else None
+
+    sonuc = list(_zamanlayici(indirici, deneme=3).akis(["A", "B", "C"], None, None, "1d"))
+    assert len(cagri) == 2  # parça başına tek istek
+    assert saat.uykular == []
+    assert all(d == VERI_YOK for _, _, durumlar in sonuc for d, _ in durumlar.values())
+    assert all(data is not None for _, data, _ in sonuc)
+
+
+def test_hisse_basina_durum(saat):
+    def indirici(tickers, start, end, interval):
+        return _tablo(["A", "B"], bos=["B"])  # C hiç gelmez, B'nin tüm barları boş
+
+    (_, _, durumlar), = _zamanlayici(indirici, parca_boyutu=3).akis(["A", "B", "C"], None, None, "1d")
+    assert {t: d for t, (d, _) in durumlar.items()} == {"A": TAMAM, "B": VERI_YOK, "C": VERI_YOK}
+
+
+def test_parcalar_bittikce_akar():
+    # Gerçek saat: ilk parça yavaş, diğerleri onu beklemeden teslim edilir
+    def indirici(tickers, start, end, interval):
+        time.sleep(0.3 if "A0" in tickers else 0.01)
+        return _tablo(tickers)
+
+    tickers = [f"A{i}" for i in range(8)]
+    z = _zamanlayici(indirici, parca_boyutu=2, isci_sayisi=4)
+    sira = [parca for parca, _, _ in z.akis(tickers, None, None, "1d")]
+    assert sira[-1] == ["A0", "A1"]
+    assert sorted(t for p in sira for t in p) == sorted(tickers)
+
+
+def test_deneme_sayisi_en_az_bir():
+    with pytest.raises(ValueError):
+        IndirmeZamanlayici(lambda *a: None, deneme=0)
+
+
+def test_oncelikli_istek_ayrilmis_yuvalari_beklemez(saat):
+    sinirlayici = HizSinirlayici(saniyede=1.0)
+    for _ in range(3):
+        sinirlayici.bekle()  # toplu indirme 100, 101, 102 yuvalarını ayırır
+    assert saat.uykular == [1.0, 2.0]
+
+    sinirlayici.bekle(oncelikli=True)
+    assert saat.uykular == [1.0, 2.0]  # hemen
+
+    # Toplu istekler bir yuva kayar; ikinci öncelikli istek de aralığa uyar
+    sinirlayici.bekle()
+    sinirlayici.bekle(oncelikli=True)
+    assert saat.uykular == [1.0, 2.0, 4.0, 1.0]
+    sinirlayici.bekle()
+    assert saat.uykular[-1] == 6.0
@@ -0,0 +1,191 @@
+import time
+import threading
+import email.utils
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisse_analiz.zenginlestirme import Zenginlestirici, Kaynak, sayi, temel_ayristir, haber_ayristir
+from olcum.sentetik import sentetik_hisseler
+
+# --- Fikstür sunucusu ---
+# Ağa çıkmadan çalışır: yerel bir HTTP sunucusu hisse başına şirket kartı
+# (HTML tablo + dt/dd) ve haber akışı (RSS) sunar, ETag ve Last-Modified
+# üretir, koşullu isteklere 304 döner. Ayrıştırılan değerler fikstürdeki
+# değerlerle karşılaştırılır.
+HABER = 5
+SIRKET_KARTI = """<!DOCTYPE html><html><head><title>{hisse} Şirket Kartı</title>
+<script>var veri = {{"hisse": "{hisse}"}};</script></head><body>
+<nav><ul><li><a href="/">Ana sayfa</a></li></ul></nav>
+<div class="ozet"><table>
+<tr><th>Kod</th><td>{hisse}</td></tr>
+<tr><th>Piyasa Değeri</th><td>{piyasa} mn TL</td></tr>
+<tr><th>F/K</th><td>{fk}</td></tr>
+<tr><th>PD/DD</th><td>{pddd}</td></tr>
+</table>
+<dl><dt>Temettü Verimi:</dt><dd>%{temettu}</dd><dt>Halka Açıklık Oranı</dt><dd>%{halka}</dd></dl>
+</div>{dolgu}</body></html>"""
+
+HABER_AKISI = """<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{hisse}</title>
+{ogeler}</channel></rss>"""
+HABER_OGESI = """<item><title>{hisse} KAP bildirimi {i}</title><link>http://kap.test/{hisse}/{i}</link>
+<pubDate>{zaman}</pubDate></item>"""
+
+
+def _tr(x):
+    # 12345.6 -> "12.345,6"; tam sayılar virgülsüz: 12345.0 -> "12.345"
+    if float(x).is_integer():
+        return f"{int(x):,}".replace(",", ".")
+    tam, _, kesir = f"{x:,}".partition(".")
+    return tam.replace(",", ".") + "," + kesir
+
+
+def _degerler(hisseler, tohum=0):
+    rng = np.random.default_rng(tohum)
+    n = len(hisseler)
+    degerler = pd.DataFrame({
+        "Piyasa_Degeri": np.round(rng.uniform(100, 500000, n), 1),
+        "FK": np.round(rng.uniform(2, 60, n), 2),
+        "PD_DD": np.round(rng.uniform(0.3, 12, n), 2),
+        "Temettu_Verimi": np.round(rng.uniform(0, 9, n), 1),
+        "Halka_Aciklik": np.round(rng.uniform(10, 90, n), 1),
+    }, index=hisseler)
+    degerler.iloc[0, 0] = 12345.0   # "12.345 mn TL": binlik ayraçlı, virgülsüz
+    return degerler
+
+
+def _sunucu(degerler, haber_sayisi=HABER):
+    # (sunucu, istatistik) döner; sunucu ayrı iş parçacığında çalışır
+    degistirilme = email.utils.formatdate(time.time() - 3600, usegmt=True)
+    istatistik = {"200": 0, "304": 0, "bayt": 0}
+    kilit = threading.Lock()
+    simdi = time.time()
+    dolgu = "<p>" + "Lorem ipsum " * 2000 + "</p>"  # gerçek sayfalar gibi büyük gövde
+
+    class Isleyici(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 1 << 16  # başlık ve gövde tek yazımda gitsin (Nagle gecikmesi olmasın)
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            _, tur, hisse = self.path.split("/", 2)
+            if hisse not in degerler.index:
+                self.send_error(404)
+                return
+            etag = f'"{tur}-{hisse}-1"'
+            if self.headers.get("If-None-Match") == etag:
+                with kilit:
+                    istatistik["304"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            d = degerler.loc[hisse]
+            if tur == "temel":
+                govde = SIRKET_KARTI.format(hisse=hisse, piyasa=_tr(d["Piyasa_Degeri"]), fk=_tr(d["FK"]),
+                                            pddd=_tr(d["PD_DD"]), temettu=_tr(d["Temettu_Verimi"]),
+                                            halka=_tr(d["Halka_Aciklik"]), dolgu=dolgu)
+                icerik_turu = "text/html; charset=utf-8"
+            else:
+                ogeler = "".join(HABER_OGESI.format(hisse=hisse, i=i, zaman=email.utils.formatdate(simdi - i * 7200))
+                                 for i in range(haber_sayisi))
+                govde = HABER_AKISI.format(hisse=hisse, ogeler=ogeler)
+                icerik_turu = "application/rss+xml; charset=utf-8"
+            govde = govde.encode("utf-8")
+            with kilit:
+                istatistik["200"] += 1
+                istatistik["bayt"] += len(govde)
+            self.send_response(200)
+            self.send_header("Content-Type", icerik_turu)
+            self.send_header("Content-Length", str(len(govde)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", degistirilme)
+            self.end_headers()
+            self.wfile.write(govde)
+
+    sunucu = ThreadingHTTPServer(("127.0.0.1", 0), Isleyici)
+    sunucu.daemon_threads = True
+    threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+    return sunucu, istatistik
+
+
+@pytest.fixture(scope="module")
+def fikstur():
+    hisseler = sentetik_hisseler(8)
+    degerler = _degerler(hisseler)
+    sunucu, istatistik = _sunucu(degerler)
+    adres = f"http://127.0.0.1:{sunucu.server_address[1]}"
+    yield hisseler, degerler, adres, istatistik
+    sunucu.shutdown()
+
+
+def _zenginlestirici(adres, dizin, tazelik):
+    kaynaklar = [Kaynak("temel", adres + "/temel/{hisse}", temel_ayristir, tazelik),
+                 Kaynak("haber", adres + "/haber/{hisse}", haber_ayristir, tazelik)]
+    return Zenginlestirici(kaynaklar, dizin=str(dizin), isci_sayisi=4, saniyede=None)
+
+
+def _dogrula(tablo, hisseler, degerler):
+    assert list(tablo["Hisse"]) == hisseler
+    beklenen = degerler.loc[tablo["Hisse"]].reset_index(drop=True)
+    for sutun in beklenen.columns:
+        np.testing.assert_allclose(tablo[sutun], beklenen[sutun], err_msg=sutun)
+    assert tablo["Son_Haber"].notna().all()
+    assert (tablo["Haber_24s"] == HABER).all()
+
+
+def test_soguk_taze_ve_kosullu_turlar(fikstur, tmp_path):
+    hisseler, degerler, adres, istatistik = fikstur
+    n = len(hisseler)
+
+    # Soğuk: boş disk önbelleği, her sayfa indirilir ve ayrıştırılır
+    onceki = dict(istatistik)
+    _dogrula(_zenginlestirici(adres, tmp_path, 3600).topla(hisseler), hisseler, degerler)
+    assert istatistik["200"] - onceki["200"] == 2 * n
+    assert istatistik["304"] == onceki["304"]
+
+    # Taze: tazelik süresi içinde hiç istek atılmaz
+    onceki = dict(istatistik)
+    _dogrula(_zenginlestirici(adres, tmp_path, 3600).topla(hisseler), hisseler, degerler)
+    assert istatistik == onceki
+
+    # Doğrulama: tazelik dolmuş, koşullu istekler 304 döner, diskteki sonuç kullanılır
+    onceki = dict(istatistik)
+    _dogrula(_zenginlestirici(adres, tmp_path, 0).topla(hisseler), hisseler, degerler)
+    assert istatistik["304"] - onceki["304"] == 2 * n
+    assert istatistik["200"] == onceki["200"]
+
+
+def test_onbellekten_ag_istegi_atmaz(fikstur, tmp_path):
+    hisseler, _, adres, istatistik = fikstur
+    z = _zenginlestirici(adres, tmp_path, 3600)
+    assert z.onbellekten(hisseler[0], "haber") is None
+    z.topla(hisseler[:1])
+
+    onceki = dict(istatistik)
+    haberler = _zenginlestirici(adres, tmp_path, 0).onbellekten(hisseler[0], "haber")
+    assert istatistik == onceki
+    assert len(haberler) == HABER
+    assert haberler[0]["baslik"] == f"{hisseler[0]} KAP bildirimi 0"
+
+
+@pytest.mark.parametrize("metin, beklenen", [
+    ("1.234,56", 1234.56),
+    ("%3,2", 3.2),
+    ("12,5 mn TL", 12.5),
+    ("1.234", 1234.0),          # virgülsüz üçlü grup: binlik ayracı
+    ("12.345 mn TL", 12345.0),
+    ("-1.234.567", -1234567.0),
+    ("12.5", 12.5),             # üçlü olmayan grup: ondalık nokta
+    ("0.75", 0.75),
+    ("1.2345", 1.2345),
+    ("F/K\xa08,25", 8.25),
+    ("-", None),
+])
+def test_sayi(metin, beklenen):
+    assert sayi(metin) == beklenen